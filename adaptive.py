@@ -0,0 +1,218 @@
+"""
+Adaptive difficulty: one AI whose strength is a number from 0 to 1.
+
+Strength sets two things. The search depth grows from 1 ply at strength 0 to
+`MAX_DEPTH` plies at strength 1, which covers the whole classic game, so full
+strength plays perfectly on 3x3 (larger boards stay bounded by the time
+budget). The noise is the chance of playing a random candidate move without
+searching at all, `MAX_NOISE` at strength 0 and none at strength 1. Both
+make weak settings cheap: the nodes searched per move grow roughly
+exponentially with depth, and a noisy move costs nothing. `GameEngine` plays
+full-strength moves on the classic board from the lookup table instead, like
+Hard, so the deepest search is never paid for where a table answers.
+
+`StrengthTuner` adjusts the strength after every game from the opponent's
+result, so that the opponent's average score settles near its target.
+
+Usage:
+    python adaptive.py [--games 50] [--size 3] [--win-length K]    # cost and results per strength, then a tuning run
+"""
+import argparse
+import random
+import sys
+import time
+from collections import deque
+
+from board import Board, other_player
+from search import AlphaBetaSearcher, candidate_cells
+
+DEFAULT_STRENGTH = 0.5
+# Search depth at full strength, enough to solve the classic board.
+MAX_DEPTH = 9
+# Chance of a random move at strength 0.
+MAX_NOISE = 0.5
+# The opponent's score the tuner aims for: 1 per win, 0.5 per draw, 0 per loss.
+TARGET_SCORE = 0.5
+# Strength gained per game for a win over the target, lost per loss under it.
+TUNING_STEP = 0.2
+# Games the tuner averages when reporting recent results.
+TUNING_WINDOW = 10
+
+
+def search_depth(strength):
+    """Returns the search depth in plies for a strength."""
+    return max(1, round(strength * MAX_DEPTH))
+
+
+def noise(strength):
+    """Returns the chance of playing a random move at a strength."""
+    return MAX_NOISE * (1.0 - strength)
+
+
+def _check_strength(strength):
+    if not 0.0 <= strength <= 1.0:
+        raise ValueError(f"strength must be between 0 and 1, got {strength!r}")
+    return float(strength)
+
+
+class AdaptiveSearcher:
+    """
+    Depth-limited, noisy alpha-beta at an adjustable `strength`.
+
+    `time_budget` still bounds each search, in seconds. After each call,
+    `nodes`, `cutoffs` and `depth_reached` describe the work done, and
+    `noisy` tells whether the move was a random one.
+    """
+    def __init__(self, strength=DEFAULT_STRENGTH, time_budget=1.0, rng=None):
+        self.strength = strength
+        self.rng = rng if rng is not None else random.Random()
+        self.searcher = AlphaBetaSearcher(time_budget)
+        self.nodes = 0
+        self.cutoffs = 0
+        self.depth_reached = 0
+        self.noisy = False
+
+    @property
+    def strength(self):
+        return self._strength
+
+    @strength.setter
+    def strength(self, strength):
+        self._strength = _check_strength(strength)
+
+    def best_move(self, board, player, cancel=None):
+        """Returns the cell to play at the current strength, or None if the board is full."""
+        moves = candidate_cells(board.geometry, board.occupied)
+        if not moves:
+            return None
+
+        self.noisy = self.rng.random() < noise(self._strength)
+        if self.noisy:
+            self.nodes = self.cutoffs = self.depth_reached = 0
+            return self.rng.choice(moves)
+
+        searcher = self.searcher
+        searcher.max_depth = search_depth(self._strength)
+        move = searcher.best_move(board, player, cancel)
+        self.nodes = searcher.nodes
+        self.cutoffs = searcher.cutoffs
+        self.depth_reached = searcher.depth_reached
+        return move
+
+
+def score_of(winner, player):
+    """Returns a player's score for a finished game: 1 for a win, 0.5 for a draw, 0 for a loss."""
+    if winner is None:
+        return 0.5
+    return 1.0 if winner == player else 0.0
+
+
+class StrengthTuner:
+    """
+    Keeps an adaptive AI matched to its opponent. Each game's result moves the
+    strength by `step` times how far the opponent's score was from `target`,
+    up after the opponent wins and down after they lose. `recent_score` is
+    the opponent's average over the last `window` games.
+    """
+    def __init__(self, strength=DEFAULT_STRENGTH, target=TARGET_SCORE, step=TUNING_STEP, window=TUNING_WINDOW):
+        self.strength = _check_strength(strength)
+        self.target = target
+        self.step = step
+        self.results = deque(maxlen=window)
+
+    @property
+    def recent_score(self):
+        """The opponent's average score over the recent games, or None before the first."""
+        return sum(self.results) / len(self.results) if self.results else None
+
+    def record(self, score):
+        """Counts a game in which the opponent scored `score`; returns the new strength."""
+        self.results.append(score)
+        # Rounded so that repeated steps do not drift off 0 and 1.
+        self.strength = round(min(1.0, max(0.0, self.strength + self.step * (score - self.target))), 6)
+        return self.strength
+
+
+# --- Command Line ---
+def _opponent_move(board, player, rng):
+    """A fixed opponent for the measurements: win, block, else a random move (like Intermediate)."""
+    for side in (player, other_player(player)):
+        for cell in board.empty_cells():
+            if board.completes_line(cell, side):
+                return cell
+    return rng.choice(board.empty_cells())
+
+
+def _play(choose, board_args, adaptive_player, rng):
+    """Plays one game of `choose(board, player)` against the fixed opponent; returns the winner."""
+    board = Board(*board_args)
+    player = "X"
+    while True:
+        if player == adaptive_player:
+            cell = choose(board, player)
+        else:
+            cell = _opponent_move(board, player, rng)
+        board.play(cell, player)
+        if board.has_won(player):
+            return player
+        if board.is_full():
+            return None
+        player = other_player(player)
+
+
+def measure(strengths, games, board_args, time_budget):
+    """Prints the cost per move and the results against the fixed opponent at each strength."""
+    print(f"{'strength':>8}{'depth':>7}{'noise':>7}{'nodes/move':>12}{'ms/move':>9}{'win':>6}{'draw':>6}{'loss':>6}")
+    for strength in strengths:
+        rng = random.Random(0)
+        searcher = AdaptiveSearcher(strength, time_budget, rng)
+        results = {"win": 0, "draw": 0, "loss": 0}
+        nodes = moves = 0
+        elapsed = 0.0
+
+        def choose(board, player):
+            nonlocal nodes, moves, elapsed
+            start = time.perf_counter()
+            move = searcher.best_move(board, player)
+            elapsed += time.perf_counter() - start
+            nodes += searcher.nodes
+            moves += 1
+            return move
+
+        for game in range(games):
+            adaptive_player = "X" if game % 2 == 0 else "O"
+            winner = _play(choose, board_args, adaptive_player, rng)
+            results["draw" if winner is None else "win" if winner == adaptive_player else "loss"] += 1
+        print(f"{strength:>8.2f}{search_depth(strength):>7}{noise(strength):>7.2f}{nodes / moves:>12.0f}"
+              f"{elapsed / moves * 1000:>9.2f}{results['win']:>6}{results['draw']:>6}{results['loss']:>6}")
+
+
+def tune(games, board_args, time_budget):
+    """Lets a tuner adjust the adaptive AI against the fixed opponent and prints the strength it settles at."""
+    rng = random.Random(1)
+    tuner = StrengthTuner(strength=0.0)
+    searcher = AdaptiveSearcher(tuner.strength, time_budget, rng)
+    for game in range(games):
+        adaptive_player = "X" if game % 2 == 0 else "O"
+        winner = _play(searcher.best_move, board_args, adaptive_player, rng)
+        searcher.strength = tuner.record(score_of(winner, other_player(adaptive_player)))
+    print(f"tuned from 0.00 to {tuner.strength:.2f} over {games} games; "
+          f"opponent's recent score {tuner.recent_score:.2f} (target {tuner.target:.2f})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the adaptive AI's cost and strength.")
+    parser.add_argument("--games", type=int, default=50, help="games per strength")
+    parser.add_argument("--size", type=int, default=3, help="cells per side of the board")
+    parser.add_argument("--win-length", type=int, help="marks in a row to win (default: the size)")
+    parser.add_argument("--time-budget", type=float, default=1.0, help="seconds per searched move")
+    args = parser.parse_args(argv)
+
+    board_args = (args.size, args.win_length)
+    measure([0.0, 0.25, 0.5, 0.75, 1.0], args.games, board_args, args.time_budget)
+    tune(args.games * 2, board_args, args.time_budget)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+AI searches on a worker thread, handed back to a GUI event loop.
+
+An `AIWorker` runs one search at a time on its own thread, against a copy of
+the engine's board, and polls for the result from the event loop through a
+`schedule(delay_ms, callback, *args)` function such as Tk's `after`. Every
+search gets its own cancel event: starting another search, `cancel` or
+`shutdown` sets it, which cuts the search short and guarantees that its move
+is never handed to the view, even if it finishes later. Nothing here imports
+tkinter.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+POLL_MS = 15    # How often the event loop checks for a finished search
+
+
+class AIWorker:
+    """
+    Single-thread AI search runner for an event loop. `busy` is True from
+    `start` until the move is handed over or the search is cancelled.
+    """
+    def __init__(self, schedule, poll_ms=POLL_MS):
+        self.schedule = schedule
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-search")
+        self._cancel = None
+
+    @property
+    def busy(self):
+        return self._cancel is not None
+
+    def start(self, engine, difficulty, on_move, on_error=None, min_ms=0):
+        """
+        Cancels any search in flight and starts one for the engine's current
+        player. On the event loop, calls `on_move(move)` once the search is
+        done and at least `min_ms` milliseconds have passed. If the search
+        raises, `on_error(error)` is called first and returns the move to
+        play instead; without `on_error` the error propagates.
+        """
+        self.cancel()
+        cancel = self._cancel = threading.Event()
+        future = self._executor.submit(
+            engine.choose_move, difficulty, engine.current_player, engine.board.copy(), cancel
+        )
+        self.schedule(self.poll_ms, self._poll, future, cancel, on_move, on_error, min_ms, time.perf_counter())
+
+    def _poll(self, future, cancel, on_move, on_error, min_ms, started):
+        """Waits on the event loop for the search to finish, then hands the move over."""
+        if cancel.is_set():
+            return
+        if not future.done():
+            self.schedule(self.poll_ms, self._poll, future, cancel, on_move, on_error, min_ms, started)
+            return
+        try:
+            move = future.result()
+        except Exception as error:
+            if on_error is None:
+                self._cancel = None
+                raise
+            move = on_error(error)
+
+        # Pacing only pads fast searches up to `min_ms`; slow ones play at once.
+        remaining_ms = min_ms - int((time.perf_counter() - started) * 1000)
+        if remaining_ms > 0:
+            self.schedule(remaining_ms, self._deliver, move, cancel, on_move)
+        else:
+            self._deliver(move, cancel, on_move)
+
+    def _deliver(self, move, cancel, on_move):
+        """Hands a finished move to the view unless its search was cancelled meanwhile."""
+        if cancel.is_set():
+            return
+        self._cancel = None
+        on_move(move)
+
+    def cancel(self):
+        """Cancels the search in flight, if any, so its move is never handed over."""
+        if self._cancel is not None:
+            self._cancel.set()
+            self._cancel = None
+
+    def shutdown(self):
+        """Cancels any search and lets the worker thread exit once it returns."""
+        self.cancel()
+        self._executor.shutdown(wait=False)
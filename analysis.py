@@ -0,0 +1,183 @@
+"""
+Exhaustive, symmetry-reduced analysis of every reachable position.
+
+`analyse` walks the game graph from the empty board once. Positions are merged
+by their canonical form over the board's 8 rotations and reflections (see
+`position.Position.canonical`), so every class of symmetric positions is solved
+and reported exactly once, with `orbit` giving the number of raw positions it
+stands for. A position is yielded as soon as its subtree is solved, children
+before parents, and only a (value, depth) pair per canonical position is kept
+meanwhile, so the stream can go straight to a file or a DataFrame:
+
+    import pandas as pd
+    frame = pd.DataFrame(analyse())
+
+Only the classic board is small enough to enumerate in full.
+
+Usage:
+    python analysis.py                          # summary of the 3x3 game
+    python analysis.py --jsonl positions.jsonl
+    python analysis.py --csv positions.csv
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import namedtuple
+
+from board import Board, other_player
+from engine import find_winning_move
+from position import Position
+
+# `x` and `o` are the masks of the first orientation reached; `value` is 1, 0
+# or -1 for the player to move; `depth` counts the plies to the end of the game
+# when the winner hurries and the loser stalls (None for draws); the move
+# counts and `intermediate_optimal` are 0 and None once the game is over.
+PositionStats = namedtuple(
+    "PositionStats",
+    "x o player ply orbit value depth legal_moves optimal_moves winning_moves intermediate_optimal",
+)
+
+
+def intermediate_choices(board, player):
+    """
+    Returns every cell the Intermediate AI may play, following
+    `engine.intermediate_move`: a win, else a block, else the center, else
+    any empty cell at random.
+    """
+    for side in (player, other_player(player)):
+        move = find_winning_move(board, side)
+        if move is not None:
+            return [move]
+    center = board.geometry.center
+    if board.is_empty(center):
+        return [center]
+    return board.empty_cells()
+
+
+def _orbit(board):
+    """Returns how many distinct positions the board's symmetries map it to."""
+    x_cells = [i for i in range(board.cells) if board.x >> i & 1]
+    o_cells = [i for i in range(board.cells) if board.o >> i & 1]
+    return len({(sum(1 << perm[i] for i in x_cells), sum(1 << perm[i] for i in o_cells))
+                for perm in board.geometry.symmetries})
+
+
+def _visit(board, player, solved):
+    """
+    Yields the stats of every unsolved position below and including this one,
+    and returns its (value, depth).
+    """
+    key, _ = Position.from_board(board).canonical()
+    result = solved.get(key)
+    if result is not None:
+        return result
+
+    opponent = other_player(player)
+    if board.has_won(opponent) or board.is_full():
+        # Only the player who just moved can have won.
+        result = (-1, 0) if board.has_won(opponent) else (0, None)
+        solved[key] = result
+        yield PositionStats(board.x, board.o, player, board.move_count(), _orbit(board), *result, 0, 0, 0, None)
+        return result
+
+    children = {}
+    for cell in board.empty_cells():
+        board.play(cell, player)
+        children[cell] = yield from _visit(board, opponent, solved)
+        board.undo(cell)
+
+    # A child's value is for the opponent, so ours is its negation.
+    value = max(-child_value for child_value, _ in children.values())
+    winning = [cell for cell, (child_value, _) in children.items() if child_value == -1]
+    if value == 1:
+        depth = 1 + min(children[cell][1] for cell in winning)
+    elif value == -1:
+        depth = 1 + max(child_depth for _, child_depth in children.values())
+    else:
+        depth = None
+    optimal = [cell for cell, (child_value, _) in children.items() if -child_value == value]
+    intermediate_optimal = all(-children[cell][0] == value for cell in intermediate_choices(board, player))
+
+    result = (value, depth)
+    solved[key] = result
+    yield PositionStats(board.x, board.o, player, board.move_count(), _orbit(board), value, depth,
+                        len(children), len(optimal), len(winning), intermediate_optimal)
+    return result
+
+
+def analyse(size=3, win_length=None):
+    """Yields a `PositionStats` for every canonical position reachable from the empty board."""
+    yield from _visit(Board(size, win_length), "X", {})
+
+
+def summarize(positions):
+    """Aggregates a stream of `PositionStats`; returns a dict of counts, raw counts weighted by orbit."""
+    summary = {
+        "positions": 0, "raw_positions": 0,
+        "wins": 0, "draws": 0, "losses": 0, "x_forced_wins": 0, "raw_x_forced_wins": 0,
+        "open": 0, "intermediate_optimal": 0, "intermediate_mistakes": [],
+    }
+    for stats in positions:
+        summary["positions"] += 1
+        summary["raw_positions"] += stats.orbit
+        summary[{1: "wins", 0: "draws", -1: "losses"}[stats.value]] += 1
+        x_wins = stats.value == (1 if stats.player == "X" else -1)
+        summary["x_forced_wins"] += x_wins
+        summary["raw_x_forced_wins"] += stats.orbit if x_wins else 0
+        if stats.intermediate_optimal is not None:
+            summary["open"] += 1
+            if stats.intermediate_optimal:
+                summary["intermediate_optimal"] += 1
+            else:
+                summary["intermediate_mistakes"].append(stats)
+    return summary
+
+
+def _board_text(stats, size, win_length):
+    board = Board(size, win_length, stats.x, stats.o)
+    return "/".join("".join(mark or "." for mark in row) for row in board.to_rows())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve and describe every reachable position.")
+    parser.add_argument("--size", type=int, default=3, help="cells per side of the board")
+    parser.add_argument("--win-length", type=int, help="marks in a row to win (default: the size)")
+    parser.add_argument("--jsonl", help="write one JSON object per canonical position here")
+    parser.add_argument("--csv", help="write one CSV row per canonical position here")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    positions = analyse(args.size, args.win_length)
+    if args.jsonl or args.csv:
+        with open(args.jsonl or args.csv, "w", newline="") as out:
+            if args.csv:
+                writer = csv.writer(out)
+                writer.writerow(PositionStats._fields)
+                write = writer.writerow
+            else:
+                write = lambda stats: out.write(json.dumps(stats._asdict()) + "\n")
+            count = 0
+            for stats in positions:
+                write(stats)
+                count += 1
+        print(f"Wrote {count} positions to {args.jsonl or args.csv} in {time.perf_counter() - start:.2f}s")
+        return 0
+
+    summary = summarize(positions)
+    elapsed = time.perf_counter() - start
+    print(f"{summary['positions']} canonical positions ({summary['raw_positions']} raw) in {elapsed:.2f}s")
+    print(f"player to move wins {summary['wins']}, draws {summary['draws']}, loses {summary['losses']}")
+    print(f"forced wins for X: {summary['x_forced_wins']} ({summary['raw_x_forced_wins']} raw)")
+    mistakes = summary["intermediate_mistakes"]
+    print(f"Intermediate always plays optimally in {summary['intermediate_optimal']} of {summary['open']} "
+          f"open positions; it can go wrong in {len(mistakes)} ({sum(s.orbit for s in mistakes)} raw)")
+    for stats in sorted(mistakes, key=lambda s: s.ply)[:10]:
+        print(f"  ply {stats.ply}  {_board_text(stats, args.size, args.win_length)}  {stats.player} to move, "
+              f"{stats.optimal_moves} of {stats.legal_moves} moves keep the value")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
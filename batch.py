@@ -0,0 +1,135 @@
+"""
+Vectorized NumPy evaluation of many 3x3 boards at once.
+
+Boards are an (N, 9) int8 array in row-major cell order with 0 for empty,
+1 for X and 2 for O (the same digits as the lookup table's base-3 index).
+At import, every one of the 3^9 encodings is packed into one 9-bit mask per
+player and reduced against the 8 line masks in a single vectorized pass,
+giving status and legal-move tables. Evaluating a batch is then one base-3
+index computation plus gathers from those tables and from the memory-mapped
+solved table for perfect-play scores.
+
+NumPy is only needed for this module; the game itself does not use it.
+
+Usage:
+    python batch.py [N]    # time status, legal moves and scores for N random boards
+"""
+import sys
+import time
+
+import numpy as np
+
+from board import get_geometry
+from table import ENTRY, ENTRY_COUNT, load_default_table
+
+IN_PROGRESS = 0
+X_WINS = 1
+O_WINS = 2
+TIE = 3
+
+# The shipped solved table, opened by the first call that does not pass one.
+_table = None
+
+_CELL_BITS = (1 << np.arange(9)).astype(np.uint16)
+_WIN_MASKS = np.array(get_geometry(3, 3).win_masks, dtype=np.uint16)
+
+
+def _check(boards):
+    boards = np.asarray(boards)
+    if boards.ndim != 2 or boards.shape[1] != 9:
+        raise ValueError(f"expected an (N, 9) array of boards, got shape {boards.shape}")
+    if boards.size and (boards.min() < 0 or boards.max() > 2):
+        raise ValueError("cells must be 0 (empty), 1 (X) or 2 (O)")
+    return boards
+
+
+def _has_line(masks):
+    """True for each mask that covers at least one winning line."""
+    return ((masks[:, None] & _WIN_MASKS) == _WIN_MASKS).any(axis=1)
+
+
+def _build_tables():
+    """Computes the status and legal-move mask of every base-3 encoding."""
+    digits = (np.arange(ENTRY_COUNT)[:, None] // 3 ** np.arange(9)) % 3
+    x = ((digits == 1) * _CELL_BITS).sum(axis=1, dtype=np.uint16)
+    o = ((digits == 2) * _CELL_BITS).sum(axis=1, dtype=np.uint16)
+
+    statuses = np.full(ENTRY_COUNT, IN_PROGRESS, dtype=np.int8)
+    statuses[(digits != 0).all(axis=1)] = TIE
+    statuses[_has_line(o)] = O_WINS
+    statuses[_has_line(x)] = X_WINS
+    legal = (digits == 0) & (statuses == IN_PROGRESS)[:, None]
+    return statuses, legal
+
+
+_STATUS, _LEGAL = _build_tables()
+
+
+def _default_table():
+    global _table
+    if _table is None:
+        _table = load_default_table()
+        if _table is None:
+            raise FileNotFoundError("perfect_play.bin has not been built; run python table.py build")
+    return _table
+
+
+def table_index(boards):
+    """Returns the base-3 index of every board (cell i weighs 3**i)."""
+    boards = _check(boards)
+    index = boards[:, 8].astype(np.int16)
+    for cell in range(7, -1, -1):
+        index *= 3
+        index += boards[:, cell]
+    return index
+
+
+def status(boards, index=None):
+    """Returns IN_PROGRESS, X_WINS, O_WINS or TIE for every board."""
+    return _STATUS[table_index(boards) if index is None else index]
+
+
+def legal_moves(boards, index=None):
+    """Returns an (N, 9) bool array of playable cells; finished games have none."""
+    return _LEGAL[table_index(boards) if index is None else index]
+
+
+def perfect_play(boards, table=None, index=None):
+    """
+    Returns (best_moves, scores) from the solved table for the side to move,
+    assuming X opened. Best moves are -1 where there is none. Results for
+    positions that cannot arise in a real game are meaningless.
+    """
+    if table is None:
+        table = _default_table()
+    entries = np.frombuffer(table.entries(), dtype=np.uint8).reshape(-1, ENTRY.size)
+    rows = entries[table_index(boards) if index is None else index]
+    moves = rows[:, 0].astype(np.int8)
+    moves[rows[:, 0] == 0xFF] = -1
+    return moves, rows[:, 1].view(np.int8)
+
+
+def evaluate(boards, table=None):
+    """Returns a dict with the status, legal-move mask, best move and score of every board."""
+    index = table_index(boards)
+    moves, scores = perfect_play(boards, table, index)
+    return {
+        "status": status(boards, index),
+        "legal_moves": legal_moves(boards, index),
+        "best_move": moves,
+        "score": scores,
+    }
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    boards = rng.integers(0, 3, size=(count, 9), dtype=np.int8)
+    table = _default_table()
+    for name, func in (("status", status), ("legal_moves", legal_moves),
+                       ("perfect_play", lambda b: perfect_play(b, table)),
+                       ("evaluate", lambda b: evaluate(b, table))):
+        start = time.perf_counter()
+        func(boards)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<14}{count / elapsed / 1e6:>8.1f} M boards/s")
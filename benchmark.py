@@ -0,0 +1,157 @@
+"""
+Benchmarks for the engine hot paths.
+
+Times the perfect-play search from the empty board and from mid-game
+positions, the win checks, the Intermediate win/block scan, fixed-depth
+alpha-beta on a larger board and full game playouts per difficulty (fewer
+games for MCTS, whose moves spend a fixed playout budget). Only the
+headless engine is imported, so no display or Tk installation is needed.
+
+Results are compared against a stored baseline and any benchmark slower than
+the baseline by more than the threshold is reported as a regression.
+
+Usage:
+    python benchmark.py                    # run and compare with the baseline
+    python benchmark.py --save-baseline    # run and store the results as the new baseline
+    python benchmark.py --threshold 0.10 --filter minimax
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+from board import Board
+from engine import DIFFICULTIES, GameEngine, find_winning_move
+from search import AlphaBetaSearcher
+from solver import Solver
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+DEFAULT_THRESHOLD = 0.25
+REPEAT = 5
+
+# Representative positions: (label, cells, player to move)
+POSITIONS = (
+    ("empty", "." * 9, "X"),
+    ("opening", "X........", "O"),
+    ("midgame", "X.O.X...O", "X"),
+    ("endgame", "XOXOX.O..", "X"),
+)
+
+
+def _board(cells):
+    return Board.from_cells(["" if cell == "." else cell for cell in cells])
+
+
+def _solve_cold(board, player):
+    """A fresh solver per call, so every run searches the full tree."""
+    return lambda: Solver().best_move(board, player)
+
+
+def _solve_warm(board, player):
+    """A shared solver, so runs after the first are transposition table hits."""
+    solver = Solver()
+    solver.best_move(board, player)
+    return lambda: solver.best_move(board, player)
+
+
+def _playouts(difficulty, games=20):
+    """Plays seeded self-play games at one difficulty."""
+    engine = GameEngine()
+
+    def run():
+        for game in range(games):
+            engine.reset()
+            engine.rng.seed(game)
+            while not engine.game_over:
+                engine.ai_move(difficulty)
+    return run
+
+
+def build_benchmarks():
+    """Returns the benchmarks as a dict of name -> zero-argument callable."""
+    benchmarks = {}
+    for label, cells, player in POSITIONS:
+        board = _board(cells)
+        benchmarks[f"minimax_cold_{label}"] = _solve_cold(board, player)
+        benchmarks[f"minimax_warm_{label}"] = _solve_warm(board, player)
+
+    midgame = _board("XOX.O.O.X")
+    won = _board("XXXOO....")
+    benchmarks["check_win_for_player"] = lambda: (midgame.has_won("X"), midgame.has_won("O"))
+    benchmarks["check_win"] = lambda: (won.winning_line("X"), midgame.winning_line("O"))
+    benchmarks["check_possible_win_block"] = lambda: (
+        find_winning_move(midgame, "X"), find_winning_move(midgame, "O"))
+
+    searcher = AlphaBetaSearcher(time_budget=None, max_depth=3)
+    four = Board(4)
+    for index, player in ((5, "X"), (10, "O"), (6, "X")):
+        four.play(index, player)
+    benchmarks["alphabeta_4x4_depth3"] = lambda: searcher.best_move(four, "O")
+
+    for difficulty in DIFFICULTIES:
+        games = 2 if difficulty == "MCTS" else 20
+        benchmarks[f"playout_{difficulty.lower()}"] = _playouts(difficulty, games)
+    return benchmarks
+
+
+def run(benchmarks):
+    """Times each benchmark; returns name -> best seconds per call."""
+    results = {}
+    for name, func in benchmarks.items():
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        results[name] = min(timer.repeat(REPEAT, number)) / number
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Returns (name, baseline, current, ratio) for every benchmark slower than allowed."""
+    regressions = []
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if reference and seconds > reference * (1 + threshold):
+            regressions.append((name, reference, seconds, seconds / reference))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Tic-Tac-Toe engine hot paths.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before flagging a regression (0.25 = 25%%)")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    args = parser.parse_args(argv)
+
+    benchmarks = {name: func for name, func in build_benchmarks().items() if args.filter in name}
+    results = run(benchmarks)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"{'benchmark':<32}{'current us':>14}{'baseline us':>14}{'change':>10}")
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        change = f"{seconds / reference - 1:+.1%}" if reference else "new"
+        reference_text = f"{reference * 1e6:.2f}" if reference else "-"
+        print(f"{name:<32}{seconds * 1e6:>14.2f}{reference_text:>14}{change:>10}")
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, reference, seconds, ratio in regressions:
+        print(f"REGRESSION {name}: {reference * 1e6:.2f} us -> {seconds * 1e6:.2f} us ({ratio:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+Bitboard representation of the Tic-Tac-Toe board.
+
+Each player's marks are stored as an integer mask (bit i is cell i, indexed
+row-major). Alongside the masks the board keeps, per player, a counter of
+marks on every winning line, updated incrementally by `play` and `undo` for
+just the lines through the changed cell. A win is a counter reaching K, so win
+checks and fullness are O(1) whatever the board size. Boards default to the
+classic 3x3 game but may be any N x N size with a K-in-a-row win condition.
+"""
+from functools import lru_cache
+
+# Classic board: 3x3, three in a row.
+SIZE = 3
+CELLS = SIZE * SIZE
+
+
+def other_player(player):
+    """Returns the opponent of the given player."""
+    return "O" if player == "X" else "X"
+
+
+class Geometry:
+    """Precomputed lines and cell orderings for an N x N, K-in-a-row board."""
+    def __init__(self, size, win_length):
+        if size < 1 or not 1 <= win_length <= size:
+            raise ValueError(f"Invalid board: {size}x{size} with {win_length} in a row")
+        self.size = size
+        self.win_length = win_length
+        self.cells = size * size
+        self.full_mask = (1 << self.cells) - 1
+        self.center = (size // 2) * size + size // 2
+
+        # Every window of K consecutive cells along a row, column or diagonal.
+        lines = []
+        for r in range(size):
+            for c in range(size):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_r = r + dr * (win_length - 1)
+                    end_c = c + dc * (win_length - 1)
+                    if 0 <= end_r < size and 0 <= end_c < size:
+                        lines.append(tuple((r + dr * k) * size + c + dc * k for k in range(win_length)))
+        self.lines = tuple(lines)
+        self.win_masks = tuple(sum(1 << i for i in line) for line in lines)
+
+        # Indices of the lines passing through each cell.
+        self.cell_lines = tuple(
+            tuple(n for n, line in enumerate(lines) if i in line) for i in range(self.cells)
+        )
+
+        # Distance of each cell from the center, a cheap static move ordering.
+        middle = (size - 1) / 2
+        self.centrality = tuple(
+            max(abs(i // size - middle), abs(i % size - middle)) for i in range(self.cells)
+        )
+
+        # Cells within two steps of each cell, used to focus search on large boards.
+        self.neighbourhoods = tuple(
+            sum(1 << (rr * size + cc)
+                for rr in range(max(0, i // size - 2), min(size, i // size + 3))
+                for cc in range(max(0, i % size - 2), min(size, i % size + 3)))
+            for i in range(self.cells)
+        )
+
+        # The 8 rotations and reflections of the square, each mapping a cell to its image.
+        symmetries = []
+        for transpose in (False, True):
+            for flip_rows in (False, True):
+                for flip_cols in (False, True):
+                    perm = []
+                    for i in range(self.cells):
+                        r, c = divmod(i, size)
+                        if transpose:
+                            r, c = c, r
+                        if flip_rows:
+                            r = size - 1 - r
+                        if flip_cols:
+                            c = size - 1 - c
+                        perm.append(r * size + c)
+                    symmetries.append(tuple(perm))
+        self.symmetries = tuple(symmetries)
+
+
+def get_geometry(size=SIZE, win_length=None):
+    """Returns the shared geometry for a board size and win length (default: the size)."""
+    # Normalised before the cache, so every way of asking for a board gets the same object.
+    return _get_geometry(size, size if win_length is None else win_length)
+
+
+@lru_cache(maxsize=None)
+def _get_geometry(size, win_length):
+    return Geometry(size, win_length)
+
+
+class Board:
+    """An N x N board holding one bit mask and one set of line counters per player."""
+    def __init__(self, size=SIZE, win_length=None, x=0, o=0):
+        self.geometry = get_geometry(size, win_length)
+        self.x = 0
+        self.o = 0
+        self.moves = 0
+        lines = len(self.geometry.lines)
+        # Indexed by side: 0 for X, 1 for O.
+        self._counts = ([0] * lines, [0] * lines)
+        self._wins = [0, 0]
+
+        for player, mask in (("X", x), ("O", o)):
+            for index in range(self.geometry.cells):
+                if mask >> index & 1:
+                    self.play(index, player)
+
+    @classmethod
+    def from_cells(cls, cells, win_length=None):
+        """Builds a square board from a flat sequence of marks ("X", "O" or "")."""
+        size = int(round(len(cells) ** 0.5))
+        board = cls(size, win_length)
+        for index, cell in enumerate(cells):
+            if cell:
+                board.play(index, cell)
+        return board
+
+    def copy(self):
+        """Returns an independent copy of the board."""
+        board = Board.__new__(Board)
+        board.geometry = self.geometry
+        board.x = self.x
+        board.o = self.o
+        board.moves = self.moves
+        board._counts = (self._counts[0][:], self._counts[1][:])
+        board._wins = self._wins[:]
+        return board
+
+    def __eq__(self, other):
+        return (isinstance(other, Board) and self.geometry is other.geometry
+                and self.x == other.x and self.o == other.o)
+
+    def __hash__(self):
+        return hash((self.geometry.size, self.geometry.win_length, self.x, self.o))
+
+    def __repr__(self):
+        return f"Board({''.join(self.get(i) or '.' for i in range(self.cells))!r})"
+
+    @property
+    def size(self):
+        return self.geometry.size
+
+    @property
+    def win_length(self):
+        return self.geometry.win_length
+
+    @property
+    def cells(self):
+        return self.geometry.cells
+
+    # --- Moves ---
+
+    def play(self, index, player):
+        """Places the player's mark on an empty cell."""
+        if player == "X":
+            self.x |= 1 << index
+            side = 0
+        else:
+            self.o |= 1 << index
+            side = 1
+        self.moves += 1
+
+        geometry = self.geometry
+        counts = self._counts[side]
+        for line in geometry.cell_lines[index]:
+            count = counts[line] + 1
+            counts[line] = count
+            if count == geometry.win_length:
+                self._wins[side] += 1
+
+    def undo(self, index):
+        """Clears a cell, reverting a previous `play`."""
+        bit = 1 << index
+        if self.x & bit:
+            self.x ^= bit
+            side = 0
+        elif self.o & bit:
+            self.o ^= bit
+            side = 1
+        else:
+            return
+        self.moves -= 1
+
+        geometry = self.geometry
+        counts = self._counts[side]
+        for line in geometry.cell_lines[index]:
+            count = counts[line]
+            if count == geometry.win_length:
+                self._wins[side] -= 1
+            counts[line] = count - 1
+
+    # --- Queries ---
+
+    def mask(self, player):
+        """Returns the bit mask of the player's marks."""
+        return self.x if player == "X" else self.o
+
+    @property
+    def occupied(self):
+        """Bit mask of all filled cells."""
+        return self.x | self.o
+
+    def get(self, index):
+        """Returns the mark on a cell: "X", "O" or ""."""
+        bit = 1 << index
+        if self.x & bit:
+            return "X"
+        if self.o & bit:
+            return "O"
+        return ""
+
+    def is_empty(self, index):
+        """Checks whether a cell is free."""
+        return not (self.x | self.o) & (1 << index)
+
+    def empty_cells(self):
+        """Returns the indices of all free cells in row-major order."""
+        occupied = self.x | self.o
+        return [i for i in range(self.geometry.cells) if not occupied & (1 << i)]
+
+    def move_count(self):
+        """Returns the number of marks on the board."""
+        return self.moves
+
+    def is_full(self):
+        """Checks if every cell is filled."""
+        return self.moves == self.geometry.cells
+
+    def has_won(self, player):
+        """Checks whether the player owns a complete line."""
+        return self._wins[0 if player == "X" else 1] > 0
+
+    def winning_line(self, player):
+        """Returns the cell indices of the player's first complete line, or None."""
+        side = 0 if player == "X" else 1
+        if not self._wins[side]:
+            return None
+        win_length = self.geometry.win_length
+        for line, count in enumerate(self._counts[side]):
+            if count == win_length:
+                return self.geometry.lines[line]
+        return None
+
+    def completes_line(self, index, player):
+        """Checks whether playing an empty cell would win for the player, without playing it."""
+        geometry = self.geometry
+        counts = self._counts[0 if player == "X" else 1]
+        target = geometry.win_length - 1
+        for line in geometry.cell_lines[index]:
+            if counts[line] == target:
+                return True
+        return False
+
+    def line_counts(self, player):
+        """Returns the player's mark count on every line, indexed like `geometry.lines`. Do not modify."""
+        return self._counts[0 if player == "X" else 1]
+
+    # --- Display ---
+
+    def to_rows(self):
+        """Converts the board to nested lists of marks for rendering."""
+        size = self.geometry.size
+        return [[self.get(size * r + c) for c in range(size)] for r in range(size)]
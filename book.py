@@ -0,0 +1,180 @@
+"""
+Opening book and endgame cache for the Hard AI.
+
+Hard moves that the perfect-play table does not answer are looked up here
+before any search is started. Positions are keyed canonically by the
+smallest image of the interned `Position` over the 8 rotations and
+reflections of the board, so a move stored for one orientation answers all
+eight. Positions in the first `plies` moves of a game go to the opening book,
+which is never evicted; later positions go to a bounded LRU endgame cache.
+Every searched move is stored, and the whole book can be saved to and loaded
+from a JSON file, so a fresh process answers known positions instantly.
+
+Usage:
+    python book.py build [path]                 # search the openings of the GUI board sizes
+    python book.py build --size 5 --win-length 4 --plies 2 --time-budget 1.0 [path]
+    python book.py info [path]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+
+from board import Board
+from position import Position
+from search import AlphaBetaSearcher
+from solver import Solver, TranspositionTable
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.json")
+VERSION = 1
+DEFAULT_PLIES = 2
+DEFAULT_CACHE_SIZE = 4096
+
+# Boards larger than the classic one offered by the GUI, as (size, win length).
+BOOK_BOARDS = ((4, 4), (5, 4), (7, 5), (15, 5))
+
+
+class MoveBook:
+    """
+    Best moves by canonical position: an unbounded opening book for the first
+    `plies` moves and an LRU endgame cache of `cache_size` later positions.
+    Only the player to move has moves stored. Safe to share between threads.
+    """
+    def __init__(self, plies=DEFAULT_PLIES, cache_size=DEFAULT_CACHE_SIZE):
+        self.plies = plies
+        self.openings = TranspositionTable()
+        self.endgames = TranspositionTable(cache_size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.openings) + len(self.endgames)
+
+    def _table(self, board):
+        return self.openings if board.move_count() < self.plies else self.endgames
+
+    def lookup(self, board, player):
+        """Returns the stored move for the player to move, or None."""
+        position = Position.from_board(board)
+        if position.player != player:
+            return None
+        key, symmetry = position.canonical()
+        with self._lock:
+            move = self._table(board).get(key)
+        if move is None:
+            return None
+        return board.geometry.symmetries[symmetry].index(move)
+
+    def store(self, board, player, move):
+        """Remembers the best move found for a position."""
+        position = Position.from_board(board)
+        if position.player != player:
+            return
+        key, symmetry = position.canonical()
+        with self._lock:
+            self._table(board).put(key, board.geometry.symmetries[symmetry][move])
+
+    def counters(self):
+        """Returns the sizes and hit/miss counters of both tables."""
+        with self._lock:
+            return {
+                "openings": len(self.openings),
+                "opening_hits": self.openings.hits,
+                "opening_misses": self.openings.misses,
+                "endgames": len(self.endgames),
+                "endgame_hits": self.endgames.hits,
+                "endgame_misses": self.endgames.misses,
+                "endgame_evictions": self.endgames.evictions,
+            }
+
+    def save(self, path):
+        """Writes both tables to a JSON file, replacing it atomically."""
+        with self._lock:
+            data = {
+                "version": VERSION,
+                "plies": self.plies,
+                "cache_size": self.endgames.maxsize,
+                "openings": [list(key.key()) + [move] for key, move in self.openings.items()],
+                "endgames": [list(key.key()) + [move] for key, move in self.endgames.items()],
+            }
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        """Reads a book written by `save`."""
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} move book")
+        book = cls(data["plies"], data["cache_size"])
+        for table, entries in ((book.openings, data["openings"]), (book.endgames, data["endgames"])):
+            for *key, move in entries:
+                table.put(Position.from_key(key), move)
+        return book
+
+
+def load_default_book():
+    """Returns the shipped opening book, or None if it has not been built."""
+    if not os.path.exists(DEFAULT_PATH):
+        return None
+    return MoveBook.load(DEFAULT_PATH)
+
+
+def build(book, size, win_length, plies=DEFAULT_PLIES, time_budget=1.0):
+    """Searches every distinct position of the first `plies` moves into the book; returns the count."""
+    solver = Solver()
+    searcher = AlphaBetaSearcher(time_budget)
+    seen = set()
+    frontier = [Board(size, win_length)]
+    for ply in range(plies):
+        player = "X" if ply % 2 == 0 else "O"
+        children = []
+        for board in frontier:
+            key, _ = Position.from_board(board).canonical()
+            if key in seen or board.has_won("X") or board.has_won("O") or board.is_full():
+                continue
+            seen.add(key)
+            if size == 3 and win_length == 3:
+                move = solver.best_move(board, player)
+            else:
+                move = searcher.best_move(board, player)
+            book.store(board, player, move)
+            for cell in board.empty_cells():
+                child = board.copy()
+                child.play(cell, player)
+                children.append(child)
+        frontier = children
+    return len(seen)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect the Hard AI's opening book.")
+    parser.add_argument("command", choices=("build", "info"))
+    parser.add_argument("path", nargs="?", default=DEFAULT_PATH)
+    parser.add_argument("--size", type=int, help="board size (default: every GUI size above 3x3)")
+    parser.add_argument("--win-length", type=int, help="marks in a row to win (default: the size)")
+    parser.add_argument("--plies", type=int, default=DEFAULT_PLIES, help="opening moves covered")
+    parser.add_argument("--time-budget", type=float, default=1.0, help="seconds per searched position")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        book = MoveBook.load(args.path)
+        print(f"{args.path}: {len(book.openings)} openings over {book.plies} plies, "
+              f"{len(book.endgames)} cached later positions")
+        return 0
+
+    book = MoveBook.load(args.path) if os.path.exists(args.path) else MoveBook(args.plies)
+    boards = [(args.size, args.win_length or args.size)] if args.size else BOOK_BOARDS
+    for size, win_length in boards:
+        count = build(book, size, win_length, args.plies, args.time_budget)
+        print(f"{size}x{size}, {win_length} in a row: {count} positions")
+    book.save(args.path)
+    print(f"Wrote {len(book)} positions to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
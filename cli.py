@@ -0,0 +1,159 @@
+"""
+Terminal front end: play, watch or replay games without a display.
+
+Nothing this module imports touches tkinter, so it starts in a fraction of
+the GUI's time and runs over SSH or in CI. `python tic-tac-toe.py --cli ...`
+forwards here before the GUI imports anything.
+
+Usage:
+    python cli.py                                   # play X against Hard on 3x3
+    python cli.py --difficulty MCTS --size 7 --win-length 5 --play-as O
+    python cli.py --difficulty Adaptive --strength 0.3
+    python cli.py --watch Hard:Intermediate --games 100
+    python cli.py --replay ~/.tic-tac-toe/games.ttr --show
+    python cli.py --timings ...                     # report import and first-board times on stderr
+"""
+import time
+
+# Taken before the engine is imported, so --timings includes it.
+_LAUNCHED = time.perf_counter()
+
+import argparse
+import sys
+
+from adaptive import DEFAULT_STRENGTH
+from engine import DIFFICULTIES, GameEngine
+from spectator import SpectatorSession
+from tournament import parse_pairing
+
+
+def render_text(board):
+    """Returns the board as text, with 1-based row and column numbers."""
+    width = len(str(board.size))
+    lines = [" " * (width + 1) + " ".join(f"{c + 1:>{width}}" for c in range(board.size))]
+    for r in range(board.size):
+        marks = (board.get(r * board.size + c) or "." for c in range(board.size))
+        lines.append(f"{r + 1:>{width}} " + " ".join(f"{mark:>{width}}" for mark in marks))
+    return "\n".join(lines)
+
+
+def parse_move(text, size):
+    """Parses "row col" (1-based) or a 1-based cell number; returns the cell index or None."""
+    parts = text.replace(",", " ").split()
+    try:
+        numbers = [int(part) for part in parts]
+    except ValueError:
+        return None
+    if len(numbers) == 2 and all(1 <= n <= size for n in numbers):
+        return (numbers[0] - 1) * size + numbers[1] - 1
+    if len(numbers) == 1 and 1 <= numbers[0] <= size * size:
+        return numbers[0] - 1
+    return None
+
+
+def _result(winner):
+    return f"Player {winner} wins!" if winner is not None else "It's a tie!"
+
+
+def play(engine, difficulty, human="X", read=input, write=print, on_first_board=None):
+    """Plays one game between a human at the terminal and the AI; returns the winner or None."""
+    engine.human_player = human
+    engine.ai_player = "O" if human == "X" else "X"
+    engine.reset()
+    write(render_text(engine.board))
+    if on_first_board is not None:
+        on_first_board()
+    while not engine.game_over:
+        player = engine.current_player
+        if player == human:
+            try:
+                move = parse_move(read(f"{player} to move (row col): "), engine.size)
+            except EOFError:
+                return None
+            if move is None or not engine.is_valid_move(move):
+                write("Enter a free cell as row and column, e.g. 2 3.")
+                continue
+        else:
+            move = engine.choose_move(difficulty)
+            write(f"{difficulty} plays {move // engine.size + 1} {move % engine.size + 1}")
+        engine.make_move(move)
+        write(render_text(engine.board))
+    write(_result(engine.winner))
+    return engine.winner
+
+
+def spectate(session, games=None, show=False, write=print):
+    """
+    Plays a spectator session's games, at most `games` of them (a replay
+    stops at the end of its log), printing each board if `show`; returns the
+    session's tally.
+    """
+    engine = session.engine
+    played = 0
+    while (games is None or played < games) and session.start_game():
+        if show:
+            write(f"{session.strategies['X']} (X) vs {session.strategies['O']} (O)")
+        while not engine.game_over:
+            move = session.recorded_move() if session.replaying else engine.choose_move(session.strategy)
+            if move is None or not engine.is_valid_move(move):
+                break
+            engine.make_move(move)
+            session.tally.frame()
+            if show:
+                write(render_text(engine.board) + "\n")
+        winner = session.finish_game()
+        if show:
+            write(_result(winner))
+        played += 1
+    session.close()
+    return session.tally
+
+
+def main(argv=None, launched=None):
+    parser = argparse.ArgumentParser(description="Play Tic-Tac-Toe in the terminal.")
+    parser.add_argument("--difficulty", choices=DIFFICULTIES, default="Hard", help="AI opponent")
+    parser.add_argument("--play-as", choices=("X", "O"), default="X", help="your mark; X moves first")
+    parser.add_argument("--size", type=int, default=3, help="cells per side of the board")
+    parser.add_argument("--win-length", type=int, help="marks in a row to win (default: the size)")
+    parser.add_argument("--time-budget", type=float, default=1.0, help="seconds per searched AI move")
+    parser.add_argument("--strength", type=float, default=DEFAULT_STRENGTH, help="strength of the Adaptive AI, 0 to 1")
+    parser.add_argument("--watch", type=parse_pairing, metavar="X:O", help="watch two AIs play instead")
+    parser.add_argument("--replay", metavar="LOG", help="replay every game of a game log instead")
+    parser.add_argument("--games", type=int, default=1, help="games to watch")
+    parser.add_argument("--show", action="store_true", help="print every board while watching or replaying")
+    parser.add_argument("--timings", action="store_true", help="report import and first-board times on stderr")
+    args = parser.parse_args(argv)
+
+    launched = _LAUNCHED if launched is None else launched
+    imported = time.perf_counter()
+    engine = GameEngine(size=args.size, win_length=args.win_length, time_budget=args.time_budget,
+                        strength=args.strength)
+
+    def report():
+        if args.timings:
+            print(f"imports {(imported - launched) * 1000:.1f} ms, "
+                  f"first board {(time.perf_counter() - launched) * 1000:.1f} ms", file=sys.stderr)
+
+    if args.watch or args.replay:
+        x, o = args.watch or ("Hard", "Hard")
+        try:
+            session = SpectatorSession(engine, x, o, args.replay)
+        except (OSError, ValueError) as error:
+            parser.error(f"cannot replay {args.replay}: {error}")
+        start = time.perf_counter()
+        report()
+        tally = spectate(session, None if args.replay else args.games, args.show)
+        elapsed = time.perf_counter() - start
+        print(f"{tally.summary(fps=False)} in {elapsed:.2f}s "
+              f"({tally.games / elapsed if elapsed else 0:.0f} games/s)")
+        return 0
+
+    try:
+        play(engine, args.difficulty, args.play_as, on_first_board=report)
+    except KeyboardInterrupt:
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
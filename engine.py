@@ -0,0 +1,302 @@
+"""
+Headless Tic-Tac-Toe engine.
+
+Holds the game state, move validation, win/tie detection and the Easy,
+Intermediate, Hard, MCTS and Adaptive strategies. Nothing here imports tkinter, so the engine
+can be driven by the GUI, scripts or servers alike.
+"""
+import random
+import time
+
+from adaptive import DEFAULT_STRENGTH, AdaptiveSearcher
+from board import Board, other_player
+from book import load_default_book
+from mcts import DEFAULT_PLAYOUTS, MCTSSearcher
+from search import AlphaBetaSearcher, ParallelSearcher
+from solver import Solver
+from stats import SearchStats
+from table import load_default_table, side_to_move
+
+DIFFICULTIES = ("Easy", "Intermediate", "Hard", "MCTS", "Adaptive")
+# Kept as the table until the shipped one is first needed.
+_UNLOADED = object()
+
+
+# --- AI Strategies ---
+# Each strategy takes a board and the player to move and returns a cell index,
+# or None when the board is full. An optional `SearchStats` receives the work done.
+
+def easy_move(board, player, rng=random, stats=None):
+    """Easy AI: Chooses a random available spot."""
+    available_moves = board.empty_cells()
+    return rng.choice(available_moves) if available_moves else None
+
+
+def find_winning_move(board, player, stats=None):
+    """Finds a cell that completes a line for the player, or None."""
+    for i in board.empty_cells():
+        if stats is not None:
+            stats.nodes += 1
+        if board.completes_line(i, player):
+            return i
+    return None
+
+
+def intermediate_move(board, player, rng=random, stats=None):
+    """Intermediate AI: Tries to win, then tries to block, then takes the center, otherwise chooses randomly."""
+    center = board.geometry.center
+    win_move = find_winning_move(board, player, stats)
+    if win_move is not None:
+        return win_move
+
+    block_move = find_winning_move(board, other_player(player), stats)
+    if block_move is not None:
+        return block_move
+
+    if board.is_empty(center):
+        return center
+
+    return easy_move(board, player, rng)
+
+
+def is_classic(board):
+    """Checks whether a board is the 3x3, three-in-a-row game the solver and table cover."""
+    return board.size == 3 and board.win_length == 3
+
+
+def is_instant(board, difficulty):
+    """Checks whether a strategy answers in microseconds on this board, so it can run on an event loop."""
+    return difficulty in ("Easy", "Intermediate") or (difficulty == "Hard" and is_classic(board))
+
+
+def hard_move(board, player, solver, table=None, searcher=None, cancel=None, stats=None, book=None):
+    """
+    Hard AI: Plays perfectly on the classic board, using the lookup table when
+    it covers the position and the memoized Minimax solver otherwise. Larger
+    boards are searched with time-limited alpha-beta, which stops early when
+    the optional `cancel` event is set. Positions the table does not cover are
+    first looked up in the optional `book`, which then keeps every search result.
+    """
+    classic = is_classic(board)
+    if classic and table is not None and side_to_move(board) == player:
+        if stats is not None:
+            stats.nodes += 1
+            stats.table_hits += 1
+        return table.best_move(board)
+
+    if book is not None:
+        move = book.lookup(board, player)
+        if stats is not None:
+            stats.nodes += 1
+            if move is None:
+                stats.table_misses += 1
+            else:
+                stats.table_hits += 1
+        if move is not None:
+            return move
+
+    if not classic:
+        if searcher is None:
+            searcher = AlphaBetaSearcher()
+        move = searcher.best_move(board, player, cancel)
+        if stats is not None:
+            stats.nodes += searcher.nodes
+            stats.cutoffs += searcher.cutoffs
+            stats.depth = searcher.depth_reached
+    else:
+        nodes, hits, misses = solver.nodes, solver.table.hits, solver.table.misses
+        move = solver.best_move(board, player)
+        if stats is not None:
+            stats.nodes += solver.nodes - nodes
+            stats.table_hits += solver.table.hits - hits
+            stats.table_misses += solver.table.misses - misses
+            stats.depth = board.cells - board.move_count()
+
+    # A cancelled search only has a partial answer, which is not worth keeping.
+    if book is not None and move is not None and not (cancel is not None and cancel.is_set()):
+        book.store(board, player, move)
+    return move
+
+
+def mcts_move(board, player, searcher=None, cancel=None, stats=None):
+    """MCTS AI: Plays the most visited move of a UCT search within the searcher's playout or time budget."""
+    if searcher is None:
+        searcher = MCTSSearcher()
+    move = searcher.best_move(board, player, cancel)
+    if stats is not None:
+        stats.nodes += searcher.playouts
+        stats.playouts += searcher.playouts
+        stats.depth = searcher.depth_reached
+    return move
+
+
+def adaptive_move(board, player, searcher=None, cancel=None, stats=None, solver=None, table=None):
+    """
+    Adaptive AI: Searches as deep as the searcher's strength allows, or
+    sometimes plays a random move. At full strength on the classic board it
+    plays like Hard, from the lookup table or the solver, instead of running
+    a full-depth search.
+    """
+    if searcher is None:
+        searcher = AdaptiveSearcher()
+    if searcher.strength == 1.0 and is_classic(board) and solver is not None:
+        searcher.noisy = False
+        return hard_move(board, player, solver, table, stats=stats)
+    move = searcher.best_move(board, player, cancel)
+    if stats is not None:
+        stats.nodes += searcher.nodes
+        stats.cutoffs += searcher.cutoffs
+        stats.depth = searcher.depth_reached
+    return move
+
+
+# --- Game State ---
+class GameEngine:
+    """
+    State and rules of a single game, plus the AI opponents.
+
+    The board is `size` x `size` with `win_length` in a row to win (default:
+    the full size). The solver, lookup table and move book are kept across
+    `reset` calls so that their caches persist from one game to the next
+    (without a `table`, the shipped one is opened on first use);
+    `time_budget` bounds each Hard search, in seconds, on boards other than
+    the classic 3x3, and `search_processes` above 1 splits those searches
+    across a process pool (None for one process per core). MCTS moves stop
+    after `mcts_playouts` playouts or the time budget, whichever comes first.
+    Adaptive moves play at `strength`, from 0 to 1, adjustable later through
+    `adaptive.strength`.
+
+    Every `choose_move` call records a `SearchStats`, kept as `last_stats` and
+    passed to each callable in `stats_hooks` (e.g. `StatsRegistry.record`).
+    The cells played and the microseconds each move took since the previous
+    one are kept in `moves` and `move_us`, for the game log.
+    """
+    def __init__(self, human_player="X", ai_player="O", solver=None, table=None, rng=None,
+                 size=3, win_length=None, time_budget=1.0, book=None, search_processes=1,
+                 mcts_playouts=DEFAULT_PLAYOUTS, strength=DEFAULT_STRENGTH):
+        self.human_player = human_player
+        self.ai_player = ai_player
+        self.solver = solver if solver is not None else Solver()
+        self._table = table if table is not None else _UNLOADED
+        self.book = book if book is not None else load_default_book()
+        if search_processes == 1:
+            self.searcher = AlphaBetaSearcher(time_budget)
+        else:
+            self.searcher = ParallelSearcher(time_budget, processes=search_processes)
+        self.rng = rng if rng is not None else random.Random()
+        self.mcts = MCTSSearcher(mcts_playouts, time_budget, self.rng)
+        self.adaptive = AdaptiveSearcher(strength, time_budget, self.rng)
+        self.size = size
+        self.win_length = size if win_length is None else win_length
+        self.stats_hooks = []
+        self.last_stats = None
+        self.seed = 0
+        self.reset()
+
+    @property
+    def table(self):
+        """The perfect-play lookup table, or None if none has been built."""
+        if self._table is _UNLOADED:
+            self._table = load_default_table()
+        return self._table
+
+    @table.setter
+    def table(self, table):
+        self._table = table
+
+    def reset(self, size=None, win_length=None, seed=None):
+        """Starts a new game with X to move, optionally on a different board or reseeding the AI."""
+        if size is not None:
+            self.size = size
+            self.win_length = size if win_length is None else win_length
+        if seed is not None:
+            self.rng.seed(seed)
+            self.seed = seed
+        self.board = Board(self.size, self.win_length)
+        self.current_player = "X"
+        self.game_over = False
+        self.winner = None
+        self.winning_line = None
+        self.moves = []
+        self.started = time.time()
+        # perf_counter_ns at the start and after every move
+        self._move_ns = [time.perf_counter_ns()]
+
+    def is_valid_move(self, index):
+        """Checks whether the current player may play on a cell."""
+        return not self.game_over and 0 <= index < self.board.cells and self.board.is_empty(index)
+
+    def make_move(self, index):
+        """Plays the current player's mark on a cell and advances the turn."""
+        if not self.is_valid_move(index):
+            raise ValueError(f"Illegal move on cell {index}")
+
+        player = self.current_player
+        self.board.play(index, player)
+        self.moves.append(index)
+        self._move_ns.append(time.perf_counter_ns())
+
+        line = self.board.winning_line(player)
+        if line is not None:
+            self.game_over = True
+            self.winner = player
+            self.winning_line = line
+        elif self.board.is_full():
+            self.game_over = True
+        else:
+            self.current_player = other_player(player)
+
+    @property
+    def move_us(self):
+        """Microseconds each move took since the previous one (or the start of the game)."""
+        stamps = self._move_ns
+        return [(stamps[i] - stamps[i - 1]) // 1000 for i in range(1, len(stamps))]
+
+    @property
+    def is_tie(self):
+        """True once the board is full without a winner."""
+        return self.game_over and self.winner is None
+
+    def choose_move(self, difficulty, player=None, board=None, cancel=None):
+        """
+        Returns the cell the AI would play at the given difficulty.
+
+        `board` defaults to the live board; pass a copy to search from another
+        thread while the game carries on. `cancel` is an optional
+        `threading.Event` that cuts a long search short.
+        """
+        if player is None:
+            player = self.current_player
+        if board is None:
+            board = self.board
+
+        stats = SearchStats(difficulty)
+        start = time.perf_counter_ns()
+        if difficulty == "Easy":
+            move = easy_move(board, player, self.rng, stats)
+        elif difficulty == "Intermediate":
+            move = intermediate_move(board, player, self.rng, stats)
+        elif difficulty == "Hard":
+            move = hard_move(board, player, self.solver, self.table, self.searcher, cancel, stats, self.book)
+        elif difficulty == "MCTS":
+            move = mcts_move(board, player, self.mcts, cancel, stats)
+        elif difficulty == "Adaptive":
+            move = adaptive_move(board, player, self.adaptive, cancel, stats, self.solver, self.table)
+        else:
+            raise ValueError(f"Unknown difficulty: {difficulty!r}")
+        stats.elapsed_ns = time.perf_counter_ns() - start
+
+        self.last_stats = stats
+        for hook in self.stats_hooks:
+            hook(stats)
+        return move
+
+    def ai_move(self, difficulty):
+        """Chooses and plays a move for the current player; returns the cell or None."""
+        if self.game_over:
+            return None
+
+        move = self.choose_move(difficulty)
+        if move is not None:
+            self.make_move(move)
+        return move
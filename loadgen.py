@@ -0,0 +1,135 @@
+"""
+Load generator for the Tic-Tac-Toe server.
+
+Opens many concurrent client connections, each playing several games with
+random legal moves, and reports moves per second and the latency from
+sending a move to receiving the server's acknowledgement of it (which, in
+AI games, arrives together with the AI's reply).
+
+Usage:
+    python loadgen.py --clients 1000 --games 5 --opponent Hard
+    python loadgen.py --serve --clients 200 --opponent human     # start a loopback server in-process
+    python loadgen.py --port 8765 --size 5 --win-length 4 --opponent Intermediate
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from board import Board, other_player
+from server import DEFAULT_HOST, DEFAULT_PORT, MAX_LINE, GameServer
+from tournament import percentile
+
+
+async def run_client(host, port, games, opponent, size, win_length, latencies, rng):
+    """Plays `games` games over one connection; returns the number of moves sent."""
+    reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+    moves = 0
+    try:
+        for _ in range(games):
+            request = {"type": "play", "opponent": opponent, "size": size, "win_length": win_length}
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+
+            board = Board(size, win_length)
+            me = None
+            turn = "X"
+            sent_at = None
+            while True:
+                line = await reader.readline()
+                if not line:
+                    raise ConnectionError("server closed the connection")
+                message = json.loads(line)
+                kind = message["type"]
+                if kind == "start":
+                    me = message["you"]
+                elif kind == "move":
+                    board.play(message["cell"], message["player"])
+                    turn = other_player(message["player"])
+                    if board.has_won(message["player"]) or board.is_full():
+                        turn = None
+                    if message["player"] == me and sent_at is not None:
+                        latencies.append(time.perf_counter_ns() - sent_at)
+                        sent_at = None
+                elif kind == "end":
+                    break
+                elif kind == "error":
+                    raise RuntimeError(message["message"])
+
+                if me is not None and turn == me and sent_at is None:
+                    cell = rng.choice(board.empty_cells())
+                    sent_at = time.perf_counter_ns()
+                    writer.write(json.dumps({"type": "move", "cell": cell}).encode() + b"\n")
+                    await writer.drain()
+                    moves += 1
+    finally:
+        writer.close()
+    return moves
+
+
+async def run_load(host, port, clients, games, opponent, size, win_length, seed=0, serve=False):
+    """Runs all clients concurrently and returns the summary dict."""
+    server = None
+    if serve:
+        server = await GameServer().start(host, 0)
+        port = server.sockets[0].getsockname()[1]
+
+    latencies = []
+    start = time.perf_counter()
+    try:
+        moves = await asyncio.gather(*(
+            run_client(host, port, games, opponent, size, win_length, latencies, random.Random(seed + n))
+            for n in range(clients)
+        ))
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total_moves = sum(moves)
+    return {
+        "clients": clients,
+        "games": clients * games,
+        "moves": total_moves,
+        "seconds": elapsed,
+        "moves_per_second": total_moves / elapsed if elapsed else 0.0,
+        "latency_ns": {
+            "p50": percentile(latencies, 0.50),
+            "p90": percentile(latencies, 0.90),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else 0,
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate load against the Tic-Tac-Toe server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--serve", action="store_true", help="run a loopback server in this process")
+    parser.add_argument("--clients", type=int, default=100, help="concurrent connections")
+    parser.add_argument("--games", type=int, default=5, help="games per connection")
+    parser.add_argument("--opponent", default="Hard", help="Easy, Intermediate, Hard or human")
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--win-length", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.opponent == "human" and args.clients % 2:
+        parser.error("--opponent human needs an even number of clients")
+
+    summary = asyncio.run(run_load(args.host, args.port, args.clients, args.games, args.opponent,
+                                   args.size, args.win_length or args.size, args.seed, args.serve))
+    latency = summary["latency_ns"]
+    print(f"{summary['clients']} clients, {summary['games']} games, {summary['moves']} moves "
+          f"in {summary['seconds']:.2f}s ({summary['moves_per_second']:.0f} moves/s)")
+    print(f"move latency: p50 {latency['p50'] / 1e6:.2f} ms, p90 {latency['p90'] / 1e6:.2f} ms, "
+          f"p99 {latency['p99'] / 1e6:.2f} ms, max {latency['max'] / 1e6:.2f} ms")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
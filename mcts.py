@@ -0,0 +1,227 @@
+"""
+Monte Carlo Tree Search for N x N, K-in-a-row boards.
+
+Each iteration selects a path down the tree with UCT, expands one new move,
+finishes the game with a uniformly random playout and backs the result up
+the path. Playouts run on the two bit masks alone: the empty cells are dealt
+into a scratch list kept by the searcher and shuffled in place, and a win is
+checked only on the lines through each new mark, so a playout allocates no
+board or move list. Tree nodes only ever consider the candidate cells the
+alpha-beta search would (every empty cell up to 5x5, else cells near a mark).
+
+The budget is a playout count, a time limit, or both, whichever runs out
+first. The tree is kept between calls: when the next position is the
+current root after one or two more moves, that subtree and its statistics
+are reused.
+"""
+import math
+import random
+import time
+
+from search import candidate_cells
+
+DEFAULT_PLAYOUTS = 2000
+# UCT exploration constant.
+EXPLORATION = math.sqrt(2)
+# How many iterations to run between deadline and cancel checks.
+_CHECK_INTERVAL = 64
+
+
+class _Node:
+    """A position in the tree, reached by `player` playing `move`."""
+    __slots__ = ("move", "player", "parent", "children", "untried", "wins", "visits", "winner")
+
+    def __init__(self, move, player, parent, untried, winner):
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.wins = 0.0
+        self.visits = 0
+        # 0 or 1 once the game is decided at this node, -1 for a draw, None while open.
+        self.winner = winner
+
+
+class MCTSSearcher:
+    """
+    UCT search with random playouts.
+
+    `playouts` caps the iterations per move (kept as `max_playouts`) and
+    `time_budget` the seconds per move; either may be None, but not both.
+    After each call, `playouts` counts the iterations run, `depth_reached`
+    the deepest selection path and `reused` the visits inherited from the
+    previous tree.
+    """
+    def __init__(self, playouts=DEFAULT_PLAYOUTS, time_budget=None, rng=None):
+        if playouts is None and time_budget is None:
+            raise ValueError("MCTS needs a playout count or a time budget")
+        self.max_playouts = playouts
+        self.time_budget = time_budget
+        self.rng = rng if rng is not None else random.Random()
+        self.playouts = 0
+        self.depth_reached = 0
+        self.reused = 0
+        self._root = None
+        self._root_masks = None
+        self._geometry = None
+        self._scratch = []
+
+    def best_move(self, board, player, cancel=None):
+        """
+        Returns the most visited move after spending the budget, or None if
+        the board is full or already won. Setting the optional `cancel` event
+        stops the search early.
+        """
+        geometry = board.geometry
+        side = 0 if player == "X" else 1
+        root = self._reuse(board, side)
+        if root is None:
+            winner = self._terminal(geometry, board.x, board.o, None)
+            root = _Node(None, 1 - side, None, None, winner)
+            if winner is None:
+                root.untried = candidate_cells(geometry, board.occupied)
+        self._root = root
+        self._root_masks = (board.x, board.o)
+        self._geometry = geometry
+        if len(self._scratch) != geometry.cells:
+            self._scratch = [0] * geometry.cells
+        self.reused = root.visits
+        self.playouts = 0
+        self.depth_reached = 0
+        if root.winner is not None or not (root.untried or root.children):
+            return None
+
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        limit = self.max_playouts
+        while limit is None or self.playouts < limit:
+            if self.playouts % _CHECK_INTERVAL == 0:
+                if cancel is not None and cancel.is_set():
+                    break
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+            self._iterate(root, board.x, board.o, geometry)
+            self.playouts += 1
+
+        best = max(root.children, key=lambda child: child.visits, default=None)
+        return best.move if best is not None else root.untried[0]
+
+    def forget(self):
+        """Drops the tree kept for the next move, so the next search starts afresh."""
+        self._root = None
+        self._root_masks = None
+        self._geometry = None
+
+    def _reuse(self, board, side):
+        """Returns the node for this position if it is in the kept tree, detached as the new root."""
+        root = self._root
+        if root is None or self._geometry is not board.geometry:
+            return None
+        x, o = self._root_masks
+        if (x & board.x) != x or (o & board.o) != o:
+            return None
+        node = root
+        for _ in range(2):
+            if (x, o) == (board.x, board.o):
+                break
+            for child in node.children:
+                bit = 1 << child.move
+                child_x, child_o = (x | bit, o) if child.player == 0 else (x, o | bit)
+                if (child_x & board.x) == child_x and (child_o & board.o) == child_o:
+                    node, x, o = child, child_x, child_o
+                    break
+            else:
+                return None
+        if (x, o) != (board.x, board.o) or node.player == side:
+            return None
+        node.parent = None
+        return node
+
+    @staticmethod
+    def _terminal(geometry, x, o, last_move):
+        """Returns the winning side, -1 for a draw or None while the game is open."""
+        lines = range(len(geometry.win_masks)) if last_move is None else geometry.cell_lines[last_move]
+        for line in lines:
+            mask = geometry.win_masks[line]
+            if x & mask == mask:
+                return 0
+            if o & mask == mask:
+                return 1
+        if (x | o) == geometry.full_mask:
+            return -1
+        return None
+
+    def _iterate(self, root, x, o, geometry):
+        """Runs one selection, expansion, playout and backup pass."""
+        node = root
+        depth = 0
+        # Selection: descend through fully expanded nodes by UCT.
+        while node.winner is None and not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            node = max(node.children, key=lambda child: child.wins / child.visits
+                       + EXPLORATION * math.sqrt(log_visits / child.visits))
+            if node.player == 0:
+                x |= 1 << node.move
+            else:
+                o |= 1 << node.move
+            depth += 1
+
+        # Expansion: add one untried move.
+        if node.winner is None and node.untried:
+            untried = node.untried
+            move = untried.pop(int(self.rng.random() * len(untried)))
+            player = 1 - node.player
+            if player == 0:
+                x |= 1 << move
+            else:
+                o |= 1 << move
+            winner = self._terminal(geometry, x, o, move)
+            child = _Node(move, player, node, None if winner is not None else candidate_cells(geometry, x | o),
+                          winner)
+            node.children.append(child)
+            node = child
+            depth += 1
+        if depth > self.depth_reached:
+            self.depth_reached = depth
+
+        winner = node.winner if node.winner is not None else self._playout(geometry, x, o, 1 - node.player)
+
+        # Backup: each node scores the result for the player who moved into it.
+        while node is not None:
+            node.visits += 1
+            if winner == node.player:
+                node.wins += 1.0
+            elif winner == -1:
+                node.wins += 0.5
+            node = node.parent
+
+    def _playout(self, geometry, x, o, side):
+        """Plays random moves to the end; returns the winning side or -1 for a draw."""
+        scratch = self._scratch
+        occupied = x | o
+        count = 0
+        for cell in range(geometry.cells):
+            if not occupied >> cell & 1:
+                scratch[count] = cell
+                count += 1
+
+        random_value = self.rng.random
+        cell_lines = geometry.cell_lines
+        win_masks = geometry.win_masks
+        for i in range(count):
+            # Fisher-Yates, one step per move.
+            j = i + int(random_value() * (count - i))
+            cell = scratch[j]
+            scratch[j] = scratch[i]
+            if side == 0:
+                x |= 1 << cell
+                mask = x
+            else:
+                o |= 1 << cell
+                mask = o
+            for line in cell_lines[cell]:
+                win = win_masks[line]
+                if mask & win == win:
+                    return side
+            side = 1 - side
+        return -1
@@ -0,0 +1,230 @@
+"""
+Client for the best-move service, and a stress test for it.
+
+`MoveClient` asks a running `moveservice.py` for moves over a small pool of
+keep-alive HTTP connections, so threads can share one client without
+reconnecting for every request. When the service is down, slow past
+`timeout` or fails, the client works the move out with a local engine
+instead, unless built with `fallback=False`.
+
+Usage:
+    python moveclient.py --serve --threads 16 --requests 20000           # loopback service in this process
+    python moveclient.py --port 8766 --difficulty Intermediate --size 5 --win-length 4
+"""
+import argparse
+import http.client
+import json
+import queue
+import random
+import sys
+import threading
+import time
+
+from board import Board, other_player
+from engine import DIFFICULTIES, GameEngine
+from moveservice import DEFAULT_HOST, DEFAULT_PORT, MoveService, serve_in_thread
+from tournament import percentile
+
+# Seconds to wait on the service for each network operation before falling back.
+DEFAULT_TIMEOUT = 1.0
+# Idle connections kept for reuse.
+DEFAULT_POOL_SIZE = 8
+
+
+def board_text(board):
+    """Returns a `Board` or `Position` in the service's format: X, O or . per cell, row-major."""
+    return "".join(board.get(i) or "." for i in range(board.cells))
+
+
+class MoveClient:
+    """
+    Thread-safe client of a move service at `host`:`port`. After each call,
+    `requests` counts the moves asked for and `fallbacks` those answered by
+    the local engine.
+    """
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=DEFAULT_TIMEOUT,
+                 pool_size=DEFAULT_POOL_SIZE, fallback=True, time_budget=0.2):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.fallback = fallback
+        self.time_budget = time_budget
+        self.requests = 0
+        self.fallbacks = 0
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        # Per thread, (size, win length) -> local engine, only built once the service fails
+        self._local = threading.local()
+
+    def best_move(self, board, difficulty="Hard"):
+        """
+        Returns the cell the AI at `difficulty` would play for the player to
+        move on `board` (a `Board` or `Position`). Raises ValueError if the
+        service rejects the request.
+        """
+        body = json.dumps({"board": board_text(board), "difficulty": difficulty,
+                           "win_length": board.win_length}).encode()
+        with self._lock:
+            self.requests += 1
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            connection.request("POST", "/move", body, {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            payload = json.loads(response.read())
+        except (OSError, http.client.HTTPException, ValueError) as error:
+            connection.close()
+            return self._local_move(board, difficulty, error)
+
+        if response.will_close or self._idle.qsize() >= self.pool_size:
+            connection.close()
+        else:
+            self._idle.put(connection)
+        if response.status >= 500:
+            return self._local_move(board, difficulty, RuntimeError(payload.get("error")))
+        if response.status != 200:
+            raise ValueError(payload.get("error", f"HTTP {response.status}"))
+        return payload["cell"]
+
+    def _local_move(self, board, difficulty, error):
+        """Answers with a local engine, or re-raises the service's failure when fallback is off."""
+        if not self.fallback:
+            raise error
+        with self._lock:
+            self.fallbacks += 1
+        # Each thread searches with its own engine, so fallbacks run side by side.
+        engines = getattr(self._local, "engines", None)
+        if engines is None:
+            engines = self._local.engines = {}
+        key = (board.size, board.win_length)
+        engine = engines.get(key)
+        if engine is None:
+            engine = engines[key] = GameEngine(size=board.size, win_length=board.win_length,
+                                               time_budget=self.time_budget)
+        local = Board(board.size, board.win_length, board.x, board.o)
+        player = "X" if local.x.bit_count() == local.o.bit_count() else "O"
+        return engine.choose_move(difficulty, player, local)
+
+    def close(self):
+        """Closes the pooled connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- Stress Test ---
+def random_positions(count, size, win_length, rng):
+    """Returns `count` positions taken from random games, each with a move left to play."""
+    positions = []
+    while len(positions) < count:
+        board = Board(size, win_length)
+        player = "X"
+        while True:
+            positions.append(board.copy())
+            board.play(rng.choice(board.empty_cells()), player)
+            if board.has_won(player) or board.is_full() or len(positions) == count:
+                break
+            player = other_player(player)
+    return positions
+
+
+def stress(client, positions, requests, threads, difficulty, seed=0):
+    """Sends `requests` moves from `threads` threads; returns the summary dict."""
+    latencies = []
+    errors = []
+    per_thread = [requests // threads + (n < requests % threads) for n in range(threads)]
+
+    def run(n):
+        rng = random.Random(seed + n)
+        mine = []
+        try:
+            for _ in range(per_thread[n]):
+                board = rng.choice(positions)
+                start = time.perf_counter_ns()
+                client.best_move(board, difficulty)
+                mine.append(time.perf_counter_ns() - start)
+        except Exception as error:
+            errors.append(error)
+        latencies.extend(mine)
+
+    workers = [threading.Thread(target=run, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "qps": len(latencies) / elapsed if elapsed else 0.0,
+        "fallbacks": client.fallbacks,
+        "latency_ns": {
+            "p50": percentile(latencies, 0.50),
+            "p90": percentile(latencies, 0.90),
+            "p99": percentile(latencies, 0.99),
+            "p999": percentile(latencies, 0.999),
+            "max": latencies[-1] if latencies else 0,
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stress a move service with concurrent requests.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--serve", action="store_true", help="run a loopback service in this process")
+    parser.add_argument("--threads", type=int, default=16, help="concurrent client threads")
+    parser.add_argument("--requests", type=int, default=20_000, help="moves to ask for in total")
+    parser.add_argument("--positions", type=int, default=2000, help="distinct random positions to draw from")
+    parser.add_argument("--difficulty", choices=DIFFICULTIES, default="Hard")
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--win-length", type=int)
+    parser.add_argument("--time-budget", type=float, default=0.05, help="seconds per searched move")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds before falling back")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    service = stop = None
+    port = args.port
+    if args.serve:
+        service = MoveService(args.time_budget)
+        port, stop = serve_in_thread(service, args.host)
+    positions = random_positions(args.positions, args.size, args.win_length or args.size, random.Random(args.seed))
+    client = MoveClient(args.host, port, args.timeout, pool_size=args.threads, time_budget=args.time_budget)
+    try:
+        summary = stress(client, positions, args.requests, args.threads, args.difficulty, args.seed)
+    finally:
+        client.close()
+        if stop is not None:
+            stop()
+
+    latency = summary["latency_ns"]
+    print(f"{summary['requests']} requests from {args.threads} threads in {summary['seconds']:.2f}s "
+          f"({summary['qps']:.0f} requests/s), {summary['fallbacks']} answered locally")
+    print(f"latency: p50 {latency['p50'] / 1e6:.2f} ms, p90 {latency['p90'] / 1e6:.2f} ms, "
+          f"p99 {latency['p99'] / 1e6:.2f} ms, p99.9 {latency['p999'] / 1e6:.2f} ms, max {latency['max'] / 1e6:.2f} ms")
+    if service is not None:
+        stats = service.stats()
+        print(f"service: {stats['cache_hits']} cache hits, {stats['shared']} shared in flight, "
+              f"{stats['batched']} positions worked out in {stats['batches']} batches")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,404 @@
+"""
+Best-move service over HTTP/JSON.
+
+Answers "what would this AI play here?" for any board, so other programs can
+use the strategies without the GUI or a game session. Requests are served on
+one asyncio event loop over keep-alive HTTP/1.1:
+
+    POST /move   {"board": "X...O....", "difficulty": "Hard", "win_length": 3}
+        The board is one character per cell, row-major: X, O, or . for an
+        empty cell; its length sets the size. The player to move follows
+        from the marks (X moves first), and the win length defaults to the
+        size. Answers {"cell": 4, "row": 1, "col": 1, "cached": false}.
+    GET /stats
+        Request, cache, deduplication and batching counters.
+
+Errors answer with {"error": "..."}: a 4xx status for a bad request, 500
+if working the move out failed.
+
+Positions are keyed by their canonical form over the board's symmetries (see
+position.py), so mirrored and rotated boards share all of the following:
+    - Hard answers are kept in a shared LRU cache.
+    - Identical positions requested while one is being worked out wait for
+      that one answer instead of starting another.
+    - New positions are gathered for up to `BATCH_WINDOW` seconds, or until
+      `MAX_BATCH` are waiting, and worked out together on a worker thread, so
+      the event loop hands work over once per batch instead of once per
+      request.
+
+Usage:
+    python moveservice.py [--host 127.0.0.1] [--port 8766] [--time-budget 0.2] [--workers 2]
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from book import MoveBook, load_default_book
+from engine import DIFFICULTIES, GameEngine
+from position import Position
+from solver import Solver, TranspositionTable
+from table import load_default_table
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+# Longest accepted request or header line, and longest accepted body.
+MAX_LINE = 1024
+MAX_BODY = 4096
+MAX_SIZE = 15
+DEFAULT_CACHE_SIZE = 65536
+# Seconds a new position waits for others to share its batch, and the most positions per batch.
+BATCH_WINDOW = 0.001
+MAX_BATCH = 64
+# Only these strategies answer the same position the same way, so only their answers are cached.
+CACHED_DIFFICULTIES = ("Hard",)
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    """A request the service answers with an error status."""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_position(data):
+    """Reads the position of a /move request body; raises ValueError if it is not one the AI can move in."""
+    board = data.get("board")
+    if not isinstance(board, str):
+        raise ValueError("board must be a string of X, O and . marks")
+    size = int(round(len(board) ** 0.5))
+    if size * size != len(board) or not 1 <= size <= MAX_SIZE:
+        raise ValueError(f"board must have N x N cells, N from 1 to {MAX_SIZE}")
+    win_length = int(data.get("win_length", size))
+    if not 1 <= win_length <= size:
+        raise ValueError(f"win_length must be from 1 to {size}")
+
+    x = o = 0
+    for index, mark in enumerate(board.upper()):
+        if mark == "X":
+            x |= 1 << index
+        elif mark == "O":
+            o |= 1 << index
+        elif mark != ".":
+            raise ValueError(f"unknown mark {mark!r}")
+    if not 0 <= x.bit_count() - o.bit_count() <= 1:
+        raise ValueError("X moves first: X must have as many marks as O or one more")
+    position = Position(size, win_length, x, o)
+    masks = position.geometry.win_masks
+    if any(mask & x == mask or mask & o == mask for mask in masks) or x | o == position.geometry.full_mask:
+        raise ValueError("the game is already over")
+    return position
+
+
+class MoveService:
+    """
+    Serves best moves for any number of connections from one event loop.
+
+    Searches run on `workers` threads, each with its own engines; the solver,
+    lookup table and move book are shared, as in the game server.
+    """
+    def __init__(self, time_budget=0.2, workers=2, cache_size=DEFAULT_CACHE_SIZE,
+                 batch_window=BATCH_WINDOW, max_batch=MAX_BATCH):
+        self.time_budget = time_budget
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.solver = Solver()
+        self.table = load_default_table()
+        self.book = load_default_book() or MoveBook()
+        self.rng = random.Random()
+        # Canonical position -> move in that position, for CACHED_DIFFICULTIES.
+        self.cache = TranspositionTable(cache_size)
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="move-service")
+        self._local = threading.local()
+        # (canonical position, difficulty) -> future of its move, while being worked out
+        self._inflight = {}
+        self._pending = []
+        self._flush_handle = None
+        self._writers = set()
+        self.connections = 0
+        self.requests = 0
+        self.shared = 0
+        self.batches = 0
+        self.batched = 0
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Starts listening and returns the asyncio server."""
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+
+    def disconnect(self):
+        """Closes every open connection; their handlers finish once any answer in progress is sent."""
+        for writer in list(self._writers):
+            writer.close()
+
+    def close(self):
+        """Stops the worker threads once their batches are done."""
+        self._executor.shutdown(wait=True)
+
+    # --- HTTP ---
+
+    async def handle(self, reader, writer):
+        """Serves one keep-alive connection until it closes."""
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as error:
+                    self._respond(writer, error.status, {"error": str(error)}, False)
+                    await writer.drain()
+                    break
+                except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                try:
+                    status, payload = 200, await self.route(method, path, body)
+                except HTTPError as error:
+                    status, payload = error.status, {"error": str(error)}
+                except (ValueError, TypeError, KeyError) as error:
+                    status, payload = 400, {"error": str(error)}
+                except Exception as error:
+                    # A failed search; the connection stays usable and clients may answer locally.
+                    status, payload = 500, {"error": f"{type(error).__name__}: {error}"}
+                self._respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _read_request(self, reader):
+        """Returns (method, path, body, keep alive) for the next request, or None at the end of the stream."""
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            raise HTTPError(400, "malformed request line")
+        method, path, version = parts
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(400, "Content-Length must be a number") from None
+        if length < 0:
+            raise HTTPError(400, "Content-Length must not be negative")
+        if length > MAX_BODY:
+            raise HTTPError(413, f"body longer than {MAX_BODY} bytes")
+        body = await reader.readexactly(length) if length else b""
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method, path, body, keep_alive
+
+    @staticmethod
+    def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        head = f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+        if not keep_alive:
+            head += "Connection: close\r\n"
+        head += f"Content-Length: {len(body)}\r\n\r\n"
+        writer.write(head.encode() + body)
+
+    async def route(self, method, path, body):
+        """Answers one request; returns the JSON payload."""
+        if path == "/move":
+            if method != "POST":
+                raise HTTPError(405, "use POST for /move")
+            data = json.loads(body)
+            if not isinstance(data, dict):
+                raise ValueError("the body must be a JSON object")
+            difficulty = data.get("difficulty", "Hard")
+            if difficulty not in DIFFICULTIES:
+                raise ValueError(f"difficulty must be one of {DIFFICULTIES}")
+            position = parse_position(data)
+            cell, cached = await self.best_move(position, difficulty)
+            return {"cell": cell, "row": cell // position.size, "col": cell % position.size, "cached": cached}
+        if path == "/stats":
+            if method != "GET":
+                raise HTTPError(405, "use GET for /stats")
+            return self.stats()
+        raise HTTPError(404, f"no such endpoint: {path}")
+
+    def stats(self):
+        """Returns the service counters."""
+        return {
+            "connections": self.connections,
+            "requests": self.requests,
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "cache_size": len(self.cache),
+            "shared": self.shared,
+            "batches": self.batches,
+            "batched": self.batched,
+        }
+
+    # --- Moves ---
+
+    async def best_move(self, position, difficulty):
+        """Returns (cell, cached) for the player to move, from the cache, a shared search or a new batch entry."""
+        self.requests += 1
+        canonical, symmetry = position.canonical()
+        perm = position.geometry.symmetries[symmetry]
+        if difficulty in CACHED_DIFFICULTIES:
+            move = self.cache.get(canonical)
+            if move is not None:
+                return perm.index(move), True
+
+        key = (canonical, difficulty)
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._inflight[key] = loop.create_future()
+            self._pending.append(key)
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        else:
+            self.shared += 1
+        # Shielded, so one client going away does not cancel the answer others wait for.
+        move = await asyncio.shield(future)
+        return perm.index(move), False
+
+    def _flush(self):
+        """Sends the pending positions to a worker as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self.batches += 1
+            self.batched += len(batch)
+            asyncio.ensure_future(self._run_batch(batch))
+
+    async def _run_batch(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            moves = await loop.run_in_executor(self._executor, self._solve, batch)
+        except Exception as error:
+            # The request was fine, so even a ValueError from the search is the service's failure.
+            failure = HTTPError(500, f"{type(error).__name__}: {error}")
+            for key in batch:
+                self._inflight.pop(key).set_exception(failure)
+            return
+        for key, move in zip(batch, moves):
+            if isinstance(move, HTTPError):
+                self._inflight.pop(key).set_exception(move)
+                continue
+            canonical, difficulty = key
+            if difficulty in CACHED_DIFFICULTIES:
+                self.cache.put(canonical, move)
+            self._inflight.pop(key).set_result(move)
+
+    def _engine(self, position):
+        """Returns this worker thread's engine for the position's board."""
+        engines = getattr(self._local, "engines", None)
+        if engines is None:
+            engines = self._local.engines = {}
+        key = (position.size, position.win_length)
+        engine = engines.get(key)
+        if engine is None:
+            engine = engines[key] = GameEngine(solver=self.solver, table=self.table, book=self.book,
+                                               rng=random.Random(self.rng.getrandbits(63)),
+                                               size=position.size, win_length=position.win_length,
+                                               time_budget=self.time_budget)
+        return engine
+
+    def _solve(self, batch):
+        """
+        Worker thread: works out the move for every (canonical position,
+        difficulty) of a batch. A search that raises gives an `HTTPError` in
+        place of its move, so only that position's requests fail.
+        """
+        moves = []
+        for position, difficulty in batch:
+            try:
+                moves.append(self._engine(position).choose_move(difficulty, position.player, position.to_board()))
+            except Exception as error:
+                moves.append(HTTPError(500, f"{type(error).__name__}: {error}"))
+        return moves
+
+
+def serve_in_thread(service, host=DEFAULT_HOST, port=0):
+    """
+    Runs a service on an event loop in a daemon thread, for loopback tests.
+    Returns (port, stop), where `stop()` shuts the server down.
+    """
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    holder = {}
+
+    async def run():
+        server = await service.start(host, port)
+        holder["port"] = server.sockets[0].getsockname()[1]
+        holder["server"] = server
+        started.set()
+        async with server:
+            try:
+                await server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+        # Let open keep-alive connections close while the loop still runs.
+        service.disconnect()
+        await asyncio.gather(*(task for task in asyncio.all_tasks() if task is not asyncio.current_task()))
+
+    thread = threading.Thread(target=lambda: loop.run_until_complete(run()), name="move-service-loop", daemon=True)
+    thread.start()
+    started.wait()
+
+    def stop():
+        loop.call_soon_threadsafe(holder["server"].close)
+        thread.join()
+        loop.close()
+        service.close()
+
+    return holder["port"], stop
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, time_budget=0.2, workers=2):
+    """Runs a service until cancelled."""
+    service = MoveService(time_budget, workers)
+    server = await service.start(host, port)
+    print(f"Serving moves on {', '.join(str(sock.getsockname()) for sock in server.sockets)}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve AI moves over HTTP/JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--time-budget", type=float, default=0.2,
+                        help="seconds per searched move (Hard on boards other than 3x3, MCTS, Adaptive)")
+    parser.add_argument("--workers", type=int, default=2, help="threads working out batches")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.time_budget, args.workers))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+Immutable, interned board positions for use as dictionary and set keys.
+
+A `Position` is a value: the board geometry plus both players' marks packed
+into one integer, `code = x << cells | o`. Its hash is computed once, its
+canonical form over the board's 8 symmetries is computed on first use and
+kept, and `play` returns a new position instead of changing this one. The
+player to move follows from the marks, X moving first.
+
+Positions are interned: building a position equal to one that is still
+alive returns that same object, so caches and sets that see the same
+position many times hold it once. Interning is weak, so a position no longer
+referenced anywhere is freed as usual.
+
+Search still runs on the mutable `Board`, which updates its line counters
+incrementally; convert with `Position.from_board` and `to_board`.
+
+Usage:
+    python position.py [--games 20000] [--size 3]    # memory per cached position: Position vs tuple of tuples
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+import weakref
+
+from board import SIZE, Board, get_geometry
+
+# geometry -> {code: Position}, holding each position only while it is in use elsewhere.
+_interned = {}
+# Kept as `_canonical` by positions that are their own canonical form, so they do not refer to themselves.
+_SELF = object()
+
+
+def _cells(mask):
+    """Yields the index of every set bit of a mask."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _intern(geometry, code):
+    table = _interned.get(geometry)
+    if table is None:
+        table = _interned.setdefault(geometry, weakref.WeakValueDictionary())
+    position = table.get(code)
+    if position is None:
+        position = object.__new__(Position)
+        _set = object.__setattr__
+        _set(position, "geometry", geometry)
+        _set(position, "code", code)
+        _set(position, "_hash", hash((geometry.size, geometry.win_length, code)))
+        _set(position, "_canonical", None)
+        _set(position, "_symmetry", 0)
+        position = table.setdefault(code, position)
+    return position
+
+
+class Position:
+    """An immutable N x N position; `Position(size, win_length, x, o)` returns the interned instance."""
+    __slots__ = ("geometry", "code", "_hash", "_canonical", "_symmetry", "__weakref__")
+
+    def __new__(cls, size=SIZE, win_length=None, x=0, o=0):
+        geometry = get_geometry(size, win_length)
+        if x & o or (x | o) & ~geometry.full_mask:
+            raise ValueError("X and O marks must be distinct cells of the board")
+        return _intern(geometry, x << geometry.cells | o)
+
+    @classmethod
+    def from_board(cls, board):
+        """Returns the position of a mutable `Board`."""
+        return _intern(board.geometry, board.x << board.cells | board.o)
+
+    def to_board(self):
+        """Returns a new mutable `Board` holding this position."""
+        return Board(self.size, self.win_length, self.x, self.o)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Position is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Position is immutable")
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        return isinstance(other, Position) and self.code == other.code and self.geometry is other.geometry
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        # Unpickling goes through __new__, so it interns too.
+        return Position, (self.size, self.win_length, self.x, self.o)
+
+    def __repr__(self):
+        return f"Position({''.join(self.get(i) or '.' for i in range(self.cells))!r})"
+
+    @property
+    def size(self):
+        return self.geometry.size
+
+    @property
+    def win_length(self):
+        return self.geometry.win_length
+
+    @property
+    def cells(self):
+        return self.geometry.cells
+
+    @property
+    def x(self):
+        """Bit mask of X's marks."""
+        return self.code >> self.geometry.cells
+
+    @property
+    def o(self):
+        """Bit mask of O's marks."""
+        return self.code & self.geometry.full_mask
+
+    # --- Queries ---
+
+    def get(self, index):
+        """Returns the mark on a cell: "X", "O" or ""."""
+        if self.code >> (index + self.geometry.cells) & 1:
+            return "X"
+        if self.code >> index & 1:
+            return "O"
+        return ""
+
+    def move_count(self):
+        """Returns the number of marks on the board."""
+        return self.code.bit_count()
+
+    @property
+    def player(self):
+        """The player to move: X when both have played as often, else O."""
+        return "X" if self.x.bit_count() == self.o.bit_count() else "O"
+
+    def empty_cells(self):
+        """Returns the indices of all free cells in row-major order."""
+        occupied = self.x | self.o
+        return [i for i in range(self.geometry.cells) if not occupied >> i & 1]
+
+    # --- Moves ---
+
+    def play(self, index):
+        """Returns the position after the player to move marks a cell."""
+        cells = self.geometry.cells
+        if not 0 <= index < cells or (self.code >> index | self.code >> (index + cells)) & 1:
+            raise ValueError(f"Illegal move on cell {index}")
+        return _intern(self.geometry, self.code | 1 << (index + cells if self.player == "X" else index))
+
+    # --- Symmetry ---
+
+    def canonical(self):
+        """
+        Returns (position, symmetry): the smallest image of this position over
+        the board's symmetries, comparing (marks of the player to move, marks
+        of the opponent), and the index of the symmetry in
+        `geometry.symmetries` producing it. A move `m` here is move
+        `geometry.symmetries[symmetry][m]` in the canonical position.
+        """
+        if self._canonical is None:
+            x_cells, o_cells = list(_cells(self.x)), list(_cells(self.o))
+            x_first = self.player == "X"
+            best = None
+            symmetry = 0
+            for n, perm in enumerate(self.geometry.symmetries):
+                x = sum(1 << perm[i] for i in x_cells)
+                o = sum(1 << perm[i] for i in o_cells)
+                image = (x, o) if x_first else (o, x)
+                if best is None or image < best:
+                    best = image
+                    best_marks = (x, o)
+                    symmetry = n
+            canonical = _intern(self.geometry, best_marks[0] << self.geometry.cells | best_marks[1])
+            object.__setattr__(canonical, "_canonical", _SELF)
+            if canonical is not self:
+                object.__setattr__(self, "_canonical", canonical)
+                object.__setattr__(self, "_symmetry", symmetry)
+        if self._canonical is _SELF:
+            return self, 0
+        return self._canonical, self._symmetry
+
+    def key(self):
+        """Returns (size, win length, marks of the player to move, marks of the opponent), for storage."""
+        own, opp = (self.x, self.o) if self.player == "X" else (self.o, self.x)
+        return self.size, self.win_length, own, opp
+
+    @classmethod
+    def from_key(cls, key):
+        """Builds the position stored as `key()`."""
+        size, win_length, own, opp = key
+        # The player to move has as many marks as the opponent (X) or one fewer (O).
+        x, o = (own, opp) if own.bit_count() == opp.bit_count() else (opp, own)
+        return cls(size, win_length, x, o)
+
+
+# --- Command Line ---
+def _random_positions(games, size, win_length, rng):
+    """Yields the position after every move of random games."""
+    for _ in range(games):
+        board = Board(size, win_length)
+        player = "X"
+        while not board.is_full() and not board.has_won("O" if player == "X" else "X"):
+            board.play(rng.choice(board.empty_cells()), player)
+            yield board
+            player = "O" if player == "X" else "X"
+
+
+def _measure(build):
+    """Returns (objects, bytes allocated, seconds) for building a list of keys."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    keys = build()
+    elapsed = time.perf_counter() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return keys, allocated, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the memory of cached positions by key type.")
+    parser.add_argument("--games", type=int, default=20_000, help="random games whose positions are cached")
+    parser.add_argument("--size", type=int, default=3, help="cells per side of the board")
+    parser.add_argument("--win-length", type=int, help="marks in a row to win (default: the size)")
+    args = parser.parse_args(argv)
+
+    boards = [board.copy() for board in _random_positions(args.games, args.size, args.win_length, random.Random(0))]
+    builders = {
+        "tuple of tuples": lambda: [tuple(tuple(row) for row in board.to_rows()) for board in boards],
+        "Position": lambda: [Position.from_board(board) for board in boards],
+    }
+    print(f"{len(boards)} positions from {args.games} random games")
+    print(f"{'key':<18}{'distinct':>10}{'bytes':>12}{'bytes/key':>11}{'build ms':>10}{'set ms':>8}")
+    for name, build in builders.items():
+        keys, allocated, elapsed = _measure(build)
+        start = time.perf_counter()
+        distinct = len(set(keys))
+        hashed = time.perf_counter() - start
+        print(f"{name:<18}{distinct:>10}{allocated:>12}{allocated / len(keys):>11.1f}"
+              f"{elapsed * 1000:>10.1f}{hashed * 1000:>8.1f}")
+        del keys
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""
+Persistent player statistics and Elo ratings, backed by SQLite.
+
+`PlayerStats` keeps every player's rating and win/draw/loss counts, overall
+and against each opponent, in memory. `record` updates them under a lock and
+marks the changed rows dirty; a background thread wakes up, waits a moment
+for more results and writes every dirty row in one transaction. Games never
+wait on SQLite or fsync, and a player who finishes many games between two
+batches costs a single row write. Leaderboards are served from a sorted
+snapshot that a new result invalidates and the next read rebuilds.
+
+AI opponents are rated like anyone else, under their difficulty name, so a
+player's record against "Hard" is their per-difficulty breakdown.
+
+Usage:
+    python ratings.py leaderboard [--db players.db] [--limit 20]
+    python ratings.py player NAME [--db players.db]
+    python ratings.py bench [--games 200000] [--players 1000]    # results per second into a scratch database
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+DEFAULT_RATING = 1500.0
+K_FACTOR = 32.0
+# Seconds the writer waits after the first new result, so that a batch collects more.
+BATCH_INTERVAL = 0.05
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    rating REAL NOT NULL,
+    wins INTEGER NOT NULL,
+    draws INTEGER NOT NULL,
+    losses INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matchups (
+    player TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    wins INTEGER NOT NULL,
+    draws INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    PRIMARY KEY (player, opponent)
+);
+"""
+
+Standing = namedtuple("Standing", "name rating wins draws losses")
+
+
+def expected_score(rating, opponent_rating):
+    """Returns the Elo expected score, between 0 and 1, of a player against an opponent."""
+    return 1.0 / (1.0 + 10.0 ** ((opponent_rating - rating) / 400.0))
+
+
+def _connect(path):
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+class PlayerStats:
+    """
+    Ratings and results of every player, persisted to the SQLite database at
+    `path` from a background thread. Safe to share between threads; `close`
+    writes out what is still pending. A write error stops persistence and is
+    kept in `error`, while the in-memory statistics carry on.
+    """
+    def __init__(self, path, k_factor=K_FACTOR, batch_interval=BATCH_INTERVAL):
+        self.path = path
+        self.k_factor = k_factor
+        self.batch_interval = batch_interval
+        self.error = None
+        self.batches = 0
+        self.rows_written = 0
+        self.leaderboard_builds = 0
+        # name -> [rating, wins, draws, losses]; (player, opponent) -> [wins, draws, losses]
+        self._players = {}
+        self._matchups = {}
+        self._dirty_players = set()
+        self._dirty_matchups = set()
+        self._leaderboard = None
+        self._leaderboard_valid = False
+        self._leaderboard_built = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closing = threading.Event()
+
+        connection = _connect(path)
+        try:
+            for name, *row in connection.execute("SELECT name, rating, wins, draws, losses FROM players"):
+                self._players[name] = row
+            for player, opponent, *row in connection.execute(
+                    "SELECT player, opponent, wins, draws, losses FROM matchups"):
+                self._matchups[player, opponent] = row
+        finally:
+            connection.close()
+        self._thread = threading.Thread(target=self._run, name="player-stats-writer", daemon=True)
+        self._thread.start()
+
+    def _player(self, name):
+        player = self._players.get(name)
+        if player is None:
+            player = self._players[name] = [DEFAULT_RATING, 0, 0, 0]
+        return player
+
+    def _count(self, name, opponent, result):
+        """Adds a result (1 win, 2 draw, 3 loss) to a player's totals and matchup."""
+        self._players[name][result] += 1
+        matchup = self._matchups.get((name, opponent))
+        if matchup is None:
+            matchup = self._matchups[name, opponent] = [0, 0, 0]
+        matchup[result - 1] += 1
+        self._dirty_players.add(name)
+        self._dirty_matchups.add((name, opponent))
+
+    def record(self, x, o, winner):
+        """
+        Counts a finished game between players `x` and `o`; `winner` is "X",
+        "O" or None for a tie. Returns the new ratings of X and O.
+        """
+        if x == o:
+            raise ValueError("a player cannot be rated against themselves")
+        score = 1.0 if winner == "X" else 0.0 if winner == "O" else 0.5
+        with self._lock:
+            player_x, player_o = self._player(x), self._player(o)
+            delta = self.k_factor * (score - expected_score(player_x[0], player_o[0]))
+            player_x[0] += delta
+            player_o[0] -= delta
+            result_x = 1 if winner == "X" else 3 if winner == "O" else 2
+            self._count(x, o, result_x)
+            self._count(o, x, 4 - result_x)
+            self._leaderboard_valid = False
+            ratings = player_x[0], player_o[0]
+        self._wake.set()
+        return ratings
+
+    def player(self, name):
+        """Returns a player's `Standing`, or None for an unknown player."""
+        with self._lock:
+            row = self._players.get(name)
+            return Standing(name, *row) if row is not None else None
+
+    def matchups(self, name):
+        """Returns {opponent: (wins, draws, losses)} for a player."""
+        with self._lock:
+            return {opponent: tuple(row) for (player, opponent), row in self._matchups.items() if player == name}
+
+    def leaderboard(self, limit=10, max_age=0.0):
+        """
+        Returns the `limit` best rated players, best first. The sorted
+        snapshot is reused until a result invalidates it, and even then for
+        up to `max_age` seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            stale = not self._leaderboard_valid and now - self._leaderboard_built >= max_age
+            if self._leaderboard is None or stale:
+                self._leaderboard = sorted((Standing(name, *row) for name, row in self._players.items()),
+                                           key=lambda standing: -standing.rating)
+                self._leaderboard_valid = True
+                self._leaderboard_built = now
+                self.leaderboard_builds += 1
+            return self._leaderboard[:limit]
+
+    def close(self):
+        """Writes out every pending change and stops the writer thread."""
+        if self._thread.is_alive():
+            self._closing.set()
+            self._wake.set()
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _take_dirty(self):
+        """Returns the current values of the changed rows and forgets that they changed."""
+        with self._lock:
+            players = [(name, *self._players[name]) for name in self._dirty_players]
+            matchups = [(*key, *self._matchups[key]) for key in self._dirty_matchups]
+            self._dirty_players.clear()
+            self._dirty_matchups.clear()
+        return players, matchups
+
+    def _run(self):
+        connection = _connect(self.path)
+        try:
+            while True:
+                self._wake.wait()
+                # Let more results arrive, unless closing
+                self._closing.wait(self.batch_interval)
+                self._wake.clear()
+                players, matchups = self._take_dirty()
+                if (players or matchups) and self.error is None:
+                    try:
+                        with connection:
+                            connection.executemany("INSERT OR REPLACE INTO players VALUES (?, ?, ?, ?, ?)", players)
+                            connection.executemany("INSERT OR REPLACE INTO matchups VALUES (?, ?, ?, ?, ?)",
+                                                   matchups)
+                        self.batches += 1
+                        self.rows_written += len(players) + len(matchups)
+                    except sqlite3.Error as error:
+                        self.error = error
+                if self._closing.is_set() and not self._wake.is_set():
+                    return
+        finally:
+            connection.close()
+
+
+def bench(games, players):
+    """Records random results between `players` players into a scratch database and times it."""
+    rng = random.Random(0)
+    names = [f"player{n}" for n in range(players)]
+    pairs = [rng.sample(names, 2) for _ in range(games)]
+    winners = [rng.choice(("X", "O", None)) for _ in range(games)]
+    with tempfile.TemporaryDirectory() as directory:
+        stats = PlayerStats(os.path.join(directory, "bench.db"))
+        start = time.perf_counter()
+        for (x, o), winner in zip(pairs, winners):
+            stats.record(x, o, winner)
+        recorded = time.perf_counter() - start
+        reads = 0
+        while time.perf_counter() - start < recorded + 0.2:
+            stats.leaderboard()
+            reads += 1
+        stats.close()
+        closed = time.perf_counter() - start
+    print(f"{games} results in {recorded:.2f}s ({games / recorded:,.0f}/s), "
+          f"written in {stats.batches} batches ({stats.rows_written} rows) by {closed:.2f}s")
+    print(f"{reads} cached leaderboard reads in 0.2s, {stats.leaderboard_builds} rebuilds")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect player ratings or benchmark the rating store.")
+    parser.add_argument("command", choices=("leaderboard", "player", "bench"))
+    parser.add_argument("name", nargs="?", help="player to show")
+    parser.add_argument("--db", default="players.db", help="SQLite database")
+    parser.add_argument("--limit", type=int, default=20, help="players to list")
+    parser.add_argument("--games", type=int, default=200_000, help="results to record when benchmarking")
+    parser.add_argument("--players", type=int, default=1000, help="distinct players when benchmarking")
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        bench(args.games, args.players)
+        return 0
+    if args.command == "player" and not args.name:
+        parser.error("player needs a NAME")
+    with PlayerStats(args.db) as stats:
+        if args.command == "leaderboard":
+            for rank, standing in enumerate(stats.leaderboard(args.limit), 1):
+                print(f"{rank:>3}. {standing.name:<20}{standing.rating:>7.0f}  "
+                      f"{standing.wins}-{standing.draws}-{standing.losses}")
+        else:
+            standing = stats.player(args.name)
+            if standing is None:
+                print(f"No games for {args.name}")
+                return 1
+            print(f"{standing.name}: rating {standing.rating:.0f}, "
+                  f"{standing.wins} wins, {standing.draws} draws, {standing.losses} losses")
+            for opponent, (wins, draws, losses) in sorted(stats.matchups(standing.name).items()):
+                print(f"  vs {opponent:<18}{wins}-{draws}-{losses}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+"""
+Compact append-only game log.
+
+A log file is an 8-byte header followed by one packed record per finished
+game. Each record is a fixed header (record length, board size and win
+length, strategy codes for X and O, winner, move count, seed and start time)
+followed by one byte per move and one little-endian uint32 of elapsed
+microseconds per move, so a 3x3 game takes at most 69 bytes.
+
+`RecordWriter` appends from a background thread, so the GUI and the server
+never wait on disk. `RecordReader` memory-maps a log and walks it with a single
+reused `RecordView`, which reads fields straight out of the mapping instead of
+building an object per game; call `to_record` to keep one. Logs convert to and
+from JSON Lines with one object per game.
+
+Usage:
+    python records.py stats games.ttr                   # count, replay and deduplicate every game
+    python records.py export games.ttr games.jsonl
+    python records.py import games.jsonl games.ttr
+"""
+import json
+import mmap
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+
+from board import Board
+from position import Position
+
+MAGIC = b"TTTG"
+VERSION = 1
+# magic, version
+FILE_HEADER = struct.Struct("<4sHxx")
+# record length, size, win length, X strategy, O strategy, winner, move count, seed, start time
+RECORD = struct.Struct("<HBBBBBBQd")
+MOVE_TIME = struct.Struct("<I")
+
+# Strategy codes are stored on disk: only ever append to this tuple.
+STRATEGIES = ("Human", "Easy", "Intermediate", "Hard", "MCTS", "Adaptive")
+WINNERS = (None, "X", "O")
+MAX_MOVE_US = 0xFFFFFFFF
+
+
+class GameRecord:
+    """One finished game."""
+    __slots__ = ("size", "win_length", "x", "o", "winner", "seed", "started", "moves", "move_us")
+
+    def __init__(self, size, win_length, x, o, winner, seed=0, started=0.0, moves=(), move_us=()):
+        self.size = size
+        self.win_length = win_length
+        self.x = x
+        self.o = o
+        self.winner = winner
+        self.seed = seed
+        self.started = started
+        self.moves = list(moves)
+        self.move_us = list(move_us) if move_us else [0] * len(self.moves)
+
+    @classmethod
+    def from_engine(cls, engine, x, o, winner=None):
+        """Builds the record of an engine's current game; `winner` overrides the engine's, e.g. on a forfeit."""
+        return cls(engine.size, engine.win_length, x, o, winner if winner is not None else engine.winner,
+                   engine.seed, engine.started, engine.moves, engine.move_us)
+
+    def __eq__(self, other):
+        return isinstance(other, GameRecord) and self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        return f"GameRecord({self.x} vs {self.o}, {self.size}x{self.size}, winner={self.winner}, moves={self.moves})"
+
+    def pack(self):
+        """Returns the record in its on-disk form."""
+        if len(self.move_us) != len(self.moves):
+            raise ValueError("every move needs a time")
+        count = len(self.moves)
+        header = RECORD.pack(
+            RECORD.size + count * (1 + MOVE_TIME.size), self.size, self.win_length,
+            STRATEGIES.index(self.x), STRATEGIES.index(self.o), WINNERS.index(self.winner),
+            count, self.seed, self.started,
+        )
+        times = struct.pack(f"<{count}I", *(min(us, MAX_MOVE_US) for us in self.move_us))
+        return header + bytes(self.moves) + times
+
+    def as_dict(self):
+        """Returns the record as a plain dict, the JSON Lines form."""
+        return {
+            "size": self.size,
+            "win_length": self.win_length,
+            "x": self.x,
+            "o": self.o,
+            "winner": self.winner,
+            "seed": self.seed,
+            "started": self.started,
+            "moves": list(self.moves),
+            "move_us": list(self.move_us),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a record from its dict form."""
+        return cls(data["size"], data.get("win_length", data["size"]), data["x"], data["o"], data["winner"],
+                   data.get("seed", 0), data.get("started", 0.0), data["moves"], data.get("move_us", ()))
+
+
+def _open_log(path):
+    """Opens a log for appending, writing the header to a new file and checking an existing one."""
+    log = open(path, "ab")
+    if log.tell() == 0:
+        log.write(FILE_HEADER.pack(MAGIC, VERSION))
+        log.flush()
+    else:
+        with open(path, "rb") as f:
+            magic, version = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            log.close()
+            raise ValueError(f"{path} is not a version {VERSION} game log")
+    return log
+
+
+class RecordWriter:
+    """
+    Appends records to a log from a background thread.
+
+    `write` only packs the record and queues it; the thread writes whatever
+    has queued up in one call and flushes. `close` drains the queue. A write
+    error stops the log and is kept in `error`.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.written = 0
+        self.error = None
+        self._file = _open_log(path)
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="record-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, record):
+        """Queues one record; never blocks on disk."""
+        self._queue.put(record.pack())
+
+    def close(self):
+        """Writes out every queued record and closes the file."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        try:
+            while True:
+                chunks = [self._queue.get()]
+                while not self._queue.empty():
+                    chunks.append(self._queue.get())
+                done = chunks[-1] is None
+                if done:
+                    chunks.pop()
+                if chunks and self.error is None:
+                    try:
+                        self._file.write(b"".join(chunks))
+                        self._file.flush()
+                        self.written += len(chunks)
+                    except OSError as error:
+                        self.error = error
+                if done:
+                    return
+        finally:
+            self._file.close()
+
+
+class RecordView:
+    """
+    A record inside a mapped log. The reader moves one view from record to
+    record, so it is only valid until the next step of the iteration.
+    """
+    __slots__ = ("_buffer", "_offset", "length", "size", "win_length", "_x", "_o", "_winner",
+                 "move_count", "seed", "started")
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        self._offset = 0
+
+    def _load(self, offset):
+        self._offset = offset
+        (self.length, self.size, self.win_length, self._x, self._o, self._winner,
+         self.move_count, self.seed, self.started) = RECORD.unpack_from(self._buffer, offset)
+
+    @property
+    def x(self):
+        return STRATEGIES[self._x]
+
+    @property
+    def o(self):
+        return STRATEGIES[self._o]
+
+    @property
+    def winner(self):
+        return WINNERS[self._winner]
+
+    @property
+    def moves(self):
+        """The cells played, in order, as bytes."""
+        start = self._offset + RECORD.size
+        return self._buffer[start:start + self.move_count]
+
+    def move_us(self):
+        """Returns the elapsed microseconds of each move."""
+        return struct.unpack_from(f"<{self.move_count}I", self._buffer,
+                                  self._offset + RECORD.size + self.move_count)
+
+    def replay(self, board=None):
+        """
+        Plays the game back, yielding the board after every move. The same
+        board is updated in place; pass one in to reuse it across records.
+        """
+        if board is None or board.size != self.size or board.win_length != self.win_length:
+            board = Board(self.size, self.win_length)
+        else:
+            occupied = board.occupied
+            for index in range(board.cells):
+                if occupied >> index & 1:
+                    board.undo(index)
+        player = "X"
+        # Indexing the log reads each move in place, without copying them out first.
+        buffer = self._buffer
+        start = self._offset + RECORD.size
+        for index in range(start, start + self.move_count):
+            board.play(buffer[index], player)
+            yield board
+            player = "O" if player == "X" else "X"
+
+    def to_record(self):
+        """Copies the view into a standalone `GameRecord`."""
+        return GameRecord(self.size, self.win_length, self.x, self.o, self.winner, self.seed, self.started,
+                          self.moves, self.move_us())
+
+
+class RecordReader:
+    """Memory-mapped, streaming reader over a game log."""
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < FILE_HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is too short to be a game log")
+        magic, version = FILE_HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} game log")
+
+    def close(self):
+        """Unmaps the file."""
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __iter__(self):
+        """Yields a `RecordView` per record; a truncated final record is skipped."""
+        view = RecordView(self._map)
+        offset = FILE_HEADER.size
+        end = len(self._map)
+        while offset + RECORD.size <= end:
+            view._load(offset)
+            if view.length < RECORD.size or offset + view.length > end:
+                break
+            yield view
+            offset += view.length
+
+    def records(self):
+        """Yields a standalone `GameRecord` per record."""
+        for view in self:
+            yield view.to_record()
+
+
+def export_jsonl(source, destination):
+    """Writes every record of a log to a JSON Lines file; returns the count."""
+    count = 0
+    with RecordReader(source) as reader, open(destination, "w") as out:
+        for view in reader:
+            out.write(json.dumps(view.to_record().as_dict()) + "\n")
+            count += 1
+    return count
+
+
+def import_jsonl(source, destination):
+    """Appends every line of a JSON Lines file to a log; returns the count."""
+    count = 0
+    with open(source) as lines:
+        log = _open_log(destination)
+        try:
+            for line in lines:
+                if line.strip():
+                    log.write(GameRecord.from_dict(json.loads(line)).pack())
+                    count += 1
+        finally:
+            log.close()
+    return count
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) == 3 and argv[0] == "export":
+        print(f"Exported {export_jsonl(argv[1], argv[2])} games to {argv[2]}")
+    elif len(argv) == 3 and argv[0] == "import":
+        print(f"Imported {import_jsonl(argv[1], argv[2])} games into {argv[2]}")
+    elif len(argv) == 2 and argv[0] == "stats":
+        results = {}
+        # Final positions up to symmetry, interned so repeats cost nothing.
+        finals = set()
+        games = moves = 0
+        start = time.perf_counter()
+        with RecordReader(argv[1]) as reader:
+            board = None
+            for view in reader:
+                for board in view.replay(board):
+                    moves += 1
+                if view.move_count:
+                    finals.add(Position.from_board(board).canonical()[0])
+                key = (view.x, view.o, view.winner or "draw")
+                results[key] = results.get(key, 0) + 1
+                games += 1
+        elapsed = time.perf_counter() - start
+        print(f"{games} games, {moves} moves replayed in {elapsed:.2f}s "
+              f"({games / elapsed if elapsed else 0:.0f} games/s, {os.path.getsize(argv[1])} bytes)")
+        print(f"{len(finals)} distinct final positions up to symmetry")
+        for (x, o, result), count in sorted(results.items()):
+            print(f"{x:<14}{o:<14}{result:<6}{count:>9}")
+    else:
+        print(__doc__.strip().split("Usage:")[1])
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Board rendering for the Tkinter GUI.
+
+The view describes every cell as a `CellState` (mark, mark color, background,
+clickable) and passes the whole board to a renderer. The renderer remembers
+what each cell currently shows and issues Tk calls only for cells whose state
+changed, with only the options that changed. `ButtonBoard` draws one button
+per cell; `CanvasBoard` draws the whole board on a single canvas, one
+rectangle and one text item per cell, which is far lighter on large boards.
+`StyleCache` does the same for other widgets' options, so re-applying a theme
+or a mode only reconfigures what differs.
+"""
+import tkinter as tk
+from collections import namedtuple
+from functools import partial
+
+CellState = namedtuple("CellState", "text color background enabled")
+
+_MISSING = object()
+# Gap between cells, in pixels.
+CELL_PADDING = 4
+
+
+class StyleCache:
+    """
+    Remembers the options last applied to each widget and only passes on the
+    ones that differ. Widgets styled through the cache should not be
+    reconfigured directly for the same options.
+    """
+    def __init__(self):
+        self._applied = {}
+
+    def configure(self, widget, **options):
+        """Applies the changed options; returns True if a Tk call was made."""
+        applied = self._applied.setdefault(widget, {})
+        changed = {key: value for key, value in options.items() if applied.get(key, _MISSING) != value}
+        if not changed:
+            return False
+        widget.config(**changed)
+        applied.update(changed)
+        return True
+
+    def forget(self, widget):
+        """Drops a destroyed widget."""
+        self._applied.pop(widget, None)
+
+
+def _changed_fields(state, shown):
+    """Returns the fields of `state` that differ from `shown` (all of them if nothing is shown yet)."""
+    if shown is None:
+        return CellState._fields
+    return [field for field, new, old in zip(CellState._fields, state, shown) if new != old]
+
+
+class ButtonBoard:
+    """One `tk.Button` per cell, laid out on the parent's grid."""
+    def __init__(self, parent, size, on_click):
+        self.parent = parent
+        self.size = size
+        self._shown = [None] * (size * size)
+        self.buttons = []
+        for r in range(size):
+            row_buttons = []
+            for c in range(size):
+                button = tk.Button(
+                    parent,
+                    text="",
+                    font=('Arial', max(10, 96 // size), 'bold'),
+                    width=max(2, 18 // size),
+                    height=max(1, 9 // size),
+                    command=partial(on_click, r, c),
+                    relief=tk.RAISED,
+                    bd=2,
+                    cursor="hand2"
+                )
+                button.grid(row=r, column=c, padx=CELL_PADDING, pady=CELL_PADDING, sticky="nsew")
+                row_buttons.append(button)
+            self.buttons.append(row_buttons)
+
+        # Configure grid weights for responsiveness
+        for i in range(size):
+            parent.grid_rowconfigure(i, weight=1)
+            parent.grid_columnconfigure(i, weight=1)
+
+    def render(self, states):
+        """Updates the cells whose state changed; returns how many were reconfigured."""
+        changed = 0
+        for index, state in enumerate(states):
+            shown = self._shown[index]
+            if state == shown:
+                continue
+            options = {}
+            for field in _changed_fields(state, shown):
+                if field == "text":
+                    options["text"] = state.text
+                elif field == "color":
+                    options["fg"] = options["disabledforeground"] = state.color
+                elif field == "background":
+                    options["bg"] = state.background
+                else:
+                    options["state"] = tk.NORMAL if state.enabled else tk.DISABLED
+            self.buttons[index // self.size][index % self.size].config(**options)
+            self._shown[index] = state
+            changed += 1
+        return changed
+
+    def set_background(self, color):
+        """Buttons have no background of their own between cells; the parent frame shows through."""
+
+    def destroy(self):
+        """Removes the buttons and releases the parent's grid rows and columns."""
+        for row in self.buttons:
+            for button in row:
+                button.destroy()
+        self.buttons = []
+        for i in range(self.size):
+            self.parent.grid_rowconfigure(i, weight=0)
+            self.parent.grid_columnconfigure(i, weight=0)
+
+
+class CanvasBoard:
+    """
+    The whole board on one `tk.Canvas`. Items are created once; resizing
+    moves them, and rendering only reconfigures the items of changed cells.
+    """
+    def __init__(self, parent, size, on_click, background, pixels=560):
+        self.parent = parent
+        self.size = size
+        self.on_click = on_click
+        self._shown = [None] * (size * size)
+        self._cell = pixels / size
+        self.canvas = tk.Canvas(parent, width=pixels, height=pixels, bg=background,
+                                highlightthickness=0, cursor="hand2")
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        parent.grid_rowconfigure(0, weight=1)
+        parent.grid_columnconfigure(0, weight=1)
+
+        self._items = [
+            (self.canvas.create_rectangle(0, 0, 0, 0, width=0),
+             self.canvas.create_text(0, 0, text=""))
+            for _ in range(size * size)
+        ]
+        self._layout(pixels, pixels)
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.canvas.bind("<Button-1>", self._on_press)
+
+    def _on_configure(self, event):
+        self._layout(event.width, event.height)
+
+    def _layout(self, width, height):
+        """Places every cell for the canvas size, keeping the board square."""
+        cell = max(1.0, min(width, height) / self.size)
+        self._cell = cell
+        pad = min(CELL_PADDING, cell / 8)
+        font = ('Arial', max(6, int(cell * 0.5)), 'bold')
+        for index, (rect, text) in enumerate(self._items):
+            r, c = divmod(index, self.size)
+            self.canvas.coords(rect, c * cell + pad, r * cell + pad, (c + 1) * cell - pad, (r + 1) * cell - pad)
+            self.canvas.coords(text, (c + 0.5) * cell, (r + 0.5) * cell)
+            self.canvas.itemconfig(text, font=font)
+
+    def _on_press(self, event):
+        r, c = int(event.y // self._cell), int(event.x // self._cell)
+        if 0 <= r < self.size and 0 <= c < self.size:
+            state = self._shown[r * self.size + c]
+            if state is not None and state.enabled:
+                self.on_click(r, c)
+
+    def render(self, states):
+        """Updates the items of the cells whose state changed; returns how many were reconfigured."""
+        changed = 0
+        for index, state in enumerate(states):
+            shown = self._shown[index]
+            if state == shown:
+                continue
+            rect, text = self._items[index]
+            fields = _changed_fields(state, shown)
+            if "background" in fields:
+                self.canvas.itemconfig(rect, fill=state.background)
+            if "text" in fields or "color" in fields:
+                self.canvas.itemconfig(text, text=state.text, fill=state.color)
+            self._shown[index] = state
+            changed += 1
+        return changed
+
+    def set_background(self, color):
+        """Sets the color between cells."""
+        self.canvas.config(bg=color)
+
+    def destroy(self):
+        """Removes the canvas and releases the parent's grid row and column."""
+        self.canvas.destroy()
+        self.parent.grid_rowconfigure(0, weight=0)
+        self.parent.grid_columnconfigure(0, weight=0)
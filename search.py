@@ -0,0 +1,385 @@
+"""
+Alpha-beta search for N x N, K-in-a-row boards.
+
+Exhaustive Minimax stops being practical beyond 3x3, so larger boards are
+searched with negamax alpha-beta, history-heuristic move ordering and
+iterative deepening under a per-move time budget. The best move of the
+deepest completed iteration is returned, so an answer is always ready when
+the deadline passes or the search is cancelled.
+
+`ParallelSearcher` splits each iteration's root moves across a process pool,
+sharing the best score found so far as the alpha bound of every worker, and
+falls back to the serial search when only one core is available.
+
+Usage:
+    python search.py [--processes N] [--depth D]    # compare serial and parallel fixed-depth searches
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+from board import Board, other_player
+
+WIN_SCORE = 1_000_000
+# How many nodes to expand between deadline checks.
+_CHECK_INTERVAL = 256
+# Boards with more cells than this only consider moves near existing marks.
+_FULL_WIDTH_CELLS = 25
+# How often the parallel search checks for cancellation while its workers run, in seconds.
+_POLL_SECONDS = 0.01
+
+
+def candidate_cells(geometry, occupied):
+    """
+    Returns the empty cells worth considering: all of them on small boards,
+    else those within two steps of a mark (the center on an empty board).
+    """
+    if geometry.cells <= _FULL_WIDTH_CELLS:
+        return [i for i in range(geometry.cells) if not occupied >> i & 1]
+    if not occupied:
+        return [geometry.center]
+
+    nearby = 0
+    remaining = occupied
+    while remaining:
+        low = remaining & -remaining
+        nearby |= geometry.neighbourhoods[low.bit_length() - 1]
+        remaining ^= low
+    nearby &= ~occupied
+    return [i for i in range(geometry.cells) if nearby >> i & 1]
+
+
+class _Timeout(Exception):
+    """Raised inside the search when the deadline has passed or it was cancelled."""
+
+
+class AlphaBetaSearcher:
+    """
+    Iterative-deepening negamax with alpha-beta pruning.
+
+    `time_budget` is in seconds per move (None for no limit) and `max_depth`
+    optionally caps the iterations. After each call, `nodes`, `cutoffs` and
+    `depth_reached` describe the work done.
+    """
+    def __init__(self, time_budget=1.0, max_depth=None):
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.nodes = 0
+        self.cutoffs = 0
+        self.depth_reached = 0
+        self._deadline = None
+        self._cancel = None
+        self._history = None
+
+    def best_move(self, board, player, cancel=None):
+        """
+        Returns the best cell found for the player within the budget, or None
+        if the board is full. Setting the optional `cancel` event stops the
+        search early, as if the deadline had passed.
+        """
+        board = board.copy()
+        moves = self._candidates(board)
+        if not moves:
+            return None
+
+        self.nodes = 0
+        self.cutoffs = 0
+        self.depth_reached = 0
+        self._history = [0] * board.cells
+        self._cancel = cancel
+        self._deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+
+        remaining = board.cells - board.move_count()
+        max_depth = remaining if self.max_depth is None else min(self.max_depth, remaining)
+        best = self._order(board, moves)[0]
+
+        for depth in range(1, max_depth + 1):
+            try:
+                move, score = self._search_root(board, player, depth, best)
+            except _Timeout:
+                break
+            best = move
+            self.depth_reached = depth
+            # A forced win or loss has been found; deeper iterations cannot change it.
+            if abs(score) > WIN_SCORE - board.cells:
+                break
+
+        return best
+
+    def _search_root(self, board, player, depth, previous_best):
+        """Searches every root move to the given depth, trying the previous best first."""
+        opponent = other_player(player)
+        moves = self._order(board, self._candidates(board))
+        moves.remove(previous_best)
+        moves.insert(0, previous_best)
+
+        alpha = -WIN_SCORE - 1
+        best_move = previous_best
+        for move in moves:
+            board.play(move, player)
+            score = -self._negamax(board, opponent, player, depth - 1, -WIN_SCORE - 1, -alpha, 1)
+            board.undo(move)
+            if score > alpha:
+                alpha = score
+                best_move = move
+        return best_move, alpha
+
+    def _negamax(self, board, player, opponent, depth, alpha, beta, ply):
+        """Alpha-beta negamax from the point of view of the player to move."""
+        self.nodes += 1
+        if self.nodes % _CHECK_INTERVAL == 0:
+            if self._cancel is not None and self._cancel.is_set():
+                raise _Timeout()
+            if self._deadline is not None and time.perf_counter() > self._deadline:
+                raise _Timeout()
+
+        if board.has_won(opponent):
+            # Prefer quick wins and slow losses.
+            return ply - WIN_SCORE
+        if board.is_full():
+            return 0
+        if depth == 0:
+            return self._evaluate(board, player, opponent)
+
+        best = -WIN_SCORE - 1
+        for move in self._order(board, self._candidates(board)):
+            board.play(move, player)
+            score = -self._negamax(board, opponent, player, depth - 1, -beta, -alpha, ply + 1)
+            board.undo(move)
+
+            if score > best:
+                best = score
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self.cutoffs += 1
+                self._history[move] += depth * depth
+                break
+        return best
+
+    def _candidates(self, board):
+        """Returns the empty cells worth searching."""
+        return candidate_cells(board.geometry, board.occupied)
+
+    def _order(self, board, moves):
+        """Sorts moves by history score, then by closeness to the center."""
+        history = self._history
+        centrality = board.geometry.centrality
+        return sorted(moves, key=lambda move: (-history[move], centrality[move]))
+
+    @staticmethod
+    def _evaluate(board, player, opponent):
+        """Scores open lines: each line only one side occupies counts 10^marks for that side."""
+        score = 0
+        for mine, theirs in zip(board.line_counts(player), board.line_counts(opponent)):
+            if mine and not theirs:
+                score += 10 ** mine
+            elif theirs and not mine:
+                score -= 10 ** theirs
+        return score
+
+
+def available_cores():
+    """Returns the number of cores this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class _SharedFlag:
+    """Stands in for a cancel `Event` inside worker processes."""
+    def __init__(self, value):
+        self._value = value
+
+    def is_set(self):
+        return self._value.value != 0
+
+
+# Per-worker searcher, shared alpha bound and stop flag, set by `_init_worker`.
+_worker = None
+
+
+def _init_worker(alpha, stop):
+    global _worker
+    _worker = (AlphaBetaSearcher(None), alpha, _SharedFlag(stop))
+
+
+def _search_split(size, win_length, x, o, player, moves, depth, budget):
+    """
+    Worker task: searches some root moves to a fixed depth, raising the shared
+    alpha whenever one beats it. Returns (move, score, nodes, cutoffs,
+    completed); the move is None if none of them beat the shared bound.
+    """
+    searcher, alpha, stop = _worker
+    board = Board(size, win_length, x, o)
+    opponent = other_player(player)
+    searcher.nodes = 0
+    searcher.cutoffs = 0
+    if searcher._history is None or len(searcher._history) != board.cells:
+        searcher._history = [0] * board.cells
+    searcher._cancel = stop
+    searcher._deadline = None if budget is None else time.perf_counter() + budget
+
+    best_move = None
+    best_score = -WIN_SCORE - 1
+    try:
+        for move in moves:
+            bound = max(best_score, alpha.value)
+            board.play(move, player)
+            score = -searcher._negamax(board, opponent, player, depth - 1, -WIN_SCORE - 1, -bound, 1)
+            board.undo(move)
+            if score > bound:
+                best_move, best_score = move, score
+                with alpha.get_lock():
+                    if score > alpha.value:
+                        alpha.value = score
+    except _Timeout:
+        return None, None, searcher.nodes, searcher.cutoffs, False
+    return best_move, best_score, searcher.nodes, searcher.cutoffs, True
+
+
+class ParallelSearcher(AlphaBetaSearcher):
+    """
+    Iterative deepening with each depth's root moves split across a pool of
+    `processes` workers (default: one per available core).
+
+    Root moves are dealt round-robin so every worker gets some of the best
+    ordered ones, and the workers share one alpha bound, so a good score found
+    by any of them narrows the window of all. The pool is started on first
+    use with the "spawn" method, which is safe from threaded programs such as
+    the GUI and the server. With fewer than two processes, or a single root
+    move, the serial search runs instead. Calls from several threads take
+    turns, each using the whole pool. Call `close` to stop the pool.
+    """
+    def __init__(self, time_budget=1.0, max_depth=None, processes=None):
+        super().__init__(time_budget, max_depth)
+        self.processes = processes if processes is not None else available_cores()
+        self._pool = None
+        self._alpha = None
+        self._stop = None
+        self._lock = threading.Lock()
+
+    def _start_pool(self):
+        # Imported on first use: multiprocessing and the process pool add
+        # tens of milliseconds to the startup of every program using the engine.
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        context = multiprocessing.get_context("spawn")
+        self._alpha = context.Value("q", 0)
+        self._stop = context.RawValue("b", 0)
+        self._pool = ProcessPoolExecutor(self.processes, context, _init_worker, (self._alpha, self._stop))
+
+    def close(self):
+        """Shuts the worker pool down."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def best_move(self, board, player, cancel=None):
+        """Returns the best cell found for the player, like `AlphaBetaSearcher.best_move`."""
+        with self._lock:
+            return self._best_move(board, player, cancel)
+
+    def _best_move(self, board, player, cancel):
+        from concurrent.futures import FIRST_EXCEPTION, wait
+
+        moves = self._candidates(board)
+        if self.processes < 2 or len(moves) < 2:
+            return super().best_move(board, player, cancel)
+        if self._pool is None:
+            self._start_pool()
+
+        self.nodes = 0
+        self.cutoffs = 0
+        self.depth_reached = 0
+        self._history = [0] * board.cells
+        start = time.perf_counter()
+
+        remaining = board.cells - board.move_count()
+        max_depth = remaining if self.max_depth is None else min(self.max_depth, remaining)
+        best = self._order(board, moves)[0]
+
+        for depth in range(1, max_depth + 1):
+            ordered = self._order(board, moves)
+            ordered.remove(best)
+            ordered.insert(0, best)
+            budget = None if self.time_budget is None else self.time_budget - (time.perf_counter() - start)
+            if budget is not None and budget <= 0:
+                break
+
+            self._alpha.value = -WIN_SCORE - 1
+            self._stop.value = 0
+            futures = [
+                self._pool.submit(_search_split, board.size, board.win_length, board.x, board.o, player,
+                                  ordered[n::self.processes], depth, budget)
+                for n in range(min(self.processes, len(ordered)))
+            ]
+            pending = futures
+            while pending:
+                if cancel is not None and cancel.is_set():
+                    self._stop.value = 1
+                _, pending = wait(pending, _POLL_SECONDS, FIRST_EXCEPTION)
+
+            results = [future.result() for future in futures]
+            for _, _, nodes, cutoffs, _ in results:
+                self.nodes += nodes
+                self.cutoffs += cutoffs
+            if not all(completed for *_, completed in results):
+                break
+            move, score = max(((move, score) for move, score, *_ in results if move is not None),
+                              key=lambda result: result[1])
+            best = move
+            self.depth_reached = depth
+            if abs(score) > WIN_SCORE - board.cells:
+                break
+
+        return best
+
+
+def compare(board, player, depth, processes):
+    """Times a fixed-depth serial and parallel search; returns a dict of the results."""
+    serial = AlphaBetaSearcher(time_budget=None, max_depth=depth)
+    parallel = ParallelSearcher(time_budget=None, max_depth=depth, processes=processes)
+    try:
+        # The first parallel call pays for starting the pool; time the second.
+        parallel.best_move(board, player)
+        results = {}
+        for name, searcher in (("serial", serial), ("parallel", parallel)):
+            start = time.perf_counter()
+            move = searcher.best_move(board, player)
+            results[name] = {"move": move, "seconds": time.perf_counter() - start,
+                             "nodes": searcher.nodes, "depth": searcher.depth_reached}
+    finally:
+        parallel.close()
+    results["speedup"] = results["serial"]["seconds"] / results["parallel"]["seconds"]
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare serial and parallel alpha-beta search.")
+    parser.add_argument("--processes", type=int, default=available_cores(), help="worker processes")
+    parser.add_argument("--depth", type=int, default=4, help="fixed search depth")
+    args = parser.parse_args(argv)
+
+    if args.processes < 2:
+        print(f"{args.processes} process(es) available: the parallel search falls back to the serial one")
+    positions = (("5x5, 4 in a row", 5, 4, (12, 6)), ("7x7, 5 in a row", 7, 5, (24, 16, 25)),
+                 ("15x15, 5 in a row", 15, 5, (112, 96, 113)))
+    print(f"{'position':<20}{'serial s':>10}{'parallel s':>12}{'speedup':>9}{'nodes':>10}{'par. nodes':>12}")
+    for label, size, win_length, cells in positions:
+        board = Board(size, win_length)
+        for n, cell in enumerate(cells):
+            board.play(cell, "X" if n % 2 == 0 else "O")
+        player = "X" if len(cells) % 2 == 0 else "O"
+        results = compare(board, player, args.depth, args.processes)
+        serial, parallel = results["serial"], results["parallel"]
+        print(f"{label:<20}{serial['seconds']:>10.3f}{parallel['seconds']:>12.3f}{results['speedup']:>8.2f}x"
+              f"{serial['nodes']:>10}{parallel['nodes']:>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""
+Networked Tic-Tac-Toe server.
+
+Hosts many concurrent games over a line-delimited JSON protocol on TCP, one
+JSON object per line in each direction. Games run on the shared engine rules,
+against another player found by matchmaking or against the Easy,
+Intermediate, Hard or MCTS AI. Per-connection state is a handful of small objects,
+so thousands of sessions fit in a few megabytes.
+
+Client messages:
+    {"type": "play", "opponent": "Hard", "size": 3, "win_length": 3, "mark": "X", "name": "alice"}
+        Start a game against an AI difficulty, or "human" to be matched with
+        the next player waiting for the same board. Size, win length, the
+        mark to play against an AI (X moves first) and the player name are
+        optional; games between named players (AIs are named by difficulty)
+        are rated when the server keeps player statistics.
+    {"type": "move", "cell": 4}
+        Play on a cell, indexed row-major from 0.
+    {"type": "leave"}
+        Abandon the current game or matchmaking.
+    {"type": "leaderboard", "limit": 10}
+        Ask for the best rated players.
+
+Server messages:
+    {"type": "waiting"}
+    {"type": "start", "you": "X", "opponent": "Hard", "size": 3, "win_length": 3}
+    {"type": "move", "player": "O", "cell": 0}
+    {"type": "end", "winner": "X" | "O" | null, "reason": "..."}
+    {"type": "leaderboard", "players": [{"name": "Hard", "rating": 1620.5, "wins": 10, "draws": 4, "losses": 0}]}
+    {"type": "error", "message": "..."}
+
+Finished games can be appended to a binary game log (see records.py) and
+rated in a SQLite player database (see ratings.py), both written from
+background threads, so the event loop never waits on disk.
+
+Usage:
+    python server.py [--host 127.0.0.1] [--port 8765] [--time-budget 0.2] [--records games.ttr]
+    python server.py --players players.db     # keep ratings and serve leaderboards
+    python server.py --search-processes 0    # split large-board searches across every core
+"""
+import argparse
+import asyncio
+import json
+import random
+from collections import deque
+
+from board import other_player
+from book import MoveBook, load_default_book
+from engine import DIFFICULTIES, GameEngine, is_instant
+from ratings import PlayerStats
+from search import ParallelSearcher
+from records import GameRecord, RecordWriter
+from solver import Solver
+from table import load_default_table
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Longest accepted request line; also bounds each connection's read buffer.
+MAX_LINE = 1024
+MAX_SIZE = 15
+# Longest accepted player name, and how many players a leaderboard request may ask for.
+MAX_NAME = 64
+MAX_LEADERBOARD = 100
+# Seconds a leaderboard may lag behind the latest results.
+LEADERBOARD_MAX_AGE = 1.0
+
+
+class Session:
+    """One client connection."""
+    __slots__ = ("writer", "match", "mark", "waiting_for", "name")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.match = None
+        self.mark = None
+        self.waiting_for = None
+        self.name = None
+
+    def send(self, message):
+        self.writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+
+class Match:
+    """A game in progress: the engine plus the session behind each mark (None for the AI)."""
+    __slots__ = ("engine", "players", "difficulty", "strategies", "names", "finished")
+
+    def __init__(self, engine, players, difficulty=None):
+        self.engine = engine
+        self.players = players
+        self.difficulty = difficulty
+        # Fixed at the start, for the game log, since a leaving player is dropped from `players`.
+        self.strategies = {mark: "Human" if session is not None else difficulty
+                           for mark, session in players.items()}
+        # Rating names, None for an anonymous player.
+        self.names = {mark: session.name if session is not None else difficulty
+                      for mark, session in players.items()}
+        self.finished = False
+
+    def broadcast(self, message):
+        for session in self.players.values():
+            if session is not None:
+                session.send(message)
+
+
+class GameServer:
+    """Accepts connections and runs their games on one event loop."""
+    def __init__(self, time_budget=0.2, log=None, search_processes=1, players=None):
+        self.time_budget = time_budget
+        # Optional `RecordWriter` receiving every finished game.
+        self.log = log
+        # Optional `PlayerStats` rating every game between named players.
+        self.players = players
+        # Caches and the random source are shared by every game on the server.
+        self.solver = Solver()
+        self.table = load_default_table()
+        self.book = load_default_book() or MoveBook()
+        # One searcher for all games; a parallel one keeps a single process pool.
+        self.searcher = None
+        if search_processes != 1:
+            self.searcher = ParallelSearcher(time_budget, processes=search_processes or None)
+        self.rng = random.Random()
+        self.waiting = {}
+        self.sessions = 0
+        self.games_started = 0
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Starts listening and returns the asyncio server."""
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+
+    async def handle(self, reader, writer):
+        """Serves one connection until it closes."""
+        session = Session(writer)
+        self.sessions += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    await self.dispatch(session, message)
+                except (ValueError, TypeError, KeyError) as error:
+                    session.send({"type": "error", "message": str(error)})
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            self.leave(session, "opponent left")
+            writer.close()
+
+    async def dispatch(self, session, message):
+        """Routes one client message."""
+        if not isinstance(message, dict):
+            raise ValueError("Messages must be JSON objects")
+        kind = message.get("type")
+        if kind == "play":
+            await self.play(session, message)
+        elif kind == "move":
+            await self.move(session, int(message["cell"]))
+        elif kind == "leave":
+            self.leave(session, "opponent left")
+        elif kind == "leaderboard":
+            self.send_leaderboard(session, int(message.get("limit", 10)))
+        else:
+            raise ValueError(f"Unknown message type: {kind!r}")
+
+    def new_engine(self, size, win_length):
+        engine = GameEngine(solver=self.solver, table=self.table, rng=self.rng, size=size,
+                            win_length=win_length, time_budget=self.time_budget, book=self.book)
+        if self.searcher is not None:
+            engine.searcher = self.searcher
+        return engine
+
+    async def play(self, session, message):
+        """Starts an AI game or queues the session for matchmaking."""
+        if session.match is not None or session.waiting_for is not None:
+            raise ValueError("Already in a game")
+
+        size = int(message.get("size", 3))
+        win_length = int(message.get("win_length", size))
+        if not 1 <= win_length <= size <= MAX_SIZE:
+            raise ValueError(f"Unsupported board: {size}x{size} with {win_length} in a row")
+        opponent = message.get("opponent", "Hard")
+        name = message.get("name")
+        if name is not None and (not isinstance(name, str) or not 0 < len(name) <= MAX_NAME or name in DIFFICULTIES):
+            raise ValueError(f"name must be 1 to {MAX_NAME} characters and not a difficulty")
+        session.name = name
+
+        if opponent in DIFFICULTIES:
+            mark = message.get("mark", "X")
+            if mark not in ("X", "O"):
+                raise ValueError("mark must be X or O")
+            session.mark = mark
+            players = {mark: session, other_player(mark): None}
+            session.match = Match(self.new_engine(size, win_length), players, opponent)
+            self.games_started += 1
+            session.send({"type": "start", "you": session.mark, "opponent": opponent,
+                          "size": size, "win_length": win_length})
+            await self.ai_turn(session.match)
+        elif opponent == "human":
+            queue = self.waiting.setdefault((size, win_length), deque())
+            if queue:
+                first = queue.popleft()
+                first.waiting_for = None
+                match = Match(self.new_engine(size, win_length), {"X": first, "O": session})
+                self.games_started += 1
+                for mark, player in match.players.items():
+                    player.match = match
+                    player.mark = mark
+                    player.send({"type": "start", "you": mark, "opponent": "human",
+                                 "size": size, "win_length": win_length})
+                await self.flush(first)
+            else:
+                session.waiting_for = (size, win_length)
+                queue.append(session)
+                session.send({"type": "waiting"})
+        else:
+            raise ValueError(f"Unknown opponent: {opponent!r}")
+
+    async def move(self, session, cell):
+        """Validates and plays a client's move, then lets the AI reply."""
+        match = session.match
+        if match is None:
+            raise ValueError("Not in a game")
+        engine = match.engine
+        if engine.current_player != session.mark:
+            raise ValueError("Not your turn")
+        if not engine.is_valid_move(cell):
+            raise ValueError(f"Illegal move on cell {cell}")
+
+        opponent = match.players.get(other_player(session.mark))
+        self.apply(match, cell)
+        if opponent is not None:
+            await self.flush(opponent)
+        await self.ai_turn(match)
+
+    async def ai_turn(self, match):
+        """Plays the AI's move if it is the AI's turn."""
+        engine = match.engine
+        if match.finished or match.players[engine.current_player] is not None:
+            return
+
+        if is_instant(engine.board, match.difficulty):
+            # Heuristics, table lookups and cached solves take microseconds.
+            cell = engine.choose_move(match.difficulty)
+        else:
+            # Time-limited searches run off the event loop.
+            loop = asyncio.get_running_loop()
+            cell = await loop.run_in_executor(
+                None, engine.choose_move, match.difficulty, None, engine.board.copy()
+            )
+            # The tree kept for the next move costs hundreds of KB; a match should cost a few.
+            engine.mcts.forget()
+        if not match.finished:
+            self.apply(match, cell)
+
+    async def flush(self, session):
+        """Waits for another session's output to be sent; if its connection is gone, only that session leaves."""
+        try:
+            await session.writer.drain()
+        except ConnectionError:
+            self.leave(session, "opponent left")
+            session.writer.close()
+
+    def apply(self, match, cell):
+        """Plays a move, announces it and ends the match if it is over."""
+        engine = match.engine
+        player = engine.current_player
+        engine.make_move(cell)
+        match.broadcast({"type": "move", "player": player, "cell": cell})
+        if engine.game_over:
+            reason = "win" if engine.winner is not None else "tie"
+            self.finish(match, {"type": "end", "winner": engine.winner, "reason": reason})
+
+    def finish(self, match, message):
+        """Announces the result and detaches both sessions from the match."""
+        match.finished = True
+        match.broadcast(message)
+        if self.log is not None and match.engine.moves:
+            self.log.write(GameRecord.from_engine(match.engine, match.strategies["X"], match.strategies["O"],
+                                                  message["winner"]))
+        names = match.names
+        if (self.players is not None and match.engine.moves and None not in names.values()
+                and names["X"] != names["O"]):
+            self.players.record(names["X"], names["O"], message["winner"])
+        for session in match.players.values():
+            if session is not None:
+                session.match = None
+                session.mark = None
+
+    def send_leaderboard(self, session, limit):
+        """Sends the best rated players, from the leaderboard cache."""
+        if self.players is None:
+            raise ValueError("This server does not keep ratings")
+        standings = self.players.leaderboard(max(0, min(limit, MAX_LEADERBOARD)), LEADERBOARD_MAX_AGE)
+        session.send({"type": "leaderboard", "players": [standing._asdict() for standing in standings]})
+
+    def leave(self, session, reason):
+        """Removes a session from matchmaking or forfeits its current game."""
+        if session.waiting_for is not None:
+            queue = self.waiting.get(session.waiting_for)
+            if queue is not None and session in queue:
+                queue.remove(session)
+            session.waiting_for = None
+
+        match = session.match
+        if match is not None:
+            winner = other_player(session.mark)
+            session.match = None
+            session.mark = None
+            match.players = {mark: player for mark, player in match.players.items() if player is not session}
+            self.finish(match, {"type": "end", "winner": winner, "reason": reason})
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, time_budget=0.2, log=None, search_processes=1,
+                players=None):
+    """Runs a server until cancelled."""
+    server = await GameServer(time_budget, log, search_processes, players).start(host, port)
+    print(f"Serving on {', '.join(str(sock.getsockname()) for sock in server.sockets)}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host Tic-Tac-Toe games over TCP.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--time-budget", type=float, default=0.2,
+                        help="seconds per Hard move on boards other than 3x3")
+    parser.add_argument("--records", help="binary game log to append every finished game to")
+    parser.add_argument("--players", help="SQLite database of player ratings and results")
+    parser.add_argument("--search-processes", type=int, default=1,
+                        help="split Hard searches on large boards across this many processes (0: one per core)")
+    args = parser.parse_args(argv)
+    log = RecordWriter(args.records) if args.records else None
+    players = PlayerStats(args.players) if args.players else None
+    try:
+        asyncio.run(serve(args.host, args.port, args.time_budget, log, args.search_processes, players))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if log is not None:
+            log.close()
+        if players is not None:
+            players.close()
+
+
+if __name__ == "__main__":
+    main()
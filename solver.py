@@ -0,0 +1,228 @@
+"""
+Memoized perfect-play solver for Tic-Tac-Toe.
+
+Positions are keyed by a canonical hash that folds together the 8 rotations
+and reflections of the board, so symmetric positions share a single entry in
+a transposition table that outlives individual moves and games.
+"""
+from collections import OrderedDict
+
+from board import CELLS, other_player
+
+# --- Board Symmetries ---
+# Cells are indexed row-major: index = 3 * row + col.
+
+
+def _rotate(perm):
+    """Rotates a cell permutation 90 degrees clockwise."""
+    return tuple(perm[3 * (2 - i % 3) + i // 3] for i in range(9))
+
+
+def _mirror(perm):
+    """Reflects a cell permutation left-to-right."""
+    return tuple(perm[3 * (i // 3) + 2 - i % 3] for i in range(9))
+
+
+def _build_symmetries():
+    """Returns the 8 permutations of the dihedral group of the square."""
+    perms = []
+    perm = tuple(range(9))
+    for _ in range(4):
+        perms.append(perm)
+        perms.append(_mirror(perm))
+        perm = _rotate(perm)
+    return tuple(perms)
+
+
+def _build_mask_table(perm):
+    """Precomputes the image of every 9-bit mask under one symmetry."""
+    table = []
+    for mask in range(1 << CELLS):
+        image = 0
+        for dest, source in enumerate(perm):
+            if mask >> source & 1:
+                image |= 1 << dest
+        table.append(image)
+    return tuple(table)
+
+
+# Each symmetry maps a destination cell to the source cell it is read from.
+SYMMETRIES = _build_symmetries()
+_MASK_TABLES = tuple(_build_mask_table(perm) for perm in SYMMETRIES)
+
+WIN_SCORE = 10
+
+
+def canonical_key(board, player):
+    """
+    Returns the canonical hash of a position for the given player to move.
+
+    The masks of the side to move and its opponent are mapped through every
+    symmetry and packed as (own << 9 | opponent); the smallest value is the key.
+    """
+    own, opp = (board.x, board.o) if player == "X" else (board.o, board.x)
+    return min([(table[own] << CELLS) | table[opp] for table in _MASK_TABLES])
+
+
+# --- Transposition Table ---
+class TranspositionTable:
+    """
+    Maps canonical position keys to solved scores.
+
+    The table is unbounded by default. When `maxsize` is given, the least
+    recently used entry is evicted once the table grows past that size.
+    """
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """Returns the stored score for a key, or None on a miss."""
+        score = self._entries.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.maxsize is not None:
+            self._entries.move_to_end(key)
+        return score
+
+    def put(self, key, score):
+        """Stores a score, evicting the oldest entry if the table is full."""
+        self._entries[key] = score
+        if self.maxsize is not None:
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def items(self):
+        """Returns the (key, score) pairs, least recently used first."""
+        return list(self._entries.items())
+
+    def clear(self):
+        """Removes all entries and resets the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+# --- Solver ---
+class Solver:
+    """
+    Negamax solver backed by a symmetry-aware transposition table.
+
+    Scores follow the classic Minimax convention of the game: a win reached
+    after d further plies is worth 10 - d, a loss d - 10 and a draw 0, always
+    from the point of view of the player to move.
+    """
+    def __init__(self, table=None):
+        self.table = table if table is not None else TranspositionTable()
+        self.nodes = 0
+
+    def score(self, board, player):
+        """Returns the perfect-play score of the position for the player to move."""
+        return self._negamax(board.copy(), player, other_player(player))
+
+    def best_move(self, board, player):
+        """Returns the index of the best cell for the player, or None if the board is full."""
+        board = board.copy()
+        opponent = other_player(player)
+        best_score = -float('inf')
+        best_move = None
+
+        for i in board.empty_cells():
+            board.play(i, player)
+            score = -self._negamax(board, opponent, player)
+            board.undo(i)
+
+            if score > best_score:
+                best_score = score
+                best_move = i
+
+        return best_move
+
+    def _negamax(self, board, player, opponent):
+        """Recursive negamax over a mutable board, memoized by canonical key."""
+        self.nodes += 1
+        key = canonical_key(board, player)
+        score = self.table.get(key)
+        if score is not None:
+            return score
+
+        if board.has_won(opponent):
+            score = -WIN_SCORE
+        elif board.is_full():
+            score = 0
+        else:
+            score = -WIN_SCORE
+            for i in board.empty_cells():
+                board.play(i, player)
+                child = -self._negamax(board, opponent, player)
+                board.undo(i)
+                # A result one ply further away is worth one point less.
+                if child > 0:
+                    child -= 1
+                elif child < 0:
+                    child += 1
+                if child > score:
+                    score = child
+
+        self.table.put(key, score)
+        return score
+
+
+def count_minimax_nodes(board, player):
+    """Counts the nodes plain, unmemoized Minimax visits when choosing a move."""
+    board = board.copy()
+    opponent = other_player(player)
+
+    def visit(to_move, other):
+        nodes = 1
+        if board.has_won(other) or board.is_full():
+            return nodes
+        for i in board.empty_cells():
+            board.play(i, to_move)
+            nodes += visit(other, to_move)
+            board.undo(i)
+        return nodes
+
+    total = 0
+    for i in board.empty_cells():
+        board.play(i, player)
+        total += visit(opponent, player)
+        board.undo(i)
+    return total
+
+
+if __name__ == "__main__":
+    import time
+
+    from board import Board
+
+    solver = Solver()
+    for label, board, player in (("empty board", Board(), "X"), ("reply to corner", Board(x=1), "O")):
+        plain = count_minimax_nodes(board, player)
+        solver.nodes = 0
+        start = time.perf_counter()
+        solver.best_move(board, player)
+        cold = time.perf_counter() - start
+        cold_nodes = solver.nodes
+        solver.nodes = 0
+        start = time.perf_counter()
+        solver.best_move(board, player)
+        warm = time.perf_counter() - start
+        print(f"{label}: plain minimax {plain} nodes | "
+              f"memoized cold {cold_nodes} nodes ({cold * 1e3:.2f} ms) | "
+              f"warm {solver.nodes} nodes ({warm * 1e6:.1f} us)")
+    print(f"transposition table: {len(solver.table)} canonical positions")
@@ -0,0 +1,125 @@
+"""
+AI-vs-AI spectating and game-log replay, independent of Tk.
+
+A `SpectatorSession` feeds back-to-back games to a view: live games between
+two strategies, or games read back from a game log. The view starts each game,
+asks for moves, plays them on the engine and draws them at whatever rate it
+likes, then reports the result; the session keeps a `Tally` of the results
+and of how many frames per second the view managed to draw.
+"""
+import random
+import time
+from collections import deque
+
+from records import RecordReader
+
+
+class Tally:
+    """Running results of spectated games and the frame rate over the last `window` seconds."""
+    def __init__(self, window=1.0):
+        self.window = window
+        self.results = {"X": 0, "O": 0, None: 0}
+        self.frames = 0
+        self._frame_times = deque()
+
+    @property
+    def games(self):
+        return sum(self.results.values())
+
+    def record(self, winner):
+        """Counts a finished game; `winner` is None for a tie."""
+        self.results[winner] += 1
+
+    def frame(self, now=None):
+        """Counts one drawn frame."""
+        now = time.perf_counter() if now is None else now
+        self.frames += 1
+        times = self._frame_times
+        times.append(now)
+        while now - times[0] > self.window:
+            times.popleft()
+
+    @property
+    def fps(self):
+        """Frames per second over the window, 0 until two frames were drawn in it."""
+        times = self._frame_times
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def summary(self, fps=True):
+        results = self.results
+        text = f"X {results['X']}  ·  O {results['O']}  ·  Tie {results[None]}  ({self.games} games)"
+        return f"{text}  ·  {self.fps:.0f} fps" if fps else text
+
+
+class SpectatorSession:
+    """
+    Back-to-back games on `engine`: live ones between the `x` and `o`
+    strategies, or, given `log_path`, every game of that log in order.
+    """
+    def __init__(self, engine, x="Hard", o="Hard", log_path=None, rng=None):
+        self.engine = engine
+        self.strategies = {"X": x, "O": o}
+        self.tally = Tally()
+        self.rng = rng if rng is not None else random.Random()
+        self._reader = RecordReader(log_path) if log_path is not None else None
+        self._views = iter(self._reader) if self._reader is not None else None
+        self._moves = b""
+        self._ply = 0
+        self._recorded_winner = None
+
+    @property
+    def replaying(self):
+        return self._reader is not None
+
+    def start_game(self):
+        """
+        Resets the engine for the next game, resizing the board for a
+        recorded game of another size. Returns False once a replayed log is
+        exhausted.
+        """
+        if self._reader is None:
+            self.engine.reset(seed=self.rng.getrandbits(63))
+            return True
+        view = next(self._views, None)
+        if view is None:
+            self.close()
+            return False
+        # The view moves on with the iterator, so keep what the game needs.
+        self._moves = bytes(view.moves)
+        self._ply = 0
+        self._recorded_winner = view.winner
+        self.strategies = {"X": view.x, "O": view.o}
+        self.engine.reset(view.size, view.win_length, seed=view.seed)
+        return True
+
+    @property
+    def strategy(self):
+        """The strategy of the player to move."""
+        return self.strategies[self.engine.current_player]
+
+    def recorded_move(self):
+        """Returns the next move of the replayed game, or None if the record ends early."""
+        if self._ply >= len(self._moves):
+            return None
+        move = self._moves[self._ply]
+        self._ply += 1
+        return move
+
+    def finish_game(self):
+        """
+        Counts the finished game in the tally and returns its winner. A
+        replayed game that stopped early, e.g. on a forfeit, keeps its
+        recorded winner.
+        """
+        engine = self.engine
+        winner = engine.winner if engine.game_over or not self.replaying else self._recorded_winner
+        self.tally.record(winner)
+        return winner
+
+    def close(self):
+        """Unmaps a replayed log."""
+        if self._reader is not None:
+            self._reader.close()
+            self._views = iter(())
@@ -0,0 +1,138 @@
+"""
+Search statistics for the AI strategies.
+
+Every strategy call made through `GameEngine.choose_move` produces a
+`SearchStats` record (nodes expanded, cutoffs, table hits and misses, MCTS
+playouts, depth and elapsed nanoseconds) that is passed to the engine's stats hooks. A
+`StatsRegistry` is the standard hook: it aggregates records per difficulty and
+exports them as JSON or in the Prometheus text exposition format.
+"""
+import json
+import threading
+
+_COUNTERS = ("moves", "nodes", "cutoffs", "table_hits", "table_misses", "playouts", "elapsed_ns")
+_MAXIMA = ("max_elapsed_ns", "max_depth")
+
+
+class SearchStats:
+    """Cost of a single strategy call."""
+    def __init__(self, difficulty):
+        self.difficulty = difficulty
+        self.nodes = 0
+        self.cutoffs = 0
+        self.table_hits = 0
+        self.table_misses = 0
+        self.playouts = 0
+        self.depth = 0
+        self.elapsed_ns = 0
+
+    def as_dict(self):
+        """Returns the record as a plain dict."""
+        return {
+            "difficulty": self.difficulty,
+            "nodes": self.nodes,
+            "cutoffs": self.cutoffs,
+            "table_hits": self.table_hits,
+            "table_misses": self.table_misses,
+            "playouts": self.playouts,
+            "depth": self.depth,
+            "elapsed_ns": self.elapsed_ns,
+        }
+
+    @property
+    def playouts_per_second(self):
+        """MCTS playout rate of this call."""
+        return self.playouts * 1e9 / self.elapsed_ns if self.elapsed_ns else 0.0
+
+    def summary(self):
+        """One-line description, used by the GUI overlay."""
+        if self.playouts:
+            return (f"{self.difficulty}: {self.playouts} playouts ({self.playouts_per_second:.0f}/s), "
+                    f"depth {self.depth}, {self.elapsed_ns / 1e6:.2f} ms")
+        return (f"{self.difficulty}: {self.nodes} nodes, {self.cutoffs} cutoffs, "
+                f"{self.table_hits}/{self.table_hits + self.table_misses} table hits, "
+                f"depth {self.depth}, {self.elapsed_ns / 1e6:.2f} ms")
+
+
+class StatsRegistry:
+    """Thread-safe per-difficulty aggregation of `SearchStats` records."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def _entry(self, difficulty):
+        entry = self._totals.get(difficulty)
+        if entry is None:
+            entry = self._totals[difficulty] = dict.fromkeys(_COUNTERS + _MAXIMA, 0)
+        return entry
+
+    def record(self, stats):
+        """Adds one strategy call to the totals of its difficulty."""
+        with self._lock:
+            entry = self._entry(stats.difficulty)
+            entry["moves"] += 1
+            entry["nodes"] += stats.nodes
+            entry["cutoffs"] += stats.cutoffs
+            entry["table_hits"] += stats.table_hits
+            entry["table_misses"] += stats.table_misses
+            entry["playouts"] += stats.playouts
+            entry["elapsed_ns"] += stats.elapsed_ns
+            entry["max_elapsed_ns"] = max(entry["max_elapsed_ns"], stats.elapsed_ns)
+            entry["max_depth"] = max(entry["max_depth"], stats.depth)
+
+    def merge(self, snapshot):
+        """Folds in totals from another registry's `snapshot`, e.g. from a worker process."""
+        with self._lock:
+            for difficulty, other in snapshot.items():
+                entry = self._entry(difficulty)
+                for key in _COUNTERS:
+                    entry[key] += other[key]
+                for key in _MAXIMA:
+                    entry[key] = max(entry[key], other[key])
+
+    def snapshot(self):
+        """Returns a copy of the totals, keyed by difficulty."""
+        with self._lock:
+            return {difficulty: dict(entry) for difficulty, entry in self._totals.items()}
+
+    def reset(self):
+        """Clears all totals."""
+        with self._lock:
+            self._totals.clear()
+
+    def to_json(self, indent=None):
+        """Exports the totals as a JSON object keyed by difficulty."""
+        return json.dumps(self.snapshot(), indent=indent, sort_keys=True)
+
+    def to_prometheus(self, prefix="tictactoe_ai"):
+        """Exports the totals in the Prometheus text exposition format."""
+        metrics = (
+            ("moves_total", "counter", "Strategy calls.", "moves", 1),
+            ("nodes_total", "counter", "Search nodes expanded.", "nodes", 1),
+            ("cutoffs_total", "counter", "Alpha-beta cutoffs.", "cutoffs", 1),
+            ("table_hits_total", "counter", "Lookup and transposition table hits.", "table_hits", 1),
+            ("table_misses_total", "counter", "Lookup and transposition table misses.", "table_misses", 1),
+            ("playouts_total", "counter", "MCTS random playouts.", "playouts", 1),
+            ("search_seconds_total", "counter", "Time spent choosing moves.", "elapsed_ns", 1e-9),
+            ("search_seconds_max", "gauge", "Slowest single move.", "max_elapsed_ns", 1e-9),
+            ("search_depth_max", "gauge", "Deepest completed search.", "max_depth", 1),
+        )
+        snapshot = self.snapshot()
+        lines = []
+        for name, kind, help_text, key, scale in metrics:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for difficulty in sorted(snapshot):
+                value = snapshot[difficulty][key]
+                if scale != 1:
+                    value *= scale
+                lines.append(f'{prefix}_{name}{{difficulty="{difficulty}"}} {value}')
+
+        lines.append(f"# HELP {prefix}_playouts_per_second Average MCTS playout rate.")
+        lines.append(f"# TYPE {prefix}_playouts_per_second gauge")
+        for difficulty in sorted(snapshot):
+            entry = snapshot[difficulty]
+            if entry["playouts"]:
+                rate = entry["playouts"] * 1e9 / entry["elapsed_ns"] if entry["elapsed_ns"] else 0.0
+                lines.append(f'{prefix}_playouts_per_second{{difficulty="{difficulty}"}} {rate}')
+        return "\n".join(lines) + "\n"
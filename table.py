@@ -0,0 +1,164 @@
+"""
+Precomputed perfect-play lookup table.
+
+Every position reachable from the empty board is solved once, offline, and
+written to a compact binary file. Positions are indexed in base 3 (cell i
+contributes 3**i, times 1 for X and 2 for O), and each entry holds two bytes:
+the best cell for the side to move (255 when there is none) and its score.
+At runtime the file is memory-mapped, so a Hard move is a single lookup.
+
+Usage:
+    python table.py build [path]    # solve every position and write the table
+    python table.py verify [path]   # cross-check the table against the live solver
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+from board import CELLS, Board
+from solver import Solver
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perfect_play.bin")
+
+MAGIC = b"TTTB"
+VERSION = 1
+# magic, version, entry size, entry count, CRC32 of the entries
+HEADER = struct.Struct("<4sHHII")
+ENTRY = struct.Struct("<Bb")
+ENTRY_COUNT = 3 ** CELLS
+NO_MOVE = 0xFF
+
+# Base-3 weight of every 9-bit mask, so an index is two table reads.
+_BASE3 = tuple(sum(3 ** i for i in range(CELLS) if mask >> i & 1) for mask in range(1 << CELLS))
+
+
+def position_index(board):
+    """Returns the base-3 index of a board."""
+    return _BASE3[board.x] + 2 * _BASE3[board.o]
+
+
+def side_to_move(board):
+    """Returns the player to move, assuming X opened the game."""
+    return "X" if board.x.bit_count() == board.o.bit_count() else "O"
+
+
+def reachable_positions():
+    """Yields every position reachable from the empty board, each exactly once."""
+    seen = set()
+    stack = [Board()]
+    while stack:
+        board = stack.pop()
+        index = position_index(board)
+        if index in seen:
+            continue
+        seen.add(index)
+        yield board
+
+        if board.has_won("X") or board.has_won("O"):
+            continue
+        player = side_to_move(board)
+        for i in board.empty_cells():
+            child = board.copy()
+            child.play(i, player)
+            stack.append(child)
+
+
+def solve(board, solver):
+    """Returns (best cell or None, score) for the side to move; finished games have no move."""
+    player = side_to_move(board)
+    finished = board.has_won("X") or board.has_won("O") or board.is_full()
+    return (None if finished else solver.best_move(board, player)), solver.score(board, player)
+
+
+def build(path=DEFAULT_PATH, solver=None):
+    """Solves every reachable position and writes the table; returns the position count."""
+    solver = solver if solver is not None else Solver()
+    entries = bytearray(ENTRY.pack(NO_MOVE, 0) * ENTRY_COUNT)
+    count = 0
+    for board in reachable_positions():
+        move, score = solve(board, solver)
+        ENTRY.pack_into(entries, position_index(board) * ENTRY.size,
+                        NO_MOVE if move is None else move, score)
+        count += 1
+
+    header = HEADER.pack(MAGIC, VERSION, ENTRY.size, ENTRY_COUNT, zlib.crc32(entries))
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(entries)
+    return count
+
+
+class PerfectPlayTable:
+    """Read-only, memory-mapped view of a table written by `build`."""
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._map) != HEADER.size + ENTRY.size * ENTRY_COUNT:
+            raise ValueError(f"{path}: unexpected table size {len(self._map)}")
+        magic, version, entry_size, count, checksum = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or entry_size != ENTRY.size or count != ENTRY_COUNT:
+            raise ValueError(f"{path}: not a version {VERSION} perfect-play table")
+        if zlib.crc32(self._map[HEADER.size:]) != checksum:
+            raise ValueError(f"{path}: checksum mismatch")
+
+    def close(self):
+        """Releases the memory map."""
+        self._map.close()
+
+    def entries(self):
+        """
+        Returns a read-only view of the raw entries, ENTRY.size bytes per index.
+        The table cannot be closed while the view is alive.
+        """
+        return memoryview(self._map)[HEADER.size:]
+
+    def lookup(self, board):
+        """Returns (best cell or None, score) for the side to move."""
+        move, score = ENTRY.unpack_from(self._map, HEADER.size + position_index(board) * ENTRY.size)
+        return (None if move == NO_MOVE else move), score
+
+    def best_move(self, board):
+        """Returns the best cell for the side to move, or None."""
+        move = self._map[HEADER.size + position_index(board) * ENTRY.size]
+        return None if move == NO_MOVE else move
+
+
+def load_default_table():
+    """Opens the shipped table, or returns None if it has not been built."""
+    if not os.path.exists(DEFAULT_PATH):
+        return None
+    return PerfectPlayTable(DEFAULT_PATH)
+
+
+def verify(path=DEFAULT_PATH, solver=None):
+    """Cross-checks every reachable entry against the live solver; returns the mismatches."""
+    solver = solver if solver is not None else Solver()
+    table = PerfectPlayTable(path)
+    mismatches = []
+    try:
+        for board in reachable_positions():
+            expected = solve(board, solver)
+            if table.lookup(board) != expected:
+                mismatches.append((board, table.lookup(board), expected))
+    finally:
+        table.close()
+    return mismatches
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ("build", "verify"):
+        sys.exit(__doc__)
+    target = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PATH
+
+    if sys.argv[1] == "build":
+        positions = build(target)
+        print(f"Wrote {positions} positions to {target} ({os.path.getsize(target)} bytes)")
+    else:
+        bad = verify(target)
+        for board, got, expected in bad[:10]:
+            print(f"{board}: table {got}, solver {expected}")
+        print(f"{'FAILED' if bad else 'OK'}: {len(bad)} mismatches")
+        sys.exit(1 if bad else 0)
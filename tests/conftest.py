@@ -0,0 +1,16 @@
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption("--regression-threshold", type=float, default=None,
+                     help="fail benchmarks slower than benchmark_baseline.json by more than this (0.25 = 25%%)")
+
+
+def pytest_collection_modifyitems(config, items):
+    # Benchmarks need the pytest-benchmark plugin; the behaviour tests run without it.
+    if config.pluginmanager.hasplugin("benchmark"):
+        return
+    skip = pytest.mark.skip(reason="needs the pytest-benchmark plugin")
+    for item in items:
+        if "benchmark" in getattr(item, "fixturenames", ()):
+            item.add_marker(skip)
@@ -0,0 +1,129 @@
+import random
+
+import pytest
+
+from adaptive import MAX_DEPTH, MAX_NOISE, AdaptiveSearcher, StrengthTuner, noise, score_of, search_depth
+from board import Board, other_player
+from engine import GameEngine
+from solver import Solver
+
+
+def random_position(rng):
+    board = Board()
+    player = "X"
+    for _ in range(rng.randrange(8)):
+        board.play(rng.choice(board.empty_cells()), player)
+        if board.has_won(player):
+            return None, None
+        player = other_player(player)
+    return board, player
+
+
+def sign(score):
+    return (score > 0) - (score < 0)
+
+
+def test_depth_and_noise_follow_the_strength():
+    assert search_depth(0.0) == 1
+    assert search_depth(1.0) == MAX_DEPTH
+    assert [search_depth(strength / 10) for strength in range(11)] == sorted(
+        search_depth(strength / 10) for strength in range(11))
+    assert noise(0.0) == MAX_NOISE
+    assert noise(1.0) == 0.0
+    assert noise(0.5) == pytest.approx(MAX_NOISE / 2)
+
+
+@pytest.mark.parametrize("strength", [-0.1, 1.5])
+def test_rejects_strengths_outside_zero_to_one(strength):
+    with pytest.raises(ValueError):
+        AdaptiveSearcher(strength)
+    with pytest.raises(ValueError):
+        StrengthTuner(strength)
+    searcher = AdaptiveSearcher(0.5)
+    with pytest.raises(ValueError):
+        searcher.strength = strength
+    assert searcher.strength == 0.5
+
+
+def test_full_strength_plays_perfectly_on_the_classic_board():
+    rng = random.Random(0)
+    searcher = AdaptiveSearcher(1.0, time_budget=None, rng=rng)
+    solver = Solver()
+    checked = 0
+    while checked < 25:
+        board, player = random_position(rng)
+        if board is None:
+            continue
+        move = searcher.best_move(board, player)
+        assert not searcher.noisy
+        expected = sign(solver.score(board, player))
+        board.play(move, player)
+        assert sign(-solver.score(board, other_player(player))) == expected
+        checked += 1
+
+
+def test_full_strength_never_loses_to_random_play():
+    rng = random.Random(1)
+    engine = GameEngine(rng=rng, strength=1.0)
+    for game in range(6):
+        engine.reset()
+        adaptive_player = "X" if game % 2 == 0 else "O"
+        while not engine.game_over:
+            engine.ai_move("Adaptive" if engine.current_player == adaptive_player else "Easy")
+        assert engine.winner in (adaptive_player, None)
+
+
+def test_the_engine_answers_full_strength_from_the_table():
+    engine = GameEngine(rng=random.Random(3), strength=1.0)
+    engine.make_move(0)
+    move = engine.choose_move("Adaptive")
+    assert move == 4
+    assert (engine.last_stats.nodes, engine.last_stats.table_hits, engine.last_stats.depth) == (1, 1, 0)
+
+    engine.adaptive.strength = 0.9
+    engine.choose_move("Adaptive")
+    assert engine.adaptive.noisy or engine.last_stats.nodes > 1
+
+
+def test_weak_settings_play_random_moves_some_of_the_time():
+    searcher = AdaptiveSearcher(0.0, rng=random.Random(2))
+    board = Board()
+    noisy = 0
+    for _ in range(200):
+        move = searcher.best_move(board, "X")
+        assert board.is_empty(move)
+        if searcher.noisy:
+            noisy += 1
+            assert searcher.nodes == 0
+    assert 60 < noisy < 140
+
+
+def test_full_board_has_no_move():
+    board = Board.from_cells(list("XOXXOOOXX"))
+    assert AdaptiveSearcher(1.0).best_move(board, "X") is None
+
+
+def test_scores():
+    assert score_of("X", "X") == 1.0
+    assert score_of("O", "X") == 0.0
+    assert score_of(None, "O") == 0.5
+
+
+def test_tuner_moves_toward_the_opponent():
+    tuner = StrengthTuner(0.5, step=0.2)
+    assert tuner.recent_score is None
+    assert tuner.record(1.0) == pytest.approx(0.6)
+    assert tuner.record(0.0) == pytest.approx(0.5)
+    assert tuner.record(0.5) == pytest.approx(0.5)
+    assert tuner.recent_score == pytest.approx(0.5)
+
+
+def test_tuner_stays_between_zero_and_one():
+    tuner = StrengthTuner(0.9, step=0.2)
+    for _ in range(10):
+        tuner.record(1.0)
+    assert tuner.strength == 1.0
+    for _ in range(20):
+        tuner.record(0.0)
+    assert tuner.strength == 0.0
+    assert list(tuner.results) == [0.0] * 10
@@ -0,0 +1,170 @@
+import threading
+import time
+
+import pytest
+
+from aiworker import AIWorker
+from engine import GameEngine
+
+
+class Loop:
+    """Stands in for the Tk event loop: `after` queues callbacks, `run` calls them when they are due."""
+    def __init__(self):
+        self.pending = []
+
+    def after(self, delay_ms, callback, *args):
+        self.pending.append((time.perf_counter() + delay_ms / 1000, callback, args))
+
+    def run(self, until=None, timeout=5.0):
+        """Runs callbacks until none are left, or until `until()` is true."""
+        deadline = time.perf_counter() + timeout
+        while self.pending and time.perf_counter() < deadline:
+            if until is not None and until():
+                return
+            self.pending.sort(key=lambda item: item[0])
+            due, callback, args = self.pending[0]
+            if due > time.perf_counter():
+                time.sleep(0.001)
+                continue
+            self.pending.pop(0)
+            callback(*args)
+        assert until is None and not self.pending
+
+
+class SlowEngine(GameEngine):
+    """Answers cell 4 once `release` is set, unless the search is cancelled first."""
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.searches = 0
+
+    def choose_move(self, difficulty, player=None, board=None, cancel=None):
+        self.searches += 1
+        while not self.release.wait(0.001):
+            if cancel is not None and cancel.is_set():
+                break
+        return 4
+
+
+def test_hands_the_move_to_the_view():
+    loop = Loop()
+    worker = AIWorker(loop.after, poll_ms=1)
+    engine = GameEngine()
+    played = []
+    worker.start(engine, "Hard", played.append, None)
+    assert worker.busy
+    loop.run()
+    assert len(played) == 1 and engine.is_valid_move(played[0])
+    assert not worker.busy
+    worker.shutdown()
+
+
+def test_searches_a_copy_of_the_board():
+    loop = Loop()
+    worker = AIWorker(loop.after, poll_ms=1)
+    engine = SlowEngine()
+    boards = []
+    engine.choose_move = lambda difficulty, player, board, cancel: boards.append(board) or 0
+    worker.start(engine, "Hard", lambda move: None, None)
+    loop.run()
+    assert boards[0] is not engine.board
+    worker.shutdown()
+
+
+def test_a_cancelled_search_never_plays():
+    loop = Loop()
+    worker = AIWorker(loop.after, poll_ms=1)
+    engine = SlowEngine()
+    played = []
+    worker.start(engine, "Hard", played.append, None)
+    worker.cancel()
+    assert not worker.busy
+    engine.release.set()
+    loop.run()
+    assert played == []
+    worker.shutdown()
+
+
+def test_a_search_cancelled_while_paced_never_plays():
+    loop = Loop()
+    worker = AIWorker(loop.after, poll_ms=1)
+    engine = SlowEngine()
+    engine.release.set()
+    played = []
+    worker.start(engine, "Hard", played.append, None, min_ms=50)
+    # Let the search finish and the paced hand-over be scheduled, then cancel.
+    loop.run(until=lambda: any(callback == worker._deliver for _, callback, _ in loop.pending))
+    worker.cancel()
+    loop.run()
+    assert played == []
+    worker.shutdown()
+
+
+def test_a_new_search_replaces_the_one_in_flight():
+    loop = Loop()
+    worker = AIWorker(loop.after, poll_ms=1)
+    engine = SlowEngine()
+    played = []
+    worker.start(engine, "Hard", lambda move: played.append(("first", move)), None)
+    worker.start(engine, "Hard", lambda move: played.append(("second", move)), None)
+    engine.release.set()
+    loop.run()
+    assert played == [("second", 4)]
+    worker.shutdown()
+
+
+def test_pacing_pads_fast_searches():
+    loop = Loop()
+    worker = AIWorker(loop.after, poll_ms=1)
+    engine = SlowEngine()
+    engine.release.set()
+    played = []
+    start = time.perf_counter()
+    worker.start(engine, "Hard", lambda move: played.append(time.perf_counter() - start), None, min_ms=100)
+    loop.run()
+    assert played[0] >= 0.1
+    worker.shutdown()
+
+
+def test_a_failed_search_plays_the_stand_in_move():
+    loop = Loop()
+    worker = AIWorker(loop.after, poll_ms=1)
+    engine = GameEngine()
+
+    def fail(*args):
+        raise RuntimeError("search crashed")
+
+    engine.choose_move = fail
+    errors, played = [], []
+    worker.start(engine, "Hard", played.append, lambda error: errors.append(error) or 7)
+    loop.run()
+    assert [str(error) for error in errors] == ["search crashed"]
+    assert played == [7] and not worker.busy
+    worker.shutdown()
+
+
+def test_without_an_error_handler_the_error_reaches_the_loop():
+    loop = Loop()
+    worker = AIWorker(loop.after, poll_ms=1)
+    engine = GameEngine()
+
+    def fail(*args):
+        raise RuntimeError("search crashed")
+
+    engine.choose_move = fail
+    worker.start(engine, "Hard", lambda move: None)
+    with pytest.raises(RuntimeError):
+        loop.run()
+    assert not worker.busy
+    worker.shutdown()
+
+
+def test_shutdown_cancels_the_search_in_flight():
+    loop = Loop()
+    worker = AIWorker(loop.after, poll_ms=1)
+    engine = SlowEngine()
+    played = []
+    worker.start(engine, "Hard", played.append, None)
+    worker.shutdown()
+    loop.run()
+    assert played == [] and engine.searches == 1
@@ -0,0 +1,70 @@
+import csv
+import json
+
+import pytest
+
+from analysis import PositionStats, _board_text, analyse, main, summarize
+from board import Board
+
+
+@pytest.fixture(scope="module")
+def positions():
+    return list(analyse())
+
+
+def test_counts_every_canonical_position_once(positions):
+    summary = summarize(positions)
+    assert summary["positions"] == 765
+    assert summary["raw_positions"] == 5478
+    assert len({(stats.x, stats.o) for stats in positions}) == 765
+
+
+def test_the_empty_board_is_a_draw_and_comes_last(positions):
+    root = positions[-1]
+    assert (root.x, root.o, root.player, root.ply, root.orbit) == (0, 0, "X", 0, 1)
+    assert (root.value, root.depth) == (0, None)
+    assert (root.legal_moves, root.optimal_moves, root.winning_moves) == (9, 9, 0)
+
+
+def test_finished_positions_have_no_moves(positions):
+    for stats in positions:
+        board = Board(3, 3, stats.x, stats.o)
+        if board.has_won("X") or board.has_won("O") or board.is_full():
+            assert stats.legal_moves == stats.optimal_moves == stats.winning_moves == 0
+            assert stats.intermediate_optimal is None
+            assert stats.value in (0, -1)
+
+
+def test_values_agree_with_depths(positions):
+    for stats in positions:
+        assert (stats.depth is None) == (stats.value == 0)
+        assert stats.value != 1 or stats.winning_moves > 0
+
+
+def test_streams_children_before_parents():
+    stream = analyse()
+    first = next(stream)
+    assert isinstance(first, PositionStats)
+    assert first.legal_moves == 0
+    stream.close()
+
+
+def test_board_text_uses_the_win_length():
+    stats = next(analyse(4, 3))
+    board = Board(4, 3, stats.x, stats.o)
+    rows = "/".join("".join(mark or "." for mark in row) for row in board.to_rows())
+    assert _board_text(stats, 4, 3) == rows
+
+
+def test_writes_jsonl_and_csv(tmp_path, capsys):
+    assert main(["--jsonl", str(tmp_path / "positions.jsonl")]) == 0
+    with open(tmp_path / "positions.jsonl") as file:
+        rows = [json.loads(line) for line in file]
+    assert len(rows) == 765 and set(rows[0]) == set(PositionStats._fields)
+
+    assert main(["--csv", str(tmp_path / "positions.csv")]) == 0
+    with open(tmp_path / "positions.csv", newline="") as file:
+        reader = csv.reader(file)
+        assert next(reader) == list(PositionStats._fields)
+        assert sum(1 for _ in reader) == 765
+    assert "Wrote 765 positions" in capsys.readouterr().out
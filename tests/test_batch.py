@@ -0,0 +1,68 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import batch
+from table import load_default_table, position_index, reachable_positions
+
+POSITIONS = list(reachable_positions())
+
+
+def as_array(boards):
+    return np.array([[1 if board.get(i) == "X" else 2 if board.get(i) == "O" else 0 for i in range(9)]
+                     for board in boards], dtype=np.int8)
+
+
+BOARDS = as_array(POSITIONS)
+
+
+def test_table_index_matches_the_lookup_table():
+    assert batch.table_index(BOARDS).tolist() == [position_index(board) for board in POSITIONS]
+
+
+def test_status_and_legal_moves_match_the_board():
+    statuses = batch.status(BOARDS)
+    legal = batch.legal_moves(BOARDS)
+    for board, state, moves in zip(POSITIONS, statuses, legal):
+        if board.has_won("X"):
+            expected = batch.X_WINS
+        elif board.has_won("O"):
+            expected = batch.O_WINS
+        elif board.is_full():
+            expected = batch.TIE
+        else:
+            expected = batch.IN_PROGRESS
+        assert state == expected
+        assert np.flatnonzero(moves).tolist() == (board.empty_cells() if expected == batch.IN_PROGRESS else [])
+
+
+def test_perfect_play_matches_the_lookup_table():
+    table = load_default_table()
+    try:
+        moves, scores = batch.perfect_play(BOARDS, table)
+        for board, move, score in zip(POSITIONS, moves, scores):
+            expected_move, expected_score = table.lookup(board)
+            assert (move, score) == (-1 if expected_move is None else expected_move, expected_score)
+    finally:
+        table.close()
+
+
+def test_evaluate_uses_the_shipped_table_once():
+    first = batch.evaluate(BOARDS[:10])
+    table = batch._table
+    second = batch.evaluate(BOARDS[10:20])
+    assert batch._table is table is not None
+    assert set(first) == set(second) == {"status", "legal_moves", "best_move", "score"}
+
+
+def test_boards_must_have_nine_cells():
+    with pytest.raises(ValueError):
+        batch.status(np.zeros((4, 8), dtype=np.int8))
+
+
+@pytest.mark.parametrize("value", [-1, 3])
+def test_cells_must_be_empty_x_or_o(value):
+    board = [0] * 8 + [value]
+    for func in (batch.status, batch.legal_moves, batch.evaluate, batch.table_index):
+        with pytest.raises(ValueError):
+            func([board])
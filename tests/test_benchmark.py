@@ -0,0 +1,32 @@
+"""
+The benchmark.py hot paths as a pytest-benchmark suite (needs the
+pytest-benchmark plugin; skipped without it).
+
+Usage:
+    python -m pytest tests/test_benchmark.py                              # time every hot path
+    python -m pytest tests/test_benchmark.py --regression-threshold 0.25  # and fail on regressions
+    python -m pytest --benchmark-skip                                     # only the behaviour tests
+"""
+import json
+
+import pytest
+
+import benchmark as hot_paths
+
+BENCHMARKS = hot_paths.build_benchmarks()
+with open(hot_paths.DEFAULT_BASELINE) as f:
+    BASELINE = json.load(f)
+
+
+@pytest.mark.parametrize("name", list(BENCHMARKS))
+def test_hot_path(benchmark, request, name):
+    benchmark.group = name.split("_")[0]
+    benchmark(BENCHMARKS[name])
+
+    threshold = request.config.getoption("--regression-threshold")
+    if threshold is None or benchmark.disabled:
+        return
+    # Best time per call, as benchmark.py stores it in the baseline.
+    regressions = hot_paths.compare({name: benchmark.stats.stats.min}, BASELINE, threshold)
+    for _, reference, seconds, ratio in regressions:
+        pytest.fail(f"{name}: {reference * 1e6:.2f} us -> {seconds * 1e6:.2f} us ({ratio:.2f}x)")
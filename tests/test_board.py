@@ -0,0 +1,118 @@
+import random
+
+import pytest
+
+from board import Board, get_geometry
+
+
+def brute_force_win(board, player):
+    """Checks every line from scratch, as the board did before its line counters."""
+    mask = board.mask(player)
+    return any(mask & win == win for win in board.geometry.win_masks)
+
+
+def random_game(board, rng):
+    """Plays random moves, yielding (cell, player) after each, until the board is full."""
+    player = "X"
+    while not board.is_full():
+        cell = rng.choice(board.empty_cells())
+        board.play(cell, player)
+        yield cell, player
+        player = "O" if player == "X" else "X"
+
+
+def test_marks_are_bits_of_each_players_mask():
+    board = Board()
+    board.play(0, "X")
+    board.play(4, "O")
+    assert (board.x, board.o, board.occupied) == (0b1, 0b10000, 0b10001)
+    assert board.mask("X") == board.x and board.mask("O") == board.o
+    assert [board.get(i) for i in (0, 4, 8)] == ["X", "O", ""]
+    assert board.is_empty(8) and not board.is_empty(4)
+    assert board.empty_cells() == [1, 2, 3, 5, 6, 7, 8]
+    assert board.move_count() == 2
+
+
+def test_undo_clears_a_cell():
+    board = Board()
+    board.play(4, "X")
+    board.undo(4)
+    assert board == Board() and board.move_count() == 0
+
+
+def test_from_cells_and_to_rows_round_trip():
+    cells = ["X", "O", "X", "", "O", "", "", "", "X"]
+    board = Board.from_cells(cells)
+    assert board.to_rows() == [cells[0:3], cells[3:6], cells[6:9]]
+    assert not board.is_full()
+    assert Board.from_cells(list("XOXXOOOXX")).is_full()
+
+
+def test_copy_is_independent():
+    board = Board.from_cells(["X", "", "", "", "O", "", "", "", ""])
+    copy = board.copy()
+    copy.play(1, "X")
+    copy.play(2, "X")
+    assert copy.has_won("X")
+    assert not board.has_won("X") and board.is_empty(1)
+    assert copy != board
+
+
+@pytest.mark.parametrize("line", [(0, 1, 2), (0, 3, 6), (0, 4, 8), (2, 4, 6)])
+def test_every_kind_of_line_wins(line):
+    board = Board()
+    for cell in line:
+        board.play(cell, "O")
+    assert board.has_won("O") and not board.has_won("X")
+
+
+def test_masks_build_the_same_board_as_moves():
+    board = Board.from_cells(["X", "O", "X", "", "O", "", "", "", "X"])
+    assert Board(3, 3, board.x, board.o) == board
+    assert hash(Board(3, 3, board.x, board.o)) == hash(board)
+
+
+def test_geometry_is_shared_and_counts_windows():
+    assert get_geometry(3) is get_geometry(3, 3)
+    assert Board(3) == Board(3, 3)
+    assert len(get_geometry(3).lines) == 8
+    # 15x15 five in a row: 11 windows per row and column, 11 * 11 per diagonal direction.
+    assert len(get_geometry(15, 5).lines) == 2 * 15 * 11 + 2 * 11 * 11
+
+
+def test_invalid_geometry_is_rejected():
+    with pytest.raises(ValueError):
+        get_geometry(3, 4)
+
+
+@pytest.mark.parametrize("size, win_length", [(3, 3), (4, 3), (5, 4), (7, 5)])
+def test_counters_agree_with_a_full_scan(size, win_length):
+    rng = random.Random(size * 10 + win_length)
+    for _ in range(50):
+        board = Board(size, win_length)
+        for _ in random_game(board, rng):
+            for player in ("X", "O"):
+                assert board.has_won(player) == brute_force_win(board, player)
+
+
+def test_undo_restores_the_counters():
+    rng = random.Random(1)
+    board = Board(5, 4)
+    played = [cell for cell, _ in random_game(board, rng)]
+    for cell in reversed(played):
+        board.undo(cell)
+        for player in ("X", "O"):
+            assert board.has_won(player) == brute_force_win(board, player)
+    assert board.move_count() == 0
+    assert all(count == 0 for player in ("X", "O") for count in board.line_counts(player))
+
+
+def test_winning_line_and_completes_line():
+    board = Board.from_cells(["X", "X", "", "O", "O", "", "", "", ""])
+    assert board.completes_line(2, "X")
+    assert board.completes_line(5, "O")
+    assert not board.completes_line(8, "X")
+    assert board.winning_line("X") is None
+    board.play(2, "X")
+    assert board.winning_line("X") == (0, 1, 2)
+    assert board.has_won("X") and not board.has_won("O")
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from board import Board
+from book import MoveBook, load_default_book
+from engine import hard_move
+from search import AlphaBetaSearcher
+from solver import Solver
+
+
+def image(board, perm):
+    """The board mapped through one of its geometry's symmetries."""
+    return Board(board.size, board.win_length,
+                 sum(1 << perm[i] for i in range(board.cells) if board.x >> i & 1),
+                 sum(1 << perm[i] for i in range(board.cells) if board.o >> i & 1))
+
+
+def test_a_stored_move_answers_every_symmetric_position():
+    board = Board(5, 4)
+    board.play(0, "X")
+    board.play(7, "O")
+    book = MoveBook()
+    book.store(board, "X", 13)
+    for perm in board.geometry.symmetries:
+        assert book.lookup(image(board, perm), "X") == perm[13]
+    assert len(book) == 1
+
+
+def test_only_the_player_to_move_is_answered():
+    board = Board(4)
+    board.play(5, "X")
+    book = MoveBook()
+    book.store(board, "X", 6)
+    assert len(book) == 0
+    book.store(board, "O", 6)
+    assert book.lookup(board, "O") == 6
+    assert book.lookup(board, "X") is None
+
+
+def test_later_positions_go_to_the_bounded_cache():
+    book = MoveBook(plies=1, cache_size=2)
+    book.store(Board(4), "X", 5)
+    for cell in (0, 1, 2):
+        board = Board(4)
+        board.play(cell, "X")
+        board.play(15, "O")
+        book.store(board, "X", 10)
+    counters = book.counters()
+    assert counters["openings"] == 1
+    assert counters["endgames"] == 2 and counters["endgame_evictions"] == 1
+
+
+def test_save_and_load_round_trip(tmp_path):
+    book = MoveBook()
+    board = Board(7, 5)
+    book.store(board, "X", 24)
+    board.play(24, "X")
+    book.store(board, "O", 17)
+    path = tmp_path / "book.json"
+    book.save(path)
+    loaded = MoveBook.load(path)
+    assert len(loaded) == 2
+    assert loaded.lookup(board, "O") == 17
+    assert loaded.lookup(Board(7, 5), "X") == 24
+
+
+def test_other_versions_are_rejected(tmp_path):
+    path = tmp_path / "book.json"
+    path.write_text(json.dumps({"version": 0}))
+    with pytest.raises(ValueError):
+        MoveBook.load(path)
+
+
+def test_hard_answers_from_the_book_and_keeps_searches():
+    book = load_default_book()
+    assert book is not None and len(book.openings) > 0
+    empty = Board(15, 5)
+    assert hard_move(empty, "X", Solver(), book=book) == book.lookup(empty, "X")
+
+    board = Board(4)
+    for cell, player in ((0, "X"), (5, "O"), (10, "X")):
+        board.play(cell, player)
+    fresh = MoveBook()
+    move = hard_move(board, "O", Solver(), searcher=AlphaBetaSearcher(None, max_depth=2), book=fresh)
+    assert fresh.lookup(board, "O") == move
@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import cli
+import engine
+from engine import GameEngine
+
+
+def test_render_text_numbers_rows_and_columns():
+    board = GameEngine().board
+    board.play(4, "X")
+    board.play(0, "O")
+    assert cli.render_text(board) == "  1 2 3\n1 O . .\n2 . X .\n3 . . ."
+
+
+@pytest.mark.parametrize("text, cell", [("2 3", 5), ("2,3", 5), ("9", 8), ("1", 0),
+                                        ("4 1", None), ("10", None), ("x", None), ("", None)])
+def test_parse_move(text, cell):
+    assert cli.parse_move(text, 3) == cell
+
+
+def test_play_against_the_ai_from_scripted_input():
+    moves = iter(["nonsense", "2 2", "2 2", "1 1", "3 3", "1 3", "3 1", "2 1", "2 3", "1 2", "3 2"])
+    output = []
+    engine = GameEngine()
+    winner = cli.play(engine, "Hard", read=lambda prompt: next(moves), write=output.append)
+    assert winner != "X"
+    assert output.count("Enter a free cell as row and column, e.g. 2 3.") >= 2
+    assert output[-1] in ("Player O wins!", "It's a tie!")
+
+
+def test_end_of_input_stops_the_game():
+    def read(prompt):
+        raise EOFError
+    assert cli.play(GameEngine(), "Easy", read=read, write=lambda text: None) is None
+
+
+def test_watch_and_replay_errors(capsys):
+    assert cli.main(["--watch", "Hard:Intermediate", "--games", "3"]) == 0
+    assert "(3 games)" in capsys.readouterr().out
+    with pytest.raises(SystemExit) as error:
+        cli.main(["--replay", "/nonexistent/games.ttr"])
+    assert error.value.code == 2
+    assert "cannot replay /nonexistent/games.ttr" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        cli.main(["--watch", "Hard:Grandmaster"])
+
+
+def test_engine_opens_the_table_on_first_use(monkeypatch):
+    opened = []
+    monkeypatch.setattr(engine, "load_default_table", lambda: opened.append(1) or None)
+    game = GameEngine()
+    assert opened == []
+    game.choose_move("Hard")
+    game.choose_move("Hard")
+    assert opened == [1]
+
+
+def test_cli_does_not_import_tkinter():
+    code = "import sys, cli; sys.exit('tkinter' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(cli.__file__)).returncode == 0
@@ -0,0 +1,140 @@
+import random
+import threading
+
+import pytest
+
+from engine import DIFFICULTIES, GameEngine
+from solver import Solver
+
+
+def play(engine, cells):
+    for cell in cells:
+        engine.make_move(cell)
+
+
+def test_moves_alternate_and_illegal_moves_are_refused():
+    engine = GameEngine()
+    engine.make_move(4)
+    assert engine.board.get(4) == "X" and engine.current_player == "O"
+    assert not engine.is_valid_move(4)
+    assert not engine.is_valid_move(-1) and not engine.is_valid_move(9)
+    with pytest.raises(ValueError):
+        engine.make_move(4)
+    engine.make_move(0)
+    assert engine.board.get(0) == "O" and engine.current_player == "X"
+
+
+def test_detects_a_win_and_stops_the_game():
+    engine = GameEngine()
+    play(engine, [0, 3, 1, 4, 2])
+    assert engine.game_over and engine.winner == "X" and not engine.is_tie
+    assert list(engine.winning_line) == [0, 1, 2]
+    assert not engine.is_valid_move(5)
+    assert engine.ai_move("Hard") is None
+
+
+def test_detects_a_tie():
+    engine = GameEngine()
+    play(engine, [0, 1, 2, 4, 3, 5, 7, 6, 8])
+    assert engine.game_over and engine.is_tie and engine.winner is None and engine.winning_line is None
+
+
+def test_larger_boards_use_the_win_length():
+    engine = GameEngine(size=5, win_length=4)
+    play(engine, [0, 5, 1, 6, 2, 7])
+    assert not engine.game_over
+    engine.make_move(3)
+    assert engine.winner == "X"
+
+
+def test_reset_starts_over_and_can_change_the_board():
+    engine = GameEngine()
+    play(engine, [0, 3, 1, 4, 2])
+    engine.reset()
+    assert (engine.board.move_count(), engine.current_player, engine.game_over, engine.winner) == (0, "X", False, None)
+    assert engine.moves == [] and engine.move_us == []
+    engine.reset(size=4)
+    assert (engine.board.size, engine.board.win_length) == (4, 4)
+    engine.reset(size=5, win_length=3)
+    assert (engine.board.size, engine.board.win_length) == (5, 3)
+    engine.reset()
+    assert engine.board.size == 5
+
+
+def test_records_moves_and_their_times():
+    engine = GameEngine()
+    play(engine, [4, 0, 8])
+    assert engine.moves == [4, 0, 8]
+    assert len(engine.move_us) == 3 and all(us >= 0 for us in engine.move_us)
+
+
+def test_a_seed_replays_the_same_game():
+    def game(seed):
+        engine = GameEngine()
+        engine.reset(seed=seed)
+        while not engine.game_over:
+            engine.ai_move("Easy")
+        return engine.seed, engine.moves
+
+    assert game(7) == game(7)
+    assert game(7)[0] == 7
+    assert any(game(7)[1] != game(seed)[1] for seed in range(8, 12))
+
+
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+def test_every_difficulty_plays_a_legal_move(difficulty):
+    engine = GameEngine(rng=random.Random(0), time_budget=0.05, mcts_playouts=200)
+    play(engine, [4])
+    move = engine.choose_move(difficulty)
+    assert engine.is_valid_move(move)
+    assert engine.last_stats.difficulty == difficulty
+    assert engine.board.move_count() == 1
+
+
+def test_every_difficulty_takes_a_win():
+    for difficulty in ("Intermediate", "Hard", "MCTS", "Adaptive"):
+        engine = GameEngine(rng=random.Random(0), time_budget=0.05, strength=1.0)
+        play(engine, [0, 3, 1, 4])
+        assert engine.choose_move(difficulty) == 2, difficulty
+
+
+def test_hard_plays_perfectly_from_any_board():
+    engine = GameEngine(rng=random.Random(0))
+    solver = Solver()
+    play(engine, [0, 8])
+    # X wins from opposite corners, and only a perfect move keeps the win.
+    assert solver.score(engine.board, "X") > 0
+    engine.ai_move("Hard")
+    assert solver.score(engine.board, "O") < 0
+
+
+def test_choose_move_can_search_another_board_for_another_player():
+    engine = GameEngine()
+    board = engine.board.copy()
+    board.play(0, "O")
+    board.play(1, "O")
+    assert engine.choose_move("Intermediate", "O", board) == 2
+    assert engine.board.move_count() == 0
+
+
+def test_rejects_unknown_difficulties():
+    with pytest.raises(ValueError):
+        GameEngine().choose_move("Impossible")
+
+
+def test_stats_hooks_see_every_move():
+    engine = GameEngine(size=4, time_budget=0.05)
+    seen = []
+    engine.stats_hooks.append(seen.append)
+    engine.ai_move("Hard")
+    engine.ai_move("Easy")
+    assert [stats.difficulty for stats in seen] == ["Hard", "Easy"]
+    assert seen[0].nodes > 0 and seen[0] is not engine.last_stats
+
+
+def test_a_cancelled_search_still_answers():
+    engine = GameEngine(size=5, win_length=4, time_budget=10.0)
+    cancel = threading.Event()
+    cancel.set()
+    move = engine.choose_move("Hard", cancel=cancel)
+    assert engine.is_valid_move(move)
@@ -0,0 +1,76 @@
+import asyncio
+import random
+import threading
+
+import pytest
+
+from board import Board
+from mcts import MCTSSearcher
+from server import GameServer, Match, Session
+
+
+def board_of(size, win_length, marks):
+    board = Board(size, win_length)
+    for cell, player in marks.items():
+        board.play(cell, player)
+    return board
+
+
+def test_needs_a_budget():
+    with pytest.raises(ValueError):
+        MCTSSearcher(playouts=None, time_budget=None)
+
+
+def test_takes_a_win_and_blocks_a_threat():
+    searcher = MCTSSearcher(playouts=2000, rng=random.Random(0))
+    assert searcher.best_move(board_of(3, 3, {0: "X", 1: "X", 3: "O", 4: "O"}), "X") == 2
+    assert searcher.best_move(board_of(3, 3, {0: "X", 1: "X", 4: "O"}), "O") == 2
+
+
+def test_finished_boards_have_no_move():
+    searcher = MCTSSearcher(playouts=10)
+    assert searcher.best_move(Board.from_cells(list("XOXXOOOXX")), "X") is None
+    assert searcher.best_move(board_of(3, 3, {0: "X", 1: "X", 2: "X", 3: "O", 4: "O"}), "O") is None
+
+
+def test_playout_budget_and_cancel():
+    searcher = MCTSSearcher(playouts=300, rng=random.Random(1))
+    board = Board(5, 4)
+    assert board.is_empty(searcher.best_move(board, "X"))
+    assert searcher.playouts == 300
+    cancel = threading.Event()
+    cancel.set()
+    assert board.is_empty(searcher.best_move(Board(7, 5), "X", cancel))
+    assert searcher.playouts == 0
+
+
+def test_tree_is_reused_until_forgotten():
+    searcher = MCTSSearcher(playouts=500, rng=random.Random(2))
+    board = Board(4)
+    move = searcher.best_move(board, "X")
+    board.play(move, "X")
+    board.play(next(cell for cell in board.empty_cells()), "O")
+    searcher.best_move(board, "X")
+    assert searcher.reused > 0
+    searcher.forget()
+    searcher.best_move(board, "X")
+    assert searcher.reused == 0
+
+
+def test_server_matches_do_not_keep_the_tree():
+    class Writer:
+        def write(self, data):
+            pass
+
+    async def scenario():
+        server = GameServer(time_budget=0.05)
+        session = Session(Writer())
+        session.mark = "X"
+        match = Match(server.new_engine(3, 3), {"X": session, "O": None}, "MCTS")
+        match.engine.make_move(4)
+        await server.ai_turn(match)
+        return match
+
+    match = asyncio.run(scenario())
+    assert match.engine.board.move_count() == 2
+    assert match.engine.mcts._root is None
@@ -0,0 +1,170 @@
+import http.client
+import json
+import random
+import socket
+import threading
+
+import pytest
+
+from board import Board, other_player
+from moveclient import MoveClient, board_text, random_positions
+from moveservice import MoveService, parse_position, serve_in_thread
+from position import Position
+from solver import Solver
+
+
+@pytest.fixture
+def service():
+    service = MoveService(time_budget=0.05)
+    port, stop = serve_in_thread(service)
+    service.port = port
+    yield service
+    stop()
+
+
+def post(connection, payload):
+    connection.request("POST", "/move", json.dumps(payload), {"Content-Type": "application/json"})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def sign(score):
+    return (score > 0) - (score < 0)
+
+
+def test_parses_boards_and_rejects_bad_ones():
+    position = parse_position({"board": "x...o...."})
+    assert position is Position(3, 3, 1, 16)
+    assert parse_position({"board": "." * 16, "win_length": 3}).win_length == 3
+    for data in ({"board": 9}, {"board": "X" * 8}, {"board": "...." * 4, "win_length": 5},
+                 {"board": "XX......."}, {"board": "Z........"}, {"board": "XXXOO...."},
+                 {"board": "XOXXOOOXX"}):
+        with pytest.raises(ValueError):
+            parse_position(data)
+
+
+def test_hard_moves_are_perfect(service):
+    solver = Solver()
+    with MoveClient(port=service.port, fallback=False) as client:
+        for board in random_positions(40, 3, 3, random.Random(0)):
+            player = "X" if board.x.bit_count() == board.o.bit_count() else "O"
+            if board.has_won(other_player(player)):
+                continue
+            expected = sign(solver.score(board, player))
+            cell = client.best_move(board)
+            board.play(cell, player)
+            assert sign(-solver.score(board, other_player(player))) == expected
+    assert client.fallbacks == 0
+
+
+def test_symmetric_positions_share_the_cache(service):
+    with MoveClient(port=service.port, fallback=False) as client:
+        first = client.best_move(Position(3, 3, 1 << 0, 1 << 4))
+        # The same position mirrored left to right: the answer is mirrored too.
+        mirrored = client.best_move(Position(3, 3, 1 << 2, 1 << 4))
+    assert mirrored == first // 3 * 3 + 2 - first % 3
+    stats = service.stats()
+    assert (stats["cache_hits"], stats["batched"]) == (1, 1)
+
+
+def test_answers_other_difficulties_and_larger_boards(service):
+    with MoveClient(port=service.port, fallback=False) as client:
+        board = Board(5, 4)
+        for difficulty in ("Easy", "Intermediate", "Hard", "MCTS", "Adaptive"):
+            assert board.is_empty(client.best_move(board, difficulty))
+
+
+def test_rejects_bad_requests_and_keeps_the_connection(service):
+    connection = http.client.HTTPConnection("127.0.0.1", service.port, timeout=5)
+    assert post(connection, {"board": "XX......."})[0] == 400
+    assert post(connection, ["X........"])[0] == 400
+    assert post(connection, {"board": "X........", "difficulty": "Expert"})[0] == 400
+    connection.request("GET", "/move")
+    response = connection.getresponse()
+    assert response.status == 405 and "error" in json.loads(response.read())
+    status, payload = post(connection, {"board": "X........"})
+    assert status == 200 and payload["row"] * 3 + payload["col"] == payload["cell"]
+    connection.request("GET", "/nowhere")
+    response = connection.getresponse()
+    assert response.status == 404 and json.loads(response.read())["error"]
+    connection.close()
+
+    with MoveClient(port=service.port) as client, pytest.raises(ValueError):
+        client.best_move(Position(3, 3, 0b11, 0))
+
+
+def test_a_failed_search_answers_500_and_the_client_plays_locally(service, monkeypatch):
+    def fail(batch):
+        raise RuntimeError("search crashed")
+
+    monkeypatch.setattr(service, "_solve", fail)
+    connection = http.client.HTTPConnection("127.0.0.1", service.port, timeout=5)
+    assert post(connection, {"board": "X...O...."}) == (500, {"error": "RuntimeError: search crashed"})
+
+    with MoveClient(port=service.port) as client:
+        board = Board(3, 3, 1, 16)
+        assert board.is_empty(client.best_move(board))
+        assert client.fallbacks == 1
+    with MoveClient(port=service.port, fallback=False) as client, pytest.raises(RuntimeError):
+        client.best_move(board)
+
+    monkeypatch.undo()
+    assert post(connection, {"board": "X...O...."})[0] == 200
+    connection.close()
+
+
+def test_a_failed_position_does_not_fail_its_batch(monkeypatch):
+    service = MoveService(time_budget=0.05, batch_window=0.2)
+    bad = Position(3, 3, 1, 16).canonical()[0]
+    engine = service._engine
+
+    def failing_engine(position):
+        if position is bad:
+            raise RuntimeError("search crashed")
+        return engine(position)
+
+    monkeypatch.setattr(service, "_engine", failing_engine)
+    port, stop = serve_in_thread(service)
+    results = {}
+
+    def ask(name, board):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        results[name] = post(connection, {"board": board})
+        connection.close()
+
+    threads = [threading.Thread(target=ask, args=("bad", "X...O....")),
+               threading.Thread(target=ask, args=("good", "....X...."))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stop()
+    assert service.stats()["batches"] == 1
+    assert results["bad"] == (500, {"error": "RuntimeError: search crashed"})
+    assert results["good"][0] == 200
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5"])
+def test_rejects_bad_content_lengths(service, length):
+    with socket.create_connection(("127.0.0.1", service.port), timeout=5) as client:
+        client.sendall(b"POST /move HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n")
+        response = client.makefile("rb").read()
+    assert response.startswith(b"HTTP/1.1 400 ")
+    assert b"Content-Length" in response
+
+
+def test_falls_back_when_the_service_is_down():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    with MoveClient(port=port, timeout=0.5, time_budget=0.05) as client:
+        board = Board(3, 3, 0b11, 0b11000)
+        assert client.best_move(board) == 2
+        assert (client.requests, client.fallbacks) == (1, 1)
+    with MoveClient(port=port, timeout=0.5, fallback=False) as client, pytest.raises(OSError):
+        client.best_move(board)
+
+
+def test_board_text():
+    assert board_text(Board(3, 3, 1, 16)) == "X...O...."
+    assert board_text(Position(3, 3, 1, 16)) == "X...O...."
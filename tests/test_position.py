@@ -0,0 +1,102 @@
+import gc
+import pickle
+
+import pytest
+
+from board import Board, get_geometry
+from position import Position, _interned
+
+
+def position_of(cells, win_length=None):
+    """Builds a 3x3 position from a string of X, O and . per cell."""
+    x = sum(1 << i for i, cell in enumerate(cells) if cell == "X")
+    o = sum(1 << i for i, cell in enumerate(cells) if cell == "O")
+    size = round(len(cells) ** 0.5)
+    return Position(size, win_length, x, o)
+
+
+def test_equal_positions_are_the_same_object():
+    position = position_of("X...O....")
+    assert position_of("X...O....") is position
+    assert Position(3, None, 1, 16) is Position(3, 3, 1, 16) is position
+    assert Position.from_board(position.to_board()) is position
+    assert position_of("X...O....", win_length=2) is not position
+
+
+def test_unused_positions_are_freed():
+    position = Position(4, 3, 1, 2)
+    code = position.code
+    del position
+    gc.collect()
+    assert code not in _interned.get(get_geometry(4, 3), {})
+
+
+def test_is_immutable_and_hashable():
+    position = position_of("X........")
+    with pytest.raises(AttributeError):
+        position.code = 0
+    with pytest.raises(AttributeError):
+        del position.code
+    with pytest.raises(AttributeError):
+        position.extra = 1
+    assert {position: 1}[position_of("X........")] == 1
+    assert position != position_of(".X.......")
+    assert position != "X........"
+
+
+def test_rejects_overlapping_or_off_board_marks():
+    with pytest.raises(ValueError):
+        Position(3, None, 1, 1)
+    with pytest.raises(ValueError):
+        Position(3, None, 1 << 9, 0)
+
+
+def test_reads_like_a_board():
+    position = position_of("XO..X....")
+    assert [position.get(i) for i in range(3)] == ["X", "O", ""]
+    assert position.move_count() == 3
+    assert position.player == "O"
+    assert position.empty_cells() == [2, 3, 5, 6, 7, 8]
+    assert repr(position) == "Position('XO..X....')"
+    board = position.to_board()
+    assert isinstance(board, Board) and (board.x, board.o) == (position.x, position.o)
+
+
+def test_play_returns_a_new_position():
+    empty = Position()
+    after = empty.play(4).play(0)
+    assert after is position_of("O...X....")
+    assert empty.move_count() == 0
+    with pytest.raises(ValueError):
+        after.play(4)
+    with pytest.raises(ValueError):
+        after.play(9)
+
+
+def test_symmetric_positions_share_a_canonical_form():
+    corners = [position_of(cells) for cells in ("X........", "..X......", "......X..", "........X")]
+    canonical = {position.canonical()[0] for position in corners}
+    assert len(canonical) == 1
+    representative = canonical.pop()
+    assert representative.canonical() == (representative, 0)
+
+
+def test_symmetry_maps_moves_into_the_canonical_position():
+    position = position_of("..X.O....")
+    canonical, symmetry = position.canonical()
+    perm = position.geometry.symmetries[symmetry]
+    for move in position.empty_cells():
+        assert position.play(move).canonical()[0] is canonical.play(perm[move]).canonical()[0]
+
+
+def test_key_round_trips():
+    for position in (Position(), position_of("X........"), position_of("XO.X....."), Position(4, 3, 0b11, 0b1100)):
+        size, win_length, own, opp = position.key()
+        assert (size, win_length) == (position.size, position.win_length)
+        assert own.bit_count() <= opp.bit_count()
+        assert Position.from_key(position.key()) is position
+
+
+def test_pickles_to_the_interned_instance():
+    position = position_of("XO.X..O..")
+    assert pickle.loads(pickle.dumps(position)) is position
@@ -0,0 +1,110 @@
+import sqlite3
+import threading
+
+import pytest
+
+from ratings import DEFAULT_RATING, K_FACTOR, PlayerStats, Standing, expected_score
+
+
+@pytest.fixture
+def stats(tmp_path):
+    stats = PlayerStats(str(tmp_path / "players.db"), batch_interval=0.01)
+    yield stats
+    stats.close()
+
+
+def test_expected_scores_are_symmetric():
+    assert expected_score(1500, 1500) == 0.5
+    assert expected_score(1600, 1400) + expected_score(1400, 1600) == pytest.approx(1.0)
+    assert expected_score(1900, 1500) == pytest.approx(10 / 11)
+
+
+def test_a_win_moves_ratings_by_half_the_k_factor(stats):
+    rating_x, rating_o = stats.record("ann", "bob", "X")
+    assert rating_x == DEFAULT_RATING + K_FACTOR / 2
+    assert rating_o == DEFAULT_RATING - K_FACTOR / 2
+    assert stats.player("ann") == Standing("ann", rating_x, 1, 0, 0)
+    assert stats.player("bob") == Standing("bob", rating_o, 0, 0, 1)
+
+
+def test_draws_between_equals_change_nothing(stats):
+    assert stats.record("ann", "bob", None) == (DEFAULT_RATING, DEFAULT_RATING)
+    assert stats.player("ann").draws == stats.player("bob").draws == 1
+
+
+def test_keeps_results_per_opponent(stats):
+    stats.record("ann", "Hard", "O")
+    stats.record("Hard", "ann", None)
+    stats.record("ann", "bob", "X")
+    assert stats.matchups("ann") == {"Hard": (0, 1, 1), "bob": (1, 0, 0)}
+    assert stats.matchups("Hard") == {"ann": (1, 1, 0)}
+    assert stats.player("nobody") is None
+
+
+def test_rejects_a_game_against_oneself(stats):
+    with pytest.raises(ValueError):
+        stats.record("ann", "ann", "X")
+
+
+def test_close_writes_everything_and_reopening_restores_it(tmp_path):
+    path = str(tmp_path / "players.db")
+    with PlayerStats(path, batch_interval=10.0) as stats:
+        for _ in range(50):
+            stats.record("ann", "bob", "X")
+        stats.record("bob", "cat", None)
+    assert stats.error is None
+    assert (stats.batches, stats.rows_written) == (1, 3 + 4)
+
+    with PlayerStats(path) as reopened:
+        assert reopened.player("ann") == stats.player("ann")
+        assert reopened.player("cat") == stats.player("cat")
+        assert reopened.matchups("bob") == {"ann": (0, 0, 50), "cat": (0, 1, 0)}
+
+
+def test_batches_results_recorded_between_writes(tmp_path):
+    with PlayerStats(str(tmp_path / "players.db"), batch_interval=0.2) as stats:
+        for n in range(100):
+            stats.record(f"player{n % 5}", f"player{(n + 1) % 5}", "X")
+    assert stats.batches == 1
+    assert stats.rows_written == 5 + 10
+
+
+def test_records_from_many_threads(stats):
+    def play(n):
+        for _ in range(200):
+            stats.record(f"a{n}", f"b{n}", None)
+
+    threads = [threading.Thread(target=play, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(stats.player(f"a{n}").draws == 200 for n in range(8))
+
+
+def test_leaderboard_is_cached_until_a_result_arrives(stats):
+    stats.record("ann", "bob", "X")
+    stats.record("ann", "cat", "X")
+    assert [standing.name for standing in stats.leaderboard()][0] == "ann"
+    assert stats.leaderboard(limit=1) == stats.leaderboard()[:1]
+    assert stats.leaderboard_builds == 1
+
+    stats.record("cat", "ann", "X")
+    stats.leaderboard()
+    assert stats.leaderboard_builds == 2
+    stats.record("cat", "bob", "X")
+    stats.leaderboard(max_age=60.0)
+    assert stats.leaderboard_builds == 2
+
+
+def test_a_write_error_keeps_the_statistics_in_memory(tmp_path):
+    path = str(tmp_path / "players.db")
+    stats = PlayerStats(path, batch_interval=0.01)
+    blocker = sqlite3.connect(path)
+    blocker.execute("DROP TABLE matchups")
+    blocker.commit()
+    blocker.close()
+    stats.record("ann", "bob", "X")
+    stats.close()
+    assert isinstance(stats.error, sqlite3.Error)
+    assert stats.player("ann").wins == 1
@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from board import Board
+from records import MAX_MOVE_US, GameRecord, RecordReader, RecordWriter, export_jsonl, import_jsonl
+
+
+def random_record(rng, size=3, win_length=3):
+    board = Board(size, win_length)
+    player, winner, moves = "X", None, []
+    while not board.is_full():
+        cell = rng.choice(board.empty_cells())
+        board.play(cell, player)
+        moves.append(cell)
+        if board.has_won(player):
+            winner = player
+            break
+        player = "O" if player == "X" else "X"
+    return GameRecord(size, win_length, rng.choice(["Hard", "MCTS"]), "Adaptive", winner, rng.getrandbits(63),
+                      1.5e9, moves, [rng.randrange(10 ** 6) for _ in moves])
+
+
+def write_log(path, records):
+    with RecordWriter(path) as log:
+        for record in records:
+            log.write(record)
+    assert log.error is None
+
+
+def test_records_round_trip(tmp_path):
+    rng = random.Random(0)
+    records = [random_record(rng) for _ in range(100)] + [random_record(rng, 7, 5)]
+    path = tmp_path / "games.ttr"
+    write_log(path, records)
+    with RecordReader(path) as reader:
+        assert list(reader.records()) == records
+
+
+def test_appending_keeps_earlier_games(tmp_path):
+    rng = random.Random(1)
+    path = tmp_path / "games.ttr"
+    first, second = random_record(rng), random_record(rng)
+    write_log(path, [first])
+    write_log(path, [second])
+    with RecordReader(path) as reader:
+        assert list(reader.records()) == [first, second]
+
+
+def test_truncated_final_record_is_skipped(tmp_path):
+    rng = random.Random(2)
+    records = [random_record(rng) for _ in range(3)]
+    path = tmp_path / "games.ttr"
+    write_log(path, records)
+    path.write_bytes(path.read_bytes()[:-1])
+    with RecordReader(path) as reader:
+        assert list(reader.records()) == records[:2]
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"not a game log at all")
+    with pytest.raises(ValueError):
+        RecordReader(path)
+    with pytest.raises(ValueError):
+        RecordWriter(path)
+    path.write_bytes(b"TTT")
+    with pytest.raises(ValueError, match="too short"):
+        RecordReader(path)
+
+
+def test_views_read_moves_and_replay(tmp_path):
+    rng = random.Random(3)
+    records = [random_record(rng) for _ in range(20)]
+    path = tmp_path / "games.ttr"
+    write_log(path, records)
+    with RecordReader(path) as reader:
+        board = None
+        for view, record in zip(reader, records):
+            assert view.moves == bytes(record.moves)
+            for board in view.replay(board):
+                pass
+            assert board.move_count() == len(record.moves)
+            assert board.has_won(record.winner) if record.winner else not board.has_won("X")
+
+
+def test_kept_moves_do_not_stop_the_reader_closing(tmp_path):
+    path = tmp_path / "games.ttr"
+    write_log(path, [random_record(random.Random(5))])
+    with RecordReader(path) as reader:
+        kept = [view.moves for view in reader]
+    assert len(kept) == 1 and kept[0]
+
+
+def test_move_times_are_clamped():
+    record = GameRecord(3, 3, "Human", "Hard", None, moves=[4], move_us=[MAX_MOVE_US + 5])
+    assert record.pack().endswith(MAX_MOVE_US.to_bytes(4, "little"))
+
+
+def test_json_lines_round_trip(tmp_path):
+    rng = random.Random(4)
+    records = [random_record(rng) for _ in range(10)]
+    log, lines, copy = tmp_path / "games.ttr", tmp_path / "games.jsonl", tmp_path / "copy.ttr"
+    write_log(log, records)
+    assert export_jsonl(log, lines) == 10
+    assert import_jsonl(lines, copy) == 10
+    with RecordReader(copy) as reader:
+        assert list(reader.records()) == records
@@ -0,0 +1,60 @@
+import pytest
+
+tk = pytest.importorskip("tkinter")
+
+from render import ButtonBoard, CanvasBoard, CellState, StyleCache, _changed_fields
+
+EMPTY = CellState("", "#000000", "#ffffff", True)
+CROSS = CellState("X", "#ff0000", "#ffffff", False)
+
+
+class Widget:
+    """Records the options of every config call."""
+    def __init__(self):
+        self.calls = []
+
+    def config(self, **options):
+        self.calls.append(options)
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+def test_style_cache_only_applies_changes():
+    cache = StyleCache()
+    widget = Widget()
+    assert cache.configure(widget, bg="white", fg="black")
+    assert not cache.configure(widget, bg="white", fg="black")
+    assert cache.configure(widget, bg="black", fg="black")
+    assert widget.calls == [{"bg": "white", "fg": "black"}, {"bg": "black"}]
+    cache.forget(widget)
+    assert cache.configure(widget, bg="black")
+
+
+def test_changed_fields():
+    assert _changed_fields(EMPTY, None) == CellState._fields
+    assert _changed_fields(CROSS, EMPTY) == ["text", "color", "enabled"]
+    assert _changed_fields(EMPTY, EMPTY) == []
+
+
+@pytest.mark.parametrize("board_class", [ButtonBoard, CanvasBoard])
+def test_boards_redraw_only_changed_cells(root, board_class):
+    frame = tk.Frame(root)
+    if board_class is CanvasBoard:
+        board = CanvasBoard(frame, 3, lambda r, c: None, "#000000")
+    else:
+        board = ButtonBoard(frame, 3, lambda r, c: None)
+    states = [EMPTY] * 9
+    assert board.render(states) == 9
+    assert board.render(states) == 0
+    states[4] = CROSS
+    assert board.render(states) == 1
+    board.destroy()
@@ -0,0 +1,95 @@
+import random
+import threading
+
+from board import Board, get_geometry
+from search import AlphaBetaSearcher, ParallelSearcher, candidate_cells
+from solver import Solver
+
+
+def board_of(size, win_length, marks):
+    """Builds a board from {cell: player}."""
+    board = Board(size, win_length)
+    for cell, player in marks.items():
+        board.play(cell, player)
+    return board
+
+
+def test_candidates_are_every_empty_cell_on_small_boards():
+    geometry = get_geometry(5, 4)
+    assert candidate_cells(geometry, 0b11) == list(range(2, 25))
+
+
+def test_candidates_stay_near_the_marks_on_large_boards():
+    geometry = get_geometry(15, 5)
+    assert candidate_cells(geometry, 0) == [geometry.center]
+    cells = candidate_cells(geometry, 1 << 0)
+    assert 0 not in cells
+    assert set(cells) == {r * 15 + c for r in range(3) for c in range(3)} - {0}
+
+
+def test_takes_a_win_and_blocks_a_threat():
+    searcher = AlphaBetaSearcher(time_budget=None, max_depth=3)
+    win = board_of(5, 4, {0: "X", 1: "X", 2: "X", 20: "O", 21: "O", 22: "O"})
+    assert searcher.best_move(win, "X") == 3
+    block = board_of(5, 4, {6: "X", 7: "X", 8: "X", 20: "O", 24: "O"})
+    assert searcher.best_move(block, "O") in (5, 9)
+
+
+def test_full_depth_search_plays_perfectly_on_3x3():
+    rng = random.Random(0)
+    solver = Solver()
+    searcher = AlphaBetaSearcher(time_budget=None)
+    for _ in range(30):
+        board = Board()
+        player = "X"
+        for _ in range(rng.randrange(6)):
+            board.play(rng.choice(board.empty_cells()), player)
+            player = "O" if player == "X" else "X"
+        if board.has_won("X") or board.has_won("O"):
+            continue
+        move = searcher.best_move(board, player)
+        best = solver.score(board, player)
+        board.play(move, player)
+        after = -solver.score(board, "O" if player == "X" else "X")
+        # Same outcome (win, draw or loss), though maybe not the fastest win.
+        assert (after > 0) - (after < 0) == (best > 0) - (best < 0)
+
+
+def test_cancelled_search_still_answers():
+    cancel = threading.Event()
+    cancel.set()
+    board = board_of(15, 5, {112: "X"})
+    searcher = AlphaBetaSearcher(time_budget=None)
+    move = searcher.best_move(board, "O", cancel)
+    assert board.is_empty(move)
+
+
+def test_full_board_has_no_move():
+    board = Board.from_cells(list("XOXXOOOXX"))
+    assert AlphaBetaSearcher().best_move(board, "X") is None
+
+
+def test_parallel_search_finds_the_serial_score():
+    board = board_of(5, 4, {12: "X", 6: "O", 8: "X"})
+    serial = AlphaBetaSearcher(time_budget=None, max_depth=3)
+    parallel = ParallelSearcher(time_budget=None, max_depth=3, processes=2)
+    try:
+        move = parallel.best_move(board, "O")
+        assert parallel.depth_reached == 3
+    finally:
+        parallel.close()
+    serial_move = serial.best_move(board, "O")
+
+    def score(cell):
+        board.play(cell, "O")
+        value = -serial._negamax(board, "X", "O", 2, -10 ** 7, 10 ** 7, 1)
+        board.undo(cell)
+        return value
+    serial._history = [0] * board.cells
+    assert score(move) == score(serial_move)
+
+
+def test_parallel_search_with_one_process_runs_serially():
+    searcher = ParallelSearcher(time_budget=None, max_depth=2, processes=1)
+    assert searcher.best_move(board_of(4, 4, {5: "X"}), "O") is not None
+    assert searcher._pool is None
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import random
+
+from board import Board
+from server import GameServer, Session
+
+
+class Client:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, message):
+        line = message if isinstance(message, str) else json.dumps(message)
+        self.writer.write(line.encode() + b"\n")
+        await self.writer.drain()
+
+    async def receive(self):
+        return json.loads(await asyncio.wait_for(self.reader.readline(), 5))
+
+
+def run(scenario):
+    """Runs `await scenario(connect)` against a server on a free port; returns its result."""
+    async def main():
+        game_server = GameServer(time_budget=0.05)
+        server = await game_server.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        writers = []
+
+        async def connect():
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writers.append(writer)
+            return Client(reader, writer)
+
+        try:
+            return await scenario(connect)
+        finally:
+            for writer in writers:
+                writer.close()
+            # Let the handlers see their connections close before the loop stops.
+            while game_server.sessions:
+                await asyncio.sleep(0.01)
+            server.close()
+            await server.wait_closed()
+    return asyncio.run(main())
+
+
+class FakeWriter:
+    def __init__(self):
+        self.messages = []
+        self.dead = False
+        self.closed = False
+
+    def write(self, data):
+        self.messages.append(json.loads(data))
+
+    async def drain(self):
+        if self.dead:
+            raise ConnectionResetError
+
+    def close(self):
+        self.closed = True
+
+
+def test_hard_never_loses():
+    async def scenario(connect):
+        rng = random.Random(0)
+        client = await connect()
+        for _ in range(5):
+            await client.send({"type": "play", "opponent": "Hard"})
+            assert (await client.receive())["you"] == "X"
+            board = Board()
+            while True:
+                cell = rng.choice(board.empty_cells())
+                await client.send({"type": "move", "cell": cell})
+                assert await client.receive() == {"type": "move", "player": "X", "cell": cell}
+                board.play(cell, "X")
+                if board.has_won("X") or board.is_full():
+                    break
+                reply = await client.receive()
+                board.play(reply["cell"], "O")
+                if board.has_won("O") or board.is_full():
+                    break
+            end = await client.receive()
+            assert end["type"] == "end" and end["winner"] != "X"
+    run(scenario)
+
+
+def test_ai_opens_when_the_client_plays_o():
+    async def scenario(connect):
+        client = await connect()
+        await client.send({"type": "play", "opponent": "Intermediate", "mark": "O"})
+        assert (await client.receive())["you"] == "O"
+        move = await client.receive()
+        assert move["type"] == "move" and move["player"] == "X"
+    run(scenario)
+
+
+def test_bad_messages_get_errors_and_keep_the_connection():
+    async def scenario(connect):
+        client = await connect()
+        for line in ("[]", "1", '"x"', "not json", '{"type": "dance"}'):
+            await client.send(line)
+            assert (await client.receive())["type"] == "error"
+        await client.send({"type": "move", "cell": 0})
+        assert (await client.receive())["message"] == "Not in a game"
+        await client.send({"type": "play", "opponent": "Easy", "size": 2, "win_length": 3})
+        assert (await client.receive())["type"] == "error"
+        await client.send({"type": "play", "opponent": "Easy"})
+        assert (await client.receive())["type"] == "start"
+    run(scenario)
+
+
+def test_matchmaking_pairs_players_and_forfeits_on_leave():
+    async def scenario(connect):
+        first, second = await connect(), await connect()
+        await first.send({"type": "play", "opponent": "human"})
+        assert (await first.receive())["type"] == "waiting"
+        await second.send({"type": "play", "opponent": "human"})
+        assert (await second.receive())["you"] == "O"
+        assert (await first.receive())["you"] == "X"
+
+        await second.send({"type": "move", "cell": 4})
+        assert (await second.receive())["message"] == "Not your turn"
+        await first.send({"type": "move", "cell": 4})
+        for client in (first, second):
+            assert await client.receive() == {"type": "move", "player": "X", "cell": 4}
+
+        await first.send({"type": "leave"})
+        assert await second.receive() == {"type": "end", "winner": "O", "reason": "opponent left"}
+    run(scenario)
+
+
+def test_dead_opponent_forfeits_without_disconnecting_the_mover():
+    async def scenario():
+        server = GameServer(time_budget=0.05)
+        mover, opponent = Session(FakeWriter()), Session(FakeWriter())
+        await server.dispatch(mover, {"type": "play", "opponent": "human"})
+        await server.dispatch(opponent, {"type": "play", "opponent": "human"})
+        opponent.writer.dead = True
+        await server.dispatch(mover, {"type": "move", "cell": 0})
+        return mover, opponent
+
+    mover, opponent = asyncio.run(scenario())
+    assert mover.writer.messages[-1] == {"type": "end", "winner": "X", "reason": "opponent left"}
+    assert mover.match is None and opponent.writer.closed
@@ -0,0 +1,79 @@
+import random
+
+from board import Board
+from solver import SYMMETRIES, WIN_SCORE, Solver, TranspositionTable, canonical_key
+
+
+def board_of(cells):
+    return Board.from_cells(["" if cell == "." else cell for cell in cells])
+
+
+def random_position(rng):
+    board = Board()
+    player = "X"
+    for _ in range(rng.randrange(9)):
+        board.play(rng.choice(board.empty_cells()), player)
+        if board.has_won(player):
+            break
+        player = "O" if player == "X" else "X"
+    return board
+
+
+def test_empty_board_is_a_draw():
+    assert Solver().score(Board(), "X") == 0
+
+
+def test_takes_the_win_rather_than_blocking():
+    board = board_of("XX.OO....")
+    solver = Solver()
+    assert solver.best_move(board, "X") == 2
+    # Winning on the next ply is worth one point less than a win already on the board.
+    assert solver.score(board, "X") == WIN_SCORE - 1
+
+
+def test_blocks_a_threat():
+    assert Solver().best_move(board_of("XX.O....."), "O") == 2
+
+
+def test_full_board_has_no_move():
+    assert Solver().best_move(board_of("XOXXOOOXX"), "X") is None
+
+
+def test_best_move_leaves_the_board_unchanged():
+    board = board_of("X.O.X....")
+    before = board.copy()
+    Solver().best_move(board, "O")
+    assert board == before
+
+
+def test_canonical_key_is_the_same_for_every_symmetry():
+    rng = random.Random(0)
+    for _ in range(200):
+        board = random_position(rng)
+        keys = set()
+        for perm in SYMMETRIES:
+            image = Board(x=sum(1 << perm[i] for i in range(9) if board.x >> i & 1),
+                          o=sum(1 << perm[i] for i in range(9) if board.o >> i & 1))
+            keys.add(canonical_key(image, "X"))
+        assert len(keys) == 1
+
+
+def test_symmetric_positions_share_table_entries():
+    solver = Solver()
+    solver.score(board_of("X........"), "O")
+    entries = len(solver.table)
+    solver.score(board_of("..X......"), "O")
+    assert len(solver.table) == entries
+    assert solver.table.hits > 0
+
+
+def test_transposition_table_evicts_least_recently_used():
+    table = TranspositionTable(maxsize=2)
+    table.put(1, 10)
+    table.put(2, 20)
+    assert table.get(1) == 10
+    table.put(3, 30)
+    assert 2 not in table and 1 in table and 3 in table
+    assert table.evictions == 1
+    assert table.get(2) is None
+    assert (table.hits, table.misses) == (1, 1)
@@ -0,0 +1,67 @@
+import pytest
+
+from engine import GameEngine
+from records import GameRecord, RecordWriter
+from spectator import SpectatorSession, Tally
+
+
+def play_out(session):
+    """Plays a session's games the way a view does; returns the winners and the moves of each game."""
+    engine = session.engine
+    games = []
+    while session.start_game():
+        while not engine.game_over:
+            move = session.recorded_move() if session.replaying else engine.choose_move(session.strategy)
+            if move is None or not engine.is_valid_move(move):
+                break
+            engine.make_move(move)
+            session.tally.frame()
+        games.append((session.finish_game(), list(engine.moves)))
+        if not session.replaying and len(games) == 10:
+            break
+    return games
+
+
+def test_tally_counts_results_and_frames():
+    tally = Tally(window=1.0)
+    for winner in ("X", None, "X"):
+        tally.record(winner)
+    assert tally.fps == 0.0
+    for n in range(11):
+        tally.frame(now=10 + n * 0.05)
+    assert tally.fps == pytest.approx(20.0)
+    tally.frame(now=100.0)
+    assert tally.fps == 0.0 and tally.frames == 12
+    assert tally.summary(fps=False) == "X 2  ·  O 0  ·  Tie 1  (3 games)"
+
+
+def test_hard_against_hard_always_ties():
+    session = SpectatorSession(GameEngine(), "Hard", "Hard")
+    games = play_out(session)
+    assert len(games) == 10 and session.tally.results[None] == 10
+
+
+def test_replay_plays_back_the_logged_games(tmp_path):
+    engine = GameEngine(size=4, win_length=3)
+    live = SpectatorSession(engine, "Intermediate", "Easy")
+    path = tmp_path / "games.ttr"
+    with RecordWriter(path) as log:
+        games = []
+        for winner, moves in play_out(live):
+            games.append((winner, moves))
+            log.write(GameRecord(4, 3, "Intermediate", "Easy", winner, moves=moves))
+
+    replay = SpectatorSession(GameEngine(), log_path=path)
+    assert replay.replaying
+    assert play_out(replay) == games
+    assert replay.tally.results == live.tally.results
+    assert replay.strategies == {"X": "Intermediate", "O": "Easy"}
+    assert engine.size == replay.engine.size == 4
+
+
+def test_replayed_forfeit_keeps_its_winner(tmp_path):
+    path = tmp_path / "games.ttr"
+    with RecordWriter(path) as log:
+        log.write(GameRecord(3, 3, "Human", "Hard", "O", moves=[0, 4]))
+    session = SpectatorSession(GameEngine(), log_path=path)
+    assert play_out(session) == [("O", [0, 4])]
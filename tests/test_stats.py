@@ -0,0 +1,109 @@
+import json
+import threading
+
+from stats import SearchStats, StatsRegistry
+
+
+def stats_of(difficulty, **values):
+    stats = SearchStats(difficulty)
+    for name, value in values.items():
+        setattr(stats, name, value)
+    return stats
+
+
+def test_records_describe_one_call():
+    stats = stats_of("MCTS", playouts=500, depth=4, elapsed_ns=250_000_000)
+    assert stats.playouts_per_second == 2000
+    assert stats.as_dict()["playouts"] == 500
+    assert stats.summary().startswith("MCTS: 500 playouts (2000/s), depth 4")
+    stats = stats_of("Hard", nodes=10, table_hits=1, table_misses=3)
+    assert stats.summary().startswith("Hard: 10 nodes, 0 cutoffs, 1/4 table hits")
+    assert SearchStats("Easy").playouts_per_second == 0.0
+
+
+def test_sums_counters_and_keeps_maxima_per_difficulty():
+    registry = StatsRegistry()
+    registry.record(stats_of("Hard", nodes=10, cutoffs=2, depth=5, elapsed_ns=100))
+    registry.record(stats_of("Hard", nodes=5, table_hits=1, depth=3, elapsed_ns=300))
+    registry.record(stats_of("Easy", nodes=1, elapsed_ns=7))
+    snapshot = registry.snapshot()
+    assert set(snapshot) == {"Hard", "Easy"}
+    hard = snapshot["Hard"]
+    assert (hard["moves"], hard["nodes"], hard["cutoffs"], hard["table_hits"]) == (2, 15, 2, 1)
+    assert (hard["elapsed_ns"], hard["max_elapsed_ns"], hard["max_depth"]) == (400, 300, 5)
+    assert snapshot["Easy"]["moves"] == 1
+
+    snapshot["Hard"]["moves"] = 99
+    assert registry.snapshot()["Hard"]["moves"] == 2
+
+
+def test_merges_other_registries():
+    worker = StatsRegistry()
+    worker.record(stats_of("Hard", nodes=4, depth=9, elapsed_ns=50))
+    registry = StatsRegistry()
+    registry.record(stats_of("Hard", nodes=1, depth=2, elapsed_ns=80))
+    registry.merge(worker.snapshot())
+    registry.merge(worker.snapshot())
+    hard = registry.snapshot()["Hard"]
+    assert (hard["moves"], hard["nodes"], hard["max_depth"], hard["max_elapsed_ns"]) == (3, 9, 9, 80)
+    registry.reset()
+    assert registry.snapshot() == {}
+
+
+def test_counts_every_record_from_many_threads():
+    registry = StatsRegistry()
+
+    def record():
+        for _ in range(1000):
+            registry.record(stats_of("Easy", nodes=1))
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert registry.snapshot()["Easy"]["nodes"] == 8000
+
+
+def test_exports_json():
+    registry = StatsRegistry()
+    registry.record(stats_of("Hard", nodes=3))
+    assert json.loads(registry.to_json())["Hard"]["nodes"] == 3
+
+
+def test_exports_prometheus_text():
+    registry = StatsRegistry()
+    registry.record(stats_of("MCTS", playouts=100, depth=6, elapsed_ns=2_000_000_000))
+    registry.record(stats_of("Hard", nodes=7, elapsed_ns=500_000_000))
+    text = registry.to_prometheus(prefix="ttt")
+    assert text.endswith("\n")
+    lines = text.splitlines()
+
+    metrics = [line.split()[2] for line in lines if line.startswith("# TYPE")]
+    assert len(metrics) == len(set(metrics)) == 10
+    types = {line.split()[2]: line.split()[3] for line in lines if line.startswith("# TYPE")}
+    assert types["ttt_nodes_total"] == "counter" and types["ttt_search_seconds_max"] == "gauge"
+    for line in lines:
+        if line.startswith("# HELP"):
+            assert line.split()[2] in types
+
+    samples = dict(line.rsplit(" ", 1) for line in lines if not line.startswith("#"))
+    assert float(samples['ttt_nodes_total{difficulty="Hard"}']) == 7
+    assert float(samples['ttt_moves_total{difficulty="MCTS"}']) == 1
+    assert float(samples['ttt_search_seconds_total{difficulty="Hard"}']) == 0.5
+    assert float(samples['ttt_search_depth_max{difficulty="MCTS"}']) == 6
+    assert float(samples['ttt_playouts_per_second{difficulty="MCTS"}']) == 50
+    # Difficulties without playouts have no playout rate.
+    assert 'ttt_playouts_per_second{difficulty="Hard"}' not in samples
+    # Every sample follows its metric's TYPE line.
+    current = None
+    for line in lines:
+        if line.startswith("# TYPE"):
+            current = line.split()[2]
+        elif not line.startswith("#"):
+            assert line.startswith(current + "{")
+
+
+def test_an_empty_registry_exports_only_metadata():
+    text = StatsRegistry().to_prometheus()
+    assert all(line.startswith("#") for line in text.splitlines())
@@ -0,0 +1,83 @@
+import shutil
+
+import pytest
+
+from board import Board
+from table import (DEFAULT_PATH, HEADER, NO_MOVE, PerfectPlayTable, load_default_table, position_index,
+                   reachable_positions, side_to_move, verify)
+
+
+def test_reachable_positions_are_every_legal_game_state():
+    boards = list(reachable_positions())
+    assert len(boards) == 5478
+    assert len({position_index(board) for board in boards}) == len(boards)
+
+
+def test_position_index_is_base_three():
+    board = Board()
+    board.play(0, "X")
+    board.play(1, "O")
+    assert position_index(board) == 1 + 2 * 3
+
+
+def test_side_to_move_assumes_x_opened():
+    board = Board()
+    assert side_to_move(board) == "X"
+    board.play(4, "X")
+    assert side_to_move(board) == "O"
+
+
+def test_shipped_table_matches_the_solver():
+    assert verify() == []
+
+
+def test_lookup_of_a_full_board_has_no_move():
+    table = load_default_table()
+    try:
+        board = Board.from_cells(list("XOXXOOOXX"))
+        assert table.lookup(board) == (None, 0)
+        assert table.best_move(Board()) is not None
+    finally:
+        table.close()
+
+
+def test_finished_games_have_no_move():
+    table = load_default_table()
+    try:
+        for board in reachable_positions():
+            finished = board.has_won("X") or board.has_won("O") or board.is_full()
+            assert (table.best_move(board) is None) == finished
+    finally:
+        table.close()
+
+
+def test_best_moves_agree_with_the_batch_legal_moves():
+    np = pytest.importorskip("numpy")
+    import batch
+
+    boards = np.array([[{"": 0, "X": 1, "O": 2}[mark] for mark in map(board.get, range(9))]
+                       for board in reachable_positions()], dtype=np.int8)
+    result = batch.evaluate(boards)
+    has_moves = result["legal_moves"].any(axis=1)
+    assert ((result["best_move"] >= 0) == has_moves).all()
+    rows = np.flatnonzero(has_moves)
+    assert result["legal_moves"][rows, result["best_move"][rows]].all()
+
+
+def test_corrupted_table_is_rejected(tmp_path):
+    path = tmp_path / "table.bin"
+    shutil.copy(DEFAULT_PATH, path)
+    with open(path, "r+b") as f:
+        f.seek(HEADER.size)
+        entry = f.read(1)
+        f.seek(HEADER.size)
+        f.write(bytes([entry[0] ^ NO_MOVE]))
+    with pytest.raises(ValueError, match="checksum"):
+        PerfectPlayTable(path)
+
+
+def test_truncated_table_is_rejected(tmp_path):
+    path = tmp_path / "table.bin"
+    path.write_bytes(open(DEFAULT_PATH, "rb").read()[:-1])
+    with pytest.raises(ValueError, match="size"):
+        PerfectPlayTable(path)
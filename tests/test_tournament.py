@@ -0,0 +1,84 @@
+import argparse
+import io
+import json
+
+import pytest
+
+from engine import DIFFICULTIES
+from records import RecordReader, RecordWriter
+from stats import StatsRegistry
+from tournament import game_seed, main, parse_pairing, percentile, run_tournament
+
+
+def test_seeds_are_repeatable_and_distinct():
+    assert game_seed(7, "Easy", "Hard", 3) == game_seed(7, "Easy", "Hard", 3)
+    seeds = {game_seed(seed, x, o, game)
+             for seed in (0, 1) for x in DIFFICULTIES for o in DIFFICULTIES for game in range(20)}
+    assert len(seeds) == 2 * len(DIFFICULTIES) ** 2 * 20
+    assert all(0 <= seed < 1 << 64 for seed in seeds)
+
+
+def test_large_game_numbers_stay_within_their_pairing():
+    game = 1 << 24
+    assert game_seed(0, "Easy", "Easy", game) != game_seed(0, "Easy", "Intermediate", 0)
+    assert game_seed(0, "Easy", "Easy", game) != game_seed(0, "Easy", "Easy", 0)
+    assert game_seed(1 << 32, "Easy", "Easy", 0) != game_seed(0, "Easy", "Easy", 0)
+
+
+def test_reports_rates_for_each_pairing():
+    pairings = [("Easy", "Easy"), ("Hard", "Hard"), ("Hard", "Easy")]
+    stats = StatsRegistry()
+    summary = run_tournament(pairings, 30, processes=1, seed=3, stats=stats)
+    assert summary["games"] == 90
+    rows = {(row["x"], row["o"]): row for row in summary["pairings"]}
+    assert set(rows) == set(pairings)
+    for row in rows.values():
+        assert row["x_win_rate"] + row["draw_rate"] + row["o_win_rate"] == pytest.approx(1.0)
+    assert rows["Hard", "Hard"]["draw_rate"] == 1.0
+    assert rows["Hard", "Easy"]["o_win_rate"] == 0.0
+    assert set(summary["latency_ns"]) == {"Easy", "Hard"}
+    assert summary["latency_ns"]["Easy"]["moves"] == stats.snapshot()["Easy"]["moves"]
+
+
+def test_the_same_seed_plays_the_same_games():
+    def games(seed):
+        output = io.StringIO()
+        run_tournament([("Easy", "Intermediate")], 300, processes=2, seed=seed, output=output)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        return sorted((record["seed"], record["moves"]) for record in records)
+
+    first = games(5)
+    assert len(first) == 300 and len({seed for seed, _ in first}) == 300
+    assert games(5) == first
+    assert games(6) != first
+
+
+def test_logs_every_game(tmp_path):
+    path = str(tmp_path / "games.ttr")
+    with RecordWriter(path) as log:
+        run_tournament([("Easy", "Easy")], 10, processes=1, log=log)
+    with RecordReader(path) as reader:
+        assert sum(1 for _ in reader) == 10
+
+
+def test_rejects_fewer_than_one_game(capsys):
+    with pytest.raises(ValueError):
+        run_tournament([("Easy", "Easy")], 0, processes=1)
+    with pytest.raises(SystemExit):
+        main(["--games", "0", "--pairing", "Easy:Easy"])
+    assert "--games must be at least 1" in capsys.readouterr().err
+
+
+def test_parses_pairings():
+    assert parse_pairing("Easy:Hard") == ("Easy", "Hard")
+    for text in ("Easy", "Easy:Expert", "Hard-Easy"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_pairing(text)
+
+
+def test_nearest_rank_percentiles():
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile(values, 1.0) == 100
+    assert percentile([], 0.5) == 0
@@ -1,7 +1,32 @@
+import sys
+import time
+
+# Taken before any other import, so the startup timings include them
+_LAUNCHED = time.perf_counter()
+
+if __name__ == "__main__" and "--cli" in sys.argv[1:]:
+    # The terminal front end never imports tkinter
+    import cli
+    sys.exit(cli.main([arg for arg in sys.argv[1:] if arg != "--cli"], _LAUNCHED))
+
 import tkinter as tk
 from tkinter import messagebox, ttk
-from functools import partial
+import os
 import random
+import sqlite3
+
+from adaptive import StrengthTuner, score_of
+from aiworker import AIWorker
+from board import get_geometry
+from book import MoveBook, load_default_book
+from engine import DIFFICULTIES, GameEngine, is_instant
+from ratings import PlayerStats
+from records import GameRecord, RecordWriter
+from render import ButtonBoard, CanvasBoard, CellState, StyleCache
+from spectator import SpectatorSession
+from stats import StatsRegistry
+
+_IMPORTED = time.perf_counter()
 
 # --- Enhanced Color Themes Definition ---
 THEMES = {
@@ -47,28 +72,84 @@ THEMES = {
     }
 }
 
+# --- Board Sizes: (cells per side, marks in a row to win) ---
+BOARD_SIZES = {
+    "3x3 (3 in a row)": (3, 3),
+    "4x4 (4 in a row)": (4, 4),
+    "5x5 (4 in a row)": (5, 4),
+    "7x7 (5 in a row)": (7, 5),
+    "15x15 Gomoku (5 in a row)": (15, 5),
+}
+
+# --- AI Timing ---
+AI_MOVE_DELAY_MS = 500  # Minimum time an AI move appears to take when pacing is on
+AI_POLL_MS = 15         # How often the Tk loop checks for a finished search
+
+# --- Spectator Mode ---
+SPECTATE_RATE = 10          # Default moves per second when watching AI vs AI (0: as fast as Tk can draw)
+SPECTATE_RESULT_MOVES = 10  # A finished game stays up for this many move intervals before the next
+TALLY_REFRESH_S = 0.25      # How often the running tally and frame rate are redrawn
+
+# --- Rendering ---
+CANVAS_MIN_SIZE = 7     # Boards this size and up are drawn on one Canvas (None: always buttons)
+
+# --- Game Log, Move Book and Player Statistics ---
+GAME_LOG_PATH = os.path.join(os.path.expanduser("~"), ".tic-tac-toe", "games.ttr")
+BOOK_PATH = os.path.join(os.path.expanduser("~"), ".tic-tac-toe", "book.json")
+PLAYERS_PATH = os.path.join(os.path.expanduser("~"), ".tic-tac-toe", "players.db")
+PLAYER_NAME = "You"     # The human's name in the player statistics
+
 # --- Game Class Definition ---
 class TicTacToeGame:
     """
-    A class to manage the state and logic of the Tic-Tac-Toe game, 
-    with computer opponent, multiplayer mode, theme selection, and resizable UI.
+    Tkinter view over a headless `GameEngine`, with computer opponent,
+    multiplayer mode, theme selection, and resizable UI.
     """
-    def __init__(self, master):
+    def __init__(self, master, report_timings=False):
         self.master = master
         master.title("Tic-Tac-Toe AI")
         master.minsize(500, 650)
         master.resizable(True, True)
         
-        # Game state variables
-        self.current_player = "X"
-        self.human_player = "X"
-        self.ai_player = "O"
-        self.board = [["" for _ in range(3)] for _ in range(3)]
-        self.buttons = []
-        self.game_over = False
+        # Game state lives in the engine; the view only keeps widgets and settings.
+        # The saved move book and the lookup table are loaded once the board is on screen.
+        self.engine = GameEngine(human_player="X", ai_player="O", book=MoveBook())
+        # Per-difficulty search totals; F3 toggles the last move's stats overlay
+        self.search_stats = StatsRegistry()
+        self.engine.stats_hooks.append(self.search_stats.record)
+        self.show_stats = False
+        # The Adaptive AI's strength follows the human's results against it
+        self.tuner = StrengthTuner(self.engine.adaptive.strength)
+        # Board cells and widget options are only reconfigured when they change
+        self.board_view = None
+        self.styles = StyleCache()
         self.is_vs_computer = tk.BooleanVar(value=True)
         self.difficulty = tk.StringVar(value="Hard")
         self.current_theme_name = tk.StringVar(value="Default (Blue/Red)")
+        self.board_size_name = tk.StringVar(value="3x3 (3 in a row)")
+        self.pace_ai = tk.BooleanVar(value=True)
+        self.spectate_x = tk.StringVar(value="Hard")
+        self.spectate_o = tk.StringVar(value="Intermediate")
+        self.spectate_rate = tk.StringVar(value=str(SPECTATE_RATE))
+        # The running AI-vs-AI or replay session, if any
+        self._spectator = None
+        self._tally_shown_at = 0.0
+
+        # AI searches run on a single worker thread and are polled from the Tk loop;
+        # cancelling one discards its result.
+        self.ai_worker = AIWorker(master.after, AI_POLL_MS)
+
+        # Finished games are appended to the game log and rated in the player
+        # statistics off the Tk thread (both opened after startup)
+        self.game_log = None
+        self.players = None
+        master.protocol("WM_DELETE_WINDOW", self.quit)
+
+        # The board is drawn first; settings rows, the move book, the game log
+        # and cache warm-up follow once Tk is idle (see _finish_startup)
+        self.controls_built = False
+        self.report_timings = report_timings
+        self.startup_times = {"imports": (_IMPORTED - _LAUNCHED) * 1000}
         
         # Apply initial theme
         self.current_theme = THEMES[self.current_theme_name.get()]
@@ -131,6 +212,126 @@ class TicTacToeGame:
         )
         self.multiplayer_btn.pack(side=tk.LEFT, padx=5)
 
+        # Status Label
+        self.status_label = tk.Label(
+            self.main_container,
+            text=f"Player {self.engine.current_player}'s turn",
+            font=('Arial', 16, 'bold'),
+            bg=self.current_theme["bg_main"],
+            fg=self.current_theme["fg_label"]
+        )
+        self.status_label.pack(pady=15)
+
+        # Debug overlay with the last AI move's search statistics (hidden until F3)
+        self.stats_label = tk.Label(
+            self.main_container,
+            text="",
+            font=('Courier', 9),
+            bg=self.current_theme["bg_main"],
+            fg=self.current_theme["fg_label"]
+        )
+        master.bind("<F3>", self._toggle_stats_overlay)
+
+        # Running results and frame rate of spectated games (shown once spectating starts)
+        self.tally_label = tk.Label(
+            self.main_container,
+            text="",
+            font=('Arial', 10),
+            bg=self.current_theme["bg_main"],
+            fg=self.current_theme["fg_label"]
+        )
+
+        # Game Board Frame
+        self.board_frame = tk.Frame(self.main_container, bg=self.current_theme["bg_board"])
+        self.board_frame.pack(pady=15, expand=True)
+
+        # Create the board cells
+        self._create_board_view()
+
+        # Button Control Frame
+        self.button_frame = tk.Frame(self.main_container, bg=self.current_theme["bg_main"])
+        self.button_frame.pack(pady=15, fill=tk.X)
+
+        # Reset Button
+        self.reset_button = tk.Button(
+            self.button_frame,
+            text="🔄 Reset Game",
+            command=self.reset_game,
+            font=('Arial', 12, 'bold'),
+            relief=tk.RAISED,
+            bd=2,
+            padx=20,
+            pady=10,
+            cursor="hand2"
+        )
+        self.reset_button.pack(side=tk.LEFT, padx=10, fill=tk.X, expand=True)
+
+        # Quit Button
+        self.quit_button = tk.Button(
+            self.button_frame,
+            text="❌ Quit",
+            command=self.quit,
+            font=('Arial', 12, 'bold'),
+            relief=tk.RAISED,
+            bd=2,
+            padx=20,
+            pady=10,
+            cursor="hand2"
+        )
+        self.quit_button.pack(side=tk.LEFT, padx=10, fill=tk.X, expand=True)
+
+        self.apply_theme()
+        master.after_idle(self._on_first_paint)
+
+    # --- Startup ---
+
+    def _on_first_paint(self):
+        """Runs once Tk has drawn the first frame, then queues the deferred startup work."""
+        self.startup_times["first_paint"] = (time.perf_counter() - _LAUNCHED) * 1000
+        self.master.after_idle(self._finish_startup)
+
+    def _finish_startup(self):
+        """Builds the settings rows and loads the move book, lookup table and game log after the first paint."""
+        self._build_controls()
+        self.controls_built = True
+        self.apply_theme()
+        self._update_difficulty_menu()
+
+        self.engine.book = self._load_book()
+        self.engine.table  # opened here rather than by the first Hard move
+        try:
+            os.makedirs(os.path.dirname(GAME_LOG_PATH), exist_ok=True)
+            self.game_log = RecordWriter(GAME_LOG_PATH)
+        except (OSError, ValueError):
+            self.game_log = None
+        try:
+            self.players = PlayerStats(PLAYERS_PATH)
+        except (OSError, sqlite3.Error):
+            self.players = None
+
+        self.startup_times["ready"] = (time.perf_counter() - _LAUNCHED) * 1000
+        if self.report_timings:
+            print(self._startup_summary(), file=sys.stderr)
+        self._update_stats_overlay()
+        self.master.after_idle(self._warm_up, list(BOARD_SIZES.values()))
+
+    def _warm_up(self, boards):
+        """Precomputes the line masks of one board size per idle moment, so switching sizes is instant."""
+        if boards:
+            get_geometry(*boards.pop())
+            self.master.after_idle(self._warm_up, boards)
+
+    def _startup_summary(self):
+        times = self.startup_times
+        text = f"Startup: imports {times['imports']:.0f} ms"
+        if "first_paint" in times:
+            text += f", first paint {times['first_paint']:.0f} ms"
+        if "ready" in times:
+            text += f", ready {times['ready']:.0f} ms"
+        return text
+
+    def _build_controls(self):
+        """Creates the difficulty, theme, board size and spectator rows."""
         # Settings Frame
         self.settings_frame = tk.Frame(self.control_frame, bg=self.current_theme["bg_main"])
         self.settings_frame.pack(pady=10, fill=tk.X)
@@ -148,7 +349,7 @@ class TicTacToeGame:
         self.difficulty_menu = ttk.Combobox(
             self.settings_frame, 
             textvariable=self.difficulty, 
-            values=["Easy", "Intermediate", "Hard"],
+            values=list(DIFFICULTIES),
             state="readonly",
             width=14,
             font=('Arial', 10)
@@ -177,56 +378,115 @@ class TicTacToeGame:
         self.theme_menu.pack(side=tk.LEFT, padx=5)
         self.theme_menu.bind("<<ComboboxSelected>>", self._on_theme_change)
 
-        # Status Label
-        self.status_label = tk.Label(
-            self.main_container,
-            text=f"Player {self.current_player}'s turn",
-            font=('Arial', 16, 'bold'),
+        # Board Size Selector
+        self.size_frame = tk.Frame(self.control_frame, bg=self.current_theme["bg_main"])
+        self.size_frame.pack(pady=5)
+
+        self.size_label = tk.Label(
+            self.size_frame,
+            text="Board:",
+            font=('Arial', 10),
             bg=self.current_theme["bg_main"],
             fg=self.current_theme["fg_label"]
         )
-        self.status_label.pack(pady=15)
+        self.size_label.pack(side=tk.LEFT, padx=10)
 
-        # Game Board Frame
-        self.board_frame = tk.Frame(self.main_container, bg=self.current_theme["bg_board"])
-        self.board_frame.pack(pady=15, expand=True)
+        self.size_menu = ttk.Combobox(
+            self.size_frame,
+            textvariable=self.board_size_name,
+            values=list(BOARD_SIZES.keys()),
+            state="readonly",
+            width=24,
+            font=('Arial', 10)
+        )
+        self.size_menu.pack(side=tk.LEFT, padx=5)
+        self.size_menu.bind("<<ComboboxSelected>>", self._on_board_size_change)
 
-        # Create the 3x3 grid of buttons
-        self._create_board_buttons()
+        self.pace_check = tk.Checkbutton(
+            self.size_frame,
+            text="Pause before AI moves",
+            variable=self.pace_ai,
+            font=('Arial', 10),
+            cursor="hand2"
+        )
+        self.pace_check.pack(side=tk.LEFT, padx=10)
 
-        # Button Control Frame
-        self.button_frame = tk.Frame(self.main_container, bg=self.current_theme["bg_main"])
-        self.button_frame.pack(pady=15, fill=tk.X)
+        # Spectator Controls: AI vs AI, or replaying a game log
+        self.spectate_frame = tk.Frame(self.control_frame, bg=self.current_theme["bg_main"])
+        self.spectate_frame.pack(pady=5)
 
-        # Reset Button
-        self.reset_button = tk.Button(
-            self.button_frame,
-            text="🔄 Reset Game",
-            command=self.reset_game,
-            font=('Arial', 12, 'bold'),
-            relief=tk.RAISED,
-            bd=2,
-            padx=20,
-            pady=10,
-            cursor="hand2"
+        self.spectate_label = tk.Label(
+            self.spectate_frame,
+            text="Watch:",
+            font=('Arial', 10),
+            bg=self.current_theme["bg_main"],
+            fg=self.current_theme["fg_label"]
         )
-        self.reset_button.pack(side=tk.LEFT, padx=10, fill=tk.X, expand=True)
+        self.spectate_label.pack(side=tk.LEFT, padx=10)
 
-        # Quit Button
-        self.quit_button = tk.Button(
-            self.button_frame,
-            text="❌ Quit",
-            command=master.quit,
-            font=('Arial', 12, 'bold'),
-            relief=tk.RAISED,
-            bd=2,
-            padx=20,
-            pady=10,
-            cursor="hand2"
+        self.spectate_x_menu = ttk.Combobox(
+            self.spectate_frame,
+            textvariable=self.spectate_x,
+            values=list(DIFFICULTIES),
+            state="readonly",
+            width=11,
+            font=('Arial', 10)
         )
-        self.quit_button.pack(side=tk.LEFT, padx=10, fill=tk.X, expand=True)
+        self.spectate_x_menu.pack(side=tk.LEFT, padx=2)
 
-        self.apply_theme()
+        self.versus_label = tk.Label(
+            self.spectate_frame,
+            text="vs",
+            font=('Arial', 10),
+            bg=self.current_theme["bg_main"],
+            fg=self.current_theme["fg_label"]
+        )
+        self.versus_label.pack(side=tk.LEFT, padx=2)
+
+        self.spectate_o_menu = ttk.Combobox(
+            self.spectate_frame,
+            textvariable=self.spectate_o,
+            values=list(DIFFICULTIES),
+            state="readonly",
+            width=11,
+            font=('Arial', 10)
+        )
+        self.spectate_o_menu.pack(side=tk.LEFT, padx=2)
+
+        self.rate_label = tk.Label(
+            self.spectate_frame,
+            text="Moves/s (0 = max):",
+            font=('Arial', 10),
+            bg=self.current_theme["bg_main"],
+            fg=self.current_theme["fg_label"]
+        )
+        self.rate_label.pack(side=tk.LEFT, padx=(10, 2))
+
+        self.rate_spinbox = tk.Spinbox(
+            self.spectate_frame,
+            textvariable=self.spectate_rate,
+            from_=0,
+            to=1000,
+            increment=5,
+            width=5,
+            font=('Arial', 10)
+        )
+        self.rate_spinbox.pack(side=tk.LEFT, padx=2)
+
+        self.spectate_buttons = []
+        for text, command in (("▶ Watch", self.start_spectating), ("📼 Replay", self.replay_log),
+                              ("⏹ Stop", self.reset_game)):
+            button = tk.Button(
+                self.spectate_frame,
+                text=text,
+                command=command,
+                font=('Arial', 10, 'bold'),
+                relief=tk.RAISED,
+                bd=2,
+                cursor="hand2"
+            )
+            button.pack(side=tk.LEFT, padx=3)
+            self.spectate_buttons.append(button)
 
     # --- UI & Theme Methods ---
     
@@ -239,51 +499,24 @@ class TicTacToeGame:
     def _update_mode_buttons(self):
         """Updates the appearance of mode buttons based on current selection."""
         theme = self.current_theme
-        if self.is_vs_computer.get():
-            # Computer mode is active
-            self.computer_btn.config(
-                relief=tk.RAISED,
-                bd=2,
-                bg=theme["bg_reset"],
-                fg=theme["fg_reset"],
-                activebackground=theme["bg_reset"],
-                activeforeground=theme["fg_reset"]
-            )
-            self.multiplayer_btn.config(
-                relief=tk.FLAT,
-                bd=1,
-                bg=theme["bg_button"],
-                fg=theme["fg_label"],
-                activebackground=theme["bg_button"],
-                activeforeground=theme["fg_label"]
-            )
-        else:
-            # Multiplayer mode is active
-            self.computer_btn.config(
-                relief=tk.FLAT,
-                bd=1,
-                bg=theme["bg_button"],
-                fg=theme["fg_label"],
-                activebackground=theme["bg_button"],
-                activeforeground=theme["fg_label"]
-            )
-            self.multiplayer_btn.config(
-                relief=tk.RAISED,
-                bd=2,
-                bg=theme["bg_reset"],
-                fg=theme["fg_reset"],
-                activebackground=theme["bg_reset"],
-                activeforeground=theme["fg_reset"]
-            )
+        active = dict(relief=tk.RAISED, bd=2, bg=theme["bg_reset"], fg=theme["fg_reset"],
+                      activebackground=theme["bg_reset"], activeforeground=theme["fg_reset"])
+        inactive = dict(relief=tk.FLAT, bd=1, bg=theme["bg_button"], fg=theme["fg_label"],
+                        activebackground=theme["bg_button"], activeforeground=theme["fg_label"])
+        computer = self.is_vs_computer.get()
+        self.styles.configure(self.computer_btn, **(active if computer else inactive))
+        self.styles.configure(self.multiplayer_btn, **(inactive if computer else active))
 
     def _on_mode_change(self):
         """Handles switching between Player vs Player and Player vs Computer."""
-        if self.is_vs_computer.get():
-            self.difficulty_menu.config(state="readonly")
-        else:
-            self.difficulty_menu.config(state="disabled")
+        self._update_difficulty_menu()
         self.reset_game()
 
+    def _update_difficulty_menu(self):
+        """Enables the difficulty selector only when playing the computer."""
+        if self.controls_built:
+            self.difficulty_menu.config(state="readonly" if self.is_vs_computer.get() else "disabled")
+
     def _on_difficulty_change(self, event):
         """Handles changes in the difficulty setting."""
         self.reset_game()
@@ -294,304 +527,394 @@ class TicTacToeGame:
         self.apply_theme()
         self.reset_game()
 
+    def _on_board_size_change(self, event):
+        """Handles changes in the board size and rebuilds the grid."""
+        self.stop_spectating()
+        self._cancel_ai()
+        size, win_length = BOARD_SIZES[self.board_size_name.get()]
+        self.engine.reset(size, win_length)
+        self._rebuild_board_view()
+        self.reset_game()
+
+    def _toggle_stats_overlay(self, event=None):
+        """Shows or hides the search statistics of the last AI move."""
+        self.show_stats = not self.show_stats
+        if self.show_stats:
+            self.stats_label.pack(after=self.status_label)
+            self._update_stats_overlay()
+        else:
+            self.stats_label.pack_forget()
+
+    def _update_stats_overlay(self):
+        """Refreshes the overlay text from the engine's last search."""
+        if self.show_stats:
+            stats = self.engine.last_stats
+            self.stats_label.config(text=stats.summary() if stats is not None else self._startup_summary())
+
     def apply_theme(self):
-        """Applies the current theme colors to all dynamic UI elements."""
+        """Applies the current theme colors to all dynamic UI elements, reconfiguring only what changed."""
         theme = self.current_theme
+        style = self.styles.configure
         
-        self.master.config(bg=theme["bg_main"])
-        self.main_container.config(bg=theme["bg_main"])
-        self.control_frame.config(bg=theme["bg_main"])
-        self.settings_frame.config(bg=theme["bg_main"])
-        self.button_frame.config(bg=theme["bg_main"])
+        frames = [self.master, self.main_container, self.control_frame, self.button_frame, self.mode_frame]
+        labels = [self.title_label, self.status_label, self.stats_label, self.mode_label, self.tally_label]
+        if self.controls_built:
+            frames += [self.settings_frame, self.size_frame, self.spectate_frame]
+            labels += [self.difficulty_label, self.theme_label, self.size_label, self.spectate_label,
+                       self.versus_label, self.rate_label]
+        for frame in frames:
+            style(frame, bg=theme["bg_main"])
         
         # Update labels
-        for label in [self.title_label, self.difficulty_label, self.theme_label, self.status_label, self.mode_label]:
-            label.config(bg=theme["bg_main"], fg=theme["fg_label"])
+        for label in labels:
+            style(label, bg=theme["bg_main"], fg=theme["fg_label"])
                 
-        self.board_frame.config(bg=theme["bg_board"])
+        style(self.board_frame, bg=theme["bg_board"])
+        self.board_view.set_background(theme["bg_board"])
         
         # Update buttons
-        self.reset_button.config(
+        style(
+            self.reset_button,
             bg=theme["bg_reset"], 
             fg=theme["fg_reset"],
             activebackground=theme["bg_reset"],
             activeforeground=theme["fg_reset"]
         )
-        self.quit_button.config(
+        style(
+            self.quit_button,
             bg="#555555", 
             fg="white",
             activebackground="#444444",
             activeforeground="white"
         )
 
-        # Update mode frame
-        self.mode_frame.config(bg=theme["bg_main"])
-        self._update_mode_buttons()
+        if self.controls_built:
+            style(
+                self.pace_check,
+                bg=theme["bg_main"],
+                fg=theme["fg_label"],
+                activebackground=theme["bg_main"],
+                activeforeground=theme["fg_label"],
+                selectcolor=theme["bg_button"]
+            )
 
-        # Update board buttons
-        for r in range(3):
-            for c in range(3):
-                self.buttons[r][c].config(
+            for button in self.spectate_buttons:
+                style(
+                    button,
                     bg=theme["bg_button"],
-                    disabledforeground=self.get_player_color(self.board[r][c]) or theme["fg_x"]
+                    fg=theme["fg_label"],
+                    activebackground=theme["bg_button"],
+                    activeforeground=theme["fg_label"]
                 )
-        
-        # Re-highlight if the game is over and won
-        if self.game_over and hasattr(self, '_winning_line'):
-            self._highlight_winner(reapply=True)
-
-    def _create_board_buttons(self):
-        """Creates the 9 clickable buttons for the game board."""
-        for r in range(3):
-            row_buttons = []
-            for c in range(3):
-                cmd = partial(self.handle_click, r, c)
-                
-                button = tk.Button(
-                    self.board_frame,
-                    text="",
-                    font=('Arial', 32, 'bold'),
-                    width=6,
-                    height=3,
-                    command=cmd,
-                    relief=tk.RAISED,
-                    bd=2,
-                    cursor="hand2"
-                )
-                button.grid(row=r, column=c, padx=4, pady=4, sticky="nsew")
-                row_buttons.append(button)
-            self.buttons.append(row_buttons)
-        
-        # Configure grid weights for responsiveness
-        for i in range(3):
-            self.board_frame.grid_rowconfigure(i, weight=1)
-            self.board_frame.grid_columnconfigure(i, weight=1)
+
+        self._update_mode_buttons()
+        self._render_board()
+
+    def _create_board_view(self):
+        """Creates the board cells, as buttons or on one Canvas for large boards, and draws them."""
+        size = self.engine.board.size
+        if CANVAS_MIN_SIZE is not None and size >= CANVAS_MIN_SIZE:
+            self.board_view = CanvasBoard(self.board_frame, size, self.handle_click, self.current_theme["bg_board"])
+        else:
+            self.board_view = ButtonBoard(self.board_frame, size, self.handle_click)
+        self._render_board()
+
+    def _rebuild_board_view(self):
+        """Replaces the board cells after the engine's board changed size."""
+        board = self.engine.board
+        for name, shape in BOARD_SIZES.items():
+            if shape == (board.size, board.win_length):
+                self.board_size_name.set(name)
+        self.board_view.destroy()
+        self._create_board_view()
+        self.apply_theme()
+
+    def _cell_states(self):
+        """Returns the display state of every cell for the current game and theme."""
+        engine = self.engine
+        board = engine.board
+        theme = self.current_theme
+        winning = set(engine.winning_line or ())
+        states = []
+        for i in range(board.cells):
+            mark = board.get(i)
+            states.append(CellState(
+                mark,
+                self.get_player_color(mark) if mark else theme["fg_x"],
+                theme["bg_win"] if i in winning else theme["bg_button"],
+                not mark and not engine.game_over,
+            ))
+        return states
+
+    def _render_board(self):
+        """Redraws the cells whose mark, color or clickability changed."""
+        self.board_view.render(self._cell_states())
 
     # --- Game Flow and Handling ---
 
     def handle_click(self, r, c):
         """Handles a click event by the human player."""
-        if self.board[r][c] == "" and not self.game_over:
-            self._make_move(r, c, self.current_player)
+        engine = self.engine
+        if self._spectator is not None:
+            return
+        if not self.ai_worker.busy and engine.is_valid_move(engine.board.size * r + c):
+            self._make_move(r, c)
             
-            if self.game_over:
+            if engine.game_over:
                 return
 
-            if self.is_vs_computer.get() and self.current_player == self.ai_player:
-                self.master.after(500, self.ai_move)
+            if self.is_vs_computer.get() and engine.current_player == engine.ai_player:
+                self.ai_move()
 
-    def _make_move(self, r, c, player):
-        """Internal helper to update the board state and UI for any player."""
-        self.board[r][c] = player
-        button = self.buttons[r][c]
-        
-        button.config(
-            text=player, 
-            disabledforeground=self.get_player_color(player),
-            state=tk.DISABLED
-        )
+    def _make_move(self, r, c):
+        """Plays the current player's move in the engine and updates the UI."""
+        engine = self.engine
+        player = engine.current_player
+        engine.make_move(engine.board.size * r + c)
+        self._render_board()
+
+        note = ""
+        if engine.game_over:
+            self._log_game()
+            note = self._rate_game() + self._tune_adaptive()
 
-        if self._check_win():
-            self.game_over = True
+        if engine.winner is not None:
             self.status_label.config(text=f"🎉 Player {player} wins!")
-            self._highlight_winner()
-            self._disable_all_buttons()
-            messagebox.showinfo("Game Over", f"🎉 Player {player} has won!")
-        elif self._check_tie():
-            self.game_over = True
+            messagebox.showinfo("Game Over", f"🎉 Player {player} has won!{note}")
+        elif engine.is_tie:
             self.status_label.config(text="🤝 It's a Tie Game!")
-            messagebox.showinfo("Game Over", "🤝 It's a Tie Game!")
-        else:
-            next_player = "O" if player == "X" else "X"
-            self.current_player = next_player
-            if not self.is_vs_computer.get() or self.current_player == self.human_player:
-                 self.status_label.config(text=f"Player {self.current_player}'s turn")
+            messagebox.showinfo("Game Over", f"🤝 It's a Tie Game!{note}")
+        elif not self.is_vs_computer.get() or engine.current_player == engine.human_player:
+            self.status_label.config(text=f"Player {engine.current_player}'s turn")
 
-    # --- AI Logic Implementation ---
+    # --- AI Logic ---
 
     def ai_move(self):
-        """Calculates and executes the computer's move based on selected difficulty."""
-        if self.game_over:
+        """Starts the computer's move on the worker thread and shows a thinking indicator."""
+        engine = self.engine
+        if engine.game_over:
             return
 
-        difficulty = self.difficulty.get()
-        move = None
-
-        if difficulty == "Easy":
-            move = self._get_easy_move()
-        elif difficulty == "Intermediate":
-            move = self._get_intermediate_move()
-        elif difficulty == "Hard":
-            move = self._get_hard_move()
-        
-        if move:
-            r, c = move
-            self._make_move(r, c, self.ai_player)
-
-    def _get_easy_move(self):
-        """Easy AI: Chooses a random available spot."""
-        available_moves = [(r, c) for r in range(3) for c in range(3) if self.board[r][c] == ""]
-        return random.choice(available_moves) if available_moves else None
-
-    def _check_possible_win_block(self, player):
-        """Helper for Intermediate AI: Finds a move that results in an immediate win or block."""
-        for r in range(3):
-            for c in range(3):
-                if self.board[r][c] == "":
-                    self.board[r][c] = player
-                    if self._check_win_for_player(player):
-                        self.board[r][c] = ""
-                        return (r, c)
-                    self.board[r][c] = ""
-        return None
-
-    def _get_intermediate_move(self):
-        """Intermediate AI: Tries to win, then tries to block, otherwise chooses randomly."""
-        win_move = self._check_possible_win_block(self.ai_player)
-        if win_move:
-            return win_move
-
-        block_move = self._check_possible_win_block(self.human_player)
-        if block_move:
-            return block_move
-        
-        if self.board[1][1] == "":
-            return (1, 1)
-
-        return self._get_easy_move()
-
-    def _get_hard_move(self):
-        """Hard AI: Uses Minimax to find the optimal move."""
-        best_score = -float('inf')
-        best_move = None
-        
-        for r in range(3):
-            for c in range(3):
-                if self.board[r][c] == "":
-                    self.board[r][c] = self.ai_player
-                    score = self._minimax(self.board, 0, False)
-                    self.board[r][c] = ""
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_move = (r, c)
-                        
-        return best_move
-
-    def _check_win_for_player(self, player, board=None):
-        """Checks for a win on a given board for a specific player."""
-        if board is None: board = self.board
-        
-        for i in range(3):
-            if all(board[i][j] == player for j in range(3)): return True
-            if all(board[j][i] == player for j in range(3)): return True
-            
-        if all(board[i][i] == player for i in range(3)): return True
-        if all(board[i][2 - i] == player for i in range(3)): return True
-            
-        return False
-        
-    def _is_board_full(self, board=None):
-        """Checks if the board is full."""
-        if board is None: board = self.board
-        return all(cell != "" for row in board for cell in row)
+        self.status_label.config(text=f"🤖 Player {engine.current_player} is thinking...")
+        self.ai_worker.start(engine, self.difficulty.get(), self._apply_ai_move, self._on_ai_error,
+                             AI_MOVE_DELAY_MS if self.pace_ai.get() else 0)
+
+    def _on_ai_error(self, error):
+        """Reports a failed search and returns an instant heuristic move to stand in, so the board is not locked."""
+        messagebox.showwarning("AI Error", f"The {self.difficulty.get()} AI failed: {error}\n\n"
+                                           "It plays an Intermediate move instead.")
+        return self.engine.choose_move("Intermediate")
+
+    def _apply_ai_move(self, move):
+        """Plays a finished AI move."""
+        self._update_stats_overlay()
+        if move is not None:
+            self._make_move(*divmod(move, self.engine.board.size))
+
+    def _cancel_ai(self):
+        """Cancels the in-flight AI search, if any, so its result is ignored."""
+        self.ai_worker.cancel()
+
+    # --- Spectator Mode ---
+
+    def start_spectating(self, log_path=None):
+        """Plays AI-vs-AI games back to back, or replays every game of a log, until stopped."""
+        self.stop_spectating()
+        self._cancel_ai()
+        try:
+            session = SpectatorSession(self.engine, self.spectate_x.get(), self.spectate_o.get(), log_path)
+        except (OSError, ValueError) as error:
+            self.status_label.config(text=f"⚠️ Cannot replay: {error}")
+            return
+        self._spectator = session
+        self.tally_label.pack(after=self.status_label)
+        self._update_tally(session, force=True)
+        self._next_spectated_game(session)
+
+    def replay_log(self):
+        """Asks for a game log and replays its games."""
+        from tkinter import filedialog
+
+        path = filedialog.askopenfilename(
+            title="Replay a game log",
+            initialdir=os.path.dirname(GAME_LOG_PATH),
+            filetypes=[("Game logs", "*.ttr"), ("All files", "*")]
+        )
+        if path:
+            self.start_spectating(path)
 
-    def _minimax(self, board, depth, is_maximizing):
-        """The recursive Minimax algorithm for perfect Tic-Tac-Toe play."""
-        
-        if self._check_win_for_player(self.ai_player, board):
-            return 10 - depth
-        if self._check_win_for_player(self.human_player, board):
-            return depth - 10
-        if self._is_board_full(board):
-            return 0
-
-        if is_maximizing:
-            best_score = -float('inf')
-            player = self.ai_player
-            for r in range(3):
-                for c in range(3):
-                    if board[r][c] == "":
-                        board[r][c] = player
-                        score = self._minimax(board, depth + 1, False)
-                        board[r][c] = ""
-                        best_score = max(best_score, score)
-            return best_score
+    def stop_spectating(self):
+        """Ends the spectator session, if any; its final tally stays on screen."""
+        session = self._spectator
+        if session is None:
+            return
+        self._spectator = None
+        self._cancel_ai()
+        session.close()
+        self._update_tally(session, force=True)
+
+    def _spectate_delay_ms(self):
+        """Returns the delay between spectated moves for the chosen rate."""
+        try:
+            rate = float(self.spectate_rate.get())
+        except (tk.TclError, ValueError):
+            rate = SPECTATE_RATE
+        return 1 if rate <= 0 else max(1, round(1000 / rate))
+
+    def _next_spectated_game(self, session):
+        """Starts the session's next game, or ends a replay that has run out of games."""
+        if session is not self._spectator:
+            return
+        board = self.engine.board
+        shape = (board.size, board.win_length)
+        if not session.start_game():
+            self.stop_spectating()
+            self.status_label.config(text="📼 Replay finished")
+            return
+        board = self.engine.board
+        if (board.size, board.win_length) != shape:
+            self._rebuild_board_view()
+        self.status_label.config(text=f"👀 {session.strategies['X']} (X) vs {session.strategies['O']} (O)")
+        self._render_board()
+        self.master.after(self._spectate_delay_ms(), self._spectate_step, session)
+
+    def _spectate_step(self, session):
+        """Plays the next spectated move: inline when the strategy is instant, else on the worker thread."""
+        if session is not self._spectator:
+            return
+        engine = self.engine
+        if session.replaying:
+            self._play_spectated(session, session.recorded_move())
+        elif is_instant(engine.board, session.strategy):
+            self._play_spectated(session, engine.choose_move(session.strategy))
         else:
-            best_score = float('inf')
-            player = self.human_player
-            for r in range(3):
-                for c in range(3):
-                    if board[r][c] == "":
-                        board[r][c] = player
-                        score = self._minimax(board, depth + 1, True)
-                        board[r][c] = ""
-                        best_score = min(best_score, score)
-            return best_score
-
-    # --- Utility Methods ---
-
-    def _check_win(self):
-        """Checks all rows, columns, and diagonals for a win by the current player."""
-        player = self.current_player
-        
-        lines = []
-        for i in range(3):
-            lines.append([(i, j) for j in range(3)])
-            lines.append([(j, i) for j in range(3)])
-        lines.append([(i, i) for i in range(3)])
-        lines.append([(i, 2 - i) for i in range(3)])
-        
-        for line in lines:
-            if all(self.board[r][c] == player for r, c in line):
-                self._winning_line = line
-                return True
+            # A failed search falls back as in ai_move, but without a dialog interrupting the games
+            self.ai_worker.start(engine, session.strategy, lambda move: self._play_spectated(session, move),
+                                 lambda error: engine.choose_move("Intermediate"))
+
+    def _play_spectated(self, session, move):
+        """Draws one spectated move, then schedules the next move, or the next game once this one is over."""
+        engine = self.engine
+        delay = self._spectate_delay_ms()
+        played = move is not None and engine.is_valid_move(move)
+        if played:
+            engine.make_move(move)
+            self._render_board()
+            # Draw now, so the frame rate counts frames Tk actually drew
+            self.master.update_idletasks()
+            session.tally.frame()
+
+        if played and not engine.game_over:
+            self._update_tally(session)
+            self.master.after(delay, self._spectate_step, session)
+            return
 
-        return False
+        # Game over, or a replayed record that ends early: report it without a dialog
+        winner = session.finish_game()
+        if not session.replaying:
+            self._log_game(session.strategies)
+            self._rate_game(session.strategies)
+        result = f"🎉 Player {winner} wins!" if winner is not None else "🤝 Tie game"
+        self.status_label.config(
+            text=f"{result}  ({session.strategies['X']} vs {session.strategies['O']})"
+        )
+        self._update_tally(session, force=True)
+        self.master.after(delay * SPECTATE_RESULT_MOVES, self._next_spectated_game, session)
+
+    def _update_tally(self, session, force=False):
+        """Redraws the running tally, at most every TALLY_REFRESH_S seconds unless forced."""
+        now = time.perf_counter()
+        if force or now - self._tally_shown_at >= TALLY_REFRESH_S:
+            self._tally_shown_at = now
+            self.tally_label.config(text=session.tally.summary())
+
+    def quit(self):
+        """Stops any running search and closes the application."""
+        self.stop_spectating()
+        self.ai_worker.shutdown()
+        if self.game_log is not None:
+            self.game_log.close()
+        if self.players is not None:
+            self.players.close()
+        # Before startup finishes the saved book is not loaded yet, so keep it as is
+        if self.controls_built:
+            try:
+                os.makedirs(os.path.dirname(BOOK_PATH), exist_ok=True)
+                self.engine.book.save(BOOK_PATH)
+            except OSError:
+                pass
+        self.master.quit()
 
-    def _check_tie(self):
-        """Checks if the board is full (implying a tie if no one won yet)."""
-        return all(cell != "" for row in self.board for cell in row)
+    # --- Utility Methods ---
 
-    def _highlight_winner(self, reapply=False):
-        """Highlights the buttons that form the winning line."""
-        win_color = self.current_theme["bg_win"]
-        for r, c in self._winning_line:
-            self.buttons[r][c].config(bg=win_color, fg="white")
+    def _load_book(self):
+        """Returns the move book saved by the last session, else the shipped opening book."""
+        try:
+            return MoveBook.load(BOOK_PATH)
+        except (OSError, ValueError, KeyError):
+            return load_default_book() or MoveBook()
 
-    def _disable_all_buttons(self):
-        """Disables all buttons to prevent further moves after game over."""
-        for row in self.buttons:
-            for button in row:
-                button.config(state=tk.DISABLED)
+    def _log_game(self, strategies=None):
+        """Queues the finished game for the game log; `strategies` maps each mark to who played it."""
+        if self.game_log is None:
+            return
+        engine = self.engine
+        if strategies is None:
+            opponent = self.difficulty.get() if self.is_vs_computer.get() else "Human"
+            strategies = {engine.human_player: "Human", engine.ai_player: opponent}
+        self.game_log.write(GameRecord.from_engine(engine, strategies["X"], strategies["O"]))
+
+    def _rate_game(self, strategies=None):
+        """
+        Counts the finished game in the player statistics, for games against
+        the computer or between two different AIs. Returns a line about the
+        human's record against this difficulty, or "" if there is none.
+        """
+        if self.players is None:
+            return ""
+        engine = self.engine
+        if strategies is None:
+            if not self.is_vs_computer.get():
+                return ""
+            difficulty = self.difficulty.get()
+            names = {engine.human_player: PLAYER_NAME, engine.ai_player: difficulty}
+        else:
+            names = strategies
+        if names["X"] == names["O"]:
+            return ""
+        self.players.record(names["X"], names["O"], engine.winner)
+        if strategies is not None:
+            return ""
+        wins, draws, losses = self.players.matchups(PLAYER_NAME)[difficulty]
+        rating = self.players.player(PLAYER_NAME).rating
+        return f"\n\n{PLAYER_NAME} vs {difficulty}: {wins} won, {draws} tied, {losses} lost. Your rating: {rating:.0f}"
+
+    def _tune_adaptive(self):
+        """
+        Adjusts the Adaptive AI's strength after a game against it. Returns a
+        line about the change, or "" for other games.
+        """
+        engine = self.engine
+        if not self.is_vs_computer.get() or self.difficulty.get() != "Adaptive":
+            return ""
+        old = self.tuner.strength
+        engine.adaptive.strength = self.tuner.record(score_of(engine.winner, engine.human_player))
+        return f"\n\nAdaptive strength: {old:.2f} → {self.tuner.strength:.2f}"
 
     def reset_game(self):
-        """Resets the game state and board UI."""
-        self.current_player = "X"
-        self.board = [["" for _ in range(3)] for _ in range(3)]
-        self.game_over = False
-        
-        theme = self.current_theme
+        """Resets the game state and board UI, cancelling any AI search or spectator session in progress."""
+        self.stop_spectating()
+        self._cancel_ai()
+        # A fresh seed per game, kept in the game log so the AI's choices can be replayed
+        self.engine.reset(seed=random.getrandbits(63))
         
         mode_text = "vs. Computer" if self.is_vs_computer.get() else "vs. Player"
-        self.status_label.config(text=f"Player {self.current_player}'s turn ({mode_text})", fg=theme["fg_label"])
+        self.status_label.config(text=f"Player {self.engine.current_player}'s turn ({mode_text})")
+        self._render_board()
+        self._update_difficulty_menu()
         
-        for r in range(3):
-            for c in range(3):
-                self.buttons[r][c].config(
-                    text="",
-                    state=tk.NORMAL,
-                    bg=theme["bg_button"],
-                    fg=theme["fg_x"] 
-                )
-        
-        if self.is_vs_computer.get():
-            self.difficulty_menu.config(state="readonly")
-        else:
-            self.difficulty_menu.config(state="disabled")
-        
-        if self.current_player == self.ai_player and self.is_vs_computer.get():
-             self.master.after(500, self.ai_move) 
+        if self.engine.current_player == self.engine.ai_player and self.is_vs_computer.get():
+            self.ai_move()
 
     def get_player_color(self, player):
         """Returns the specific color for each player's mark based on the current theme."""
@@ -607,17 +930,12 @@ class TicTacToeGame:
 if __name__ == "__main__":
     root = tk.Tk()
     root.title("Tic-Tac-Toe AI")
-    root.geometry('600x750')
-    
-    # Center the window on the screen
-    root.update_idletasks()
-    window_width = root.winfo_width()
-    window_height = root.winfo_height()
-    screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
-    position_top = int(screen_height / 2 - window_height / 2)
-    position_right = int(screen_width / 2 - window_width / 2)
+
+    # Center the window on the screen; the size is known, so no layout pass is needed first
+    window_width, window_height = 600, 750
+    position_top = (root.winfo_screenheight() - window_height) // 2
+    position_right = (root.winfo_screenwidth() - window_width) // 2
     root.geometry(f'{window_width}x{window_height}+{position_right}+{position_top}')
 
-    game = TicTacToeGame(root)
+    game = TicTacToeGame(root, report_timings="--timings" in sys.argv[1:])
     root.mainloop()
\ No newline at end of file
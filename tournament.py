@@ -0,0 +1,256 @@
+"""
+AI-vs-AI tournament runner.
+
+Plays N games for every strategy pairing across a process pool and reports
+win/draw/loss rates, games per second and per-move latency percentiles.
+Every finished game is streamed to a JSON Lines file and/or a binary game log
+(see records.py) as it arrives, strategies of different pairings can be rated
+into a player database (see ratings.py), and the per-difficulty search
+statistics can be exported as JSON or Prometheus text.
+
+Usage:
+    python tournament.py --games 1000 --pairing Easy:Hard --pairing Intermediate:Intermediate
+    python tournament.py --games 500 --processes 4 --seed 7 --output results.jsonl
+    python tournament.py --games 100000 --records games.ttr
+    python tournament.py --games 1000 --players players.db
+    python tournament.py --games 500 --stats stats.prom
+    python tournament.py --games 20 --size 5 --win-length 4 --time-budget 0.05
+    python tournament.py --games 200 --pairing MCTS:Intermediate --mcts-playouts 500
+    python tournament.py --games 200 --pairing Adaptive:Intermediate --strength 0.25
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from adaptive import DEFAULT_STRENGTH
+from engine import DIFFICULTIES, GameEngine
+from mcts import DEFAULT_PLAYOUTS
+from records import GameRecord, RecordWriter
+from stats import StatsRegistry
+
+CHUNK_SIZE = 250
+
+# One engine per worker process and board, so solver caches and the table map are reused.
+_engines = {}
+# Search statistics gathered in this worker since its last chunk.
+_stats = StatsRegistry()
+
+
+def _get_engine(size, win_length, time_budget, mcts_playouts, strength):
+    """Returns this process's engine for a board and budget, creating it on first use."""
+    key = (size, win_length, time_budget, mcts_playouts, strength)
+    if key not in _engines:
+        _engines[key] = GameEngine(size=size, win_length=win_length, time_budget=time_budget,
+                                   mcts_playouts=mcts_playouts, strength=strength)
+        _engines[key].stats_hooks.append(_stats.record)
+    return _engines[key]
+
+
+def game_seed(seed, x_strategy, o_strategy, game):
+    """Hashes the base seed, the pairing and the game number into one 64-bit seed."""
+    # A hash rather than bit fields, so no game number or base seed spills into another pairing's seeds.
+    # hashlib is imported here to keep it out of cli.py's startup.
+    import hashlib
+    key = f"{seed}:{x_strategy}:{o_strategy}:{game}".encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def play_game(engine, x_strategy, o_strategy, seed):
+    """Plays one seeded game between two difficulties and returns its record."""
+    engine.reset(seed=seed)
+    strategies = {"X": x_strategy, "O": o_strategy}
+    moves = []
+    move_ns = []
+
+    while not engine.game_over:
+        start = time.perf_counter_ns()
+        move = engine.choose_move(strategies[engine.current_player])
+        move_ns.append(time.perf_counter_ns() - start)
+        engine.make_move(move)
+        moves.append(move)
+
+    return {
+        "x": x_strategy,
+        "o": o_strategy,
+        "seed": seed,
+        "started": engine.started,
+        "winner": engine.winner,
+        "moves": moves,
+        "move_ns": move_ns,
+    }
+
+
+def play_chunk(x_strategy, o_strategy, first_game, count, seed, board=(3, 3, 1.0, DEFAULT_PLAYOUTS, DEFAULT_STRENGTH)):
+    """Worker task: plays a block of games for one pairing; returns the records and search stats."""
+    engine = _get_engine(*board)
+    records = [
+        play_game(engine, x_strategy, o_strategy, game_seed(seed, x_strategy, o_strategy, game))
+        for game in range(first_game, first_game + count)
+    ]
+    stats = _stats.snapshot()
+    _stats.reset()
+    return records, stats
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_tournament(pairings, games, processes=None, seed=0, output=None,
+                   size=3, win_length=3, time_budget=1.0, stats=None, log=None,
+                   mcts_playouts=DEFAULT_PLAYOUTS, players=None, strength=DEFAULT_STRENGTH):
+    """
+    Plays `games` games for each (x, o) pairing and returns the summary dict.
+
+    Records are written to the `output` file object as JSON Lines and to the
+    `log` `RecordWriter` when given, games between different strategies are
+    rated in the `players` `PlayerStats`, and the workers' search statistics
+    are merged into the `stats` registry. Raises ValueError unless `games`
+    is at least 1.
+    """
+    if games < 1:
+        raise ValueError(f"games must be at least 1, got {games}")
+    board = (size, win_length, time_budget, mcts_playouts, strength)
+    tasks = [
+        (x, o, first, min(CHUNK_SIZE, games - first), seed, board)
+        for x, o in pairings
+        for first in range(0, games, CHUNK_SIZE)
+    ]
+    results = {pairing: {"X": 0, "O": 0, "draw": 0} for pairing in pairings}
+    latencies = {}
+
+    # Imported here, like PlayerStats in main, so that cli.py can share parse_pairing without their startup cost.
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(play_chunk, *task) for task in tasks]
+        for future in as_completed(futures):
+            records, chunk_stats = future.result()
+            if stats is not None:
+                stats.merge(chunk_stats)
+            for record in records:
+                results[(record["x"], record["o"])][record["winner"] or "draw"] += 1
+                strategies = (record["x"], record["o"])
+                for ply, elapsed in enumerate(record["move_ns"]):
+                    latencies.setdefault(strategies[ply % 2], []).append(elapsed)
+                if output is not None:
+                    output.write(json.dumps(record) + "\n")
+                if log is not None:
+                    log.write(GameRecord(size, win_length, record["x"], record["o"], record["winner"],
+                                         record["seed"], record["started"], record["moves"],
+                                         [ns // 1000 for ns in record["move_ns"]]))
+                if players is not None and record["x"] != record["o"]:
+                    players.record(record["x"], record["o"], record["winner"])
+    elapsed = time.perf_counter() - start
+
+    total_games = games * len(pairings)
+    summary = {
+        "games": total_games,
+        "seconds": elapsed,
+        "games_per_second": total_games / elapsed if elapsed else 0.0,
+        "pairings": [],
+        "latency_ns": {},
+    }
+    for (x, o), counts in results.items():
+        summary["pairings"].append({
+            "x": x,
+            "o": o,
+            "x_win_rate": counts["X"] / games,
+            "draw_rate": counts["draw"] / games,
+            "o_win_rate": counts["O"] / games,
+        })
+    for strategy, values in sorted(latencies.items()):
+        values.sort()
+        summary["latency_ns"][strategy] = {
+            "moves": len(values),
+            "p50": percentile(values, 0.50),
+            "p90": percentile(values, 0.90),
+            "p99": percentile(values, 0.99),
+            "max": values[-1],
+        }
+    return summary
+
+
+def print_summary(summary):
+    """Prints a human-readable report of a tournament summary."""
+    print(f"{summary['games']} games in {summary['seconds']:.2f}s "
+          f"({summary['games_per_second']:.0f} games/s)")
+    print(f"{'X':<14}{'O':<14}{'X wins':>9}{'draws':>9}{'O wins':>9}")
+    for row in summary["pairings"]:
+        print(f"{row['x']:<14}{row['o']:<14}{row['x_win_rate']:>9.1%}"
+              f"{row['draw_rate']:>9.1%}{row['o_win_rate']:>9.1%}")
+    print(f"{'strategy':<14}{'moves':>9}{'p50 us':>10}{'p90 us':>10}{'p99 us':>10}{'max us':>10}")
+    for strategy, stats in summary["latency_ns"].items():
+        print(f"{strategy:<14}{stats['moves']:>9}{stats['p50'] / 1e3:>10.1f}{stats['p90'] / 1e3:>10.1f}"
+              f"{stats['p99'] / 1e3:>10.1f}{stats['max'] / 1e3:>10.1f}")
+
+
+def parse_pairing(text):
+    """Parses an "X:O" difficulty pairing from the command line."""
+    x, sep, o = text.partition(":")
+    if not sep or x not in DIFFICULTIES or o not in DIFFICULTIES:
+        raise argparse.ArgumentTypeError(f"expected X:O with difficulties from {DIFFICULTIES}, got {text!r}")
+    return x, o
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play AI-vs-AI Tic-Tac-Toe tournaments.")
+    parser.add_argument("--games", type=int, default=1000, help="games per pairing")
+    parser.add_argument("--pairing", type=parse_pairing, action="append",
+                        help="X:O difficulties, repeatable (default: every pairing)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="base seed for the random strategies")
+    parser.add_argument("--output", help="JSON Lines file receiving one record per game")
+    parser.add_argument("--records", help="binary game log to append every game to")
+    parser.add_argument("--players", help="SQLite player database rating the strategies against each other")
+    parser.add_argument("--size", type=int, default=3, help="cells per side of the board")
+    parser.add_argument("--win-length", type=int, help="marks in a row to win (default: the size)")
+    parser.add_argument("--time-budget", type=float, default=1.0,
+                        help="seconds per Hard move on boards other than 3x3, and per MCTS move")
+    parser.add_argument("--mcts-playouts", type=int, default=DEFAULT_PLAYOUTS,
+                        help="playouts per MCTS move (0: no limit, only the time budget)")
+    parser.add_argument("--strength", type=float, default=DEFAULT_STRENGTH, help="strength of the Adaptive AI, 0 to 1")
+    parser.add_argument("--stats", help="write search statistics here (Prometheus text for .prom, else JSON)")
+    args = parser.parse_args(argv)
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+
+    pairings = args.pairing or [(x, o) for x in DIFFICULTIES for o in DIFFICULTIES]
+    output = open(args.output, "w") if args.output else None
+    log = RecordWriter(args.records) if args.records else None
+    players = None
+    if args.players:
+        from ratings import PlayerStats
+        players = PlayerStats(args.players)
+    stats = StatsRegistry()
+    try:
+        summary = run_tournament(pairings, args.games, args.processes, args.seed, output,
+                                 args.size, args.win_length or args.size, args.time_budget, stats, log,
+                                 args.mcts_playouts or None, players, args.strength)
+    finally:
+        if output is not None:
+            output.close()
+        if log is not None:
+            log.close()
+        if players is not None:
+            players.close()
+    print_summary(summary)
+    if players is not None:
+        print(f"{'strategy':<14}{'rating':>9}")
+        for standing in players.leaderboard(len(DIFFICULTIES)):
+            print(f"{standing.name:<14}{standing.rating:>9.0f}")
+
+    if args.stats:
+        with open(args.stats, "w") as f:
+            f.write(stats.to_prometheus() if args.stats.endswith(".prom") else stats.to_json(indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())